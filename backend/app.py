@@ -1,49 +1,154 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from database import init_db, get_db_connection
+from database import init_db, get_db_connection, release_thread_connection, close_all_connections
 from models import Product, PriceLog, Alert
-from crawler import crawl_ssg_product, search_ssg_products, compare_products
-from notification import start_notification_scheduler
+from crawler import crawl_ssg_product, cached_search_ssg_products, stream_search_ssg_products, compare_products, search_cache, normalize_product_url, SEARCH_MAX_PAGES
+from notification import check_price_alerts_for_products, mail_dispatcher
+from scheduler import create_job_scheduler, MIN_REFRESH_INTERVAL
+from http_client import get_client
+from crawl_queue import get_crawl_queue
+from cache import SingleFlight
+from jobs import JobManager
+from events import broker, publish
+from price_history import load_price_history, downsample, storage_stats, DEFAULT_POINTS, MAX_POINTS, DOWNSAMPLE_MODES
+from price_stats import product_price_stats, all_product_price_stats, top_deals, stats_cache, DEAL_RANKINGS, DEFAULT_DEALS, MAX_DEALS
+from datetime import datetime
 import sqlite3
+import atexit
+import os
+import base64
+import json
+import time
 
 app = Flask(__name__)
 CORS(app)
 
 # 데이터베이스 초기화
 init_db()
+atexit.register(close_all_connections)
 
-# 알림 스케줄러 시작
-start_notification_scheduler()
+@app.teardown_request
+def release_db_connection(exc):
+    release_thread_connection()
+
+# 가격 갱신/알림 재확인 스케줄러 시작 (SCHEDULER_ENABLED=0이면 끔)
+# 종료 시에는 스케줄러 → 알림 메일 큐 → DB 연결 순으로 정리한다
+atexit.register(mail_dispatcher.shutdown)
+job_scheduler = create_job_scheduler()
+if os.environ.get('SCHEDULER_ENABLED', '1') == '1':
+    job_scheduler.start()
+    atexit.register(job_scheduler.shutdown)
+
+# URL별 진행 중인 상품 추가 크롤링
+product_add_flight = SingleFlight()
+
+# 상품 추가 백그라운드 작업
+job_manager = JobManager()
+MAX_BULK_URLS = 1000
+
+PRODUCT_FIELDS = ('id', 'name', 'url', 'current_price', 'image_url', 'brand', 'source',
+                  'refresh_interval', 'last_checked_at', 'next_check_at', 'created_at')
+PRODUCT_PAGE_DEFAULT = 50
+PRODUCT_PAGE_MAX = 200
+
+def _encode_cursor(row):
+    raw = json.dumps([row['created_at'], row['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def _decode_cursor(cursor):
+    created_at, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return created_at, int(product_id)
 
 @app.route('/api/products', methods=['GET'])
 def get_products():
-    """상품 목록 조회"""
+    """상품 목록 조회 (created_at, id 기준 키셋 페이지네이션)
+
+    쿼리 파라미터: limit, cursor, fields(쉼표 구분), source, brand,
+    min_price, max_price. 다음 페이지는 응답의 next_cursor로 요청한다.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', PRODUCT_PAGE_DEFAULT)), 1), PRODUCT_PAGE_MAX)
+        cursor = request.args.get('cursor')
+        after = _decode_cursor(cursor) if cursor else None
+        min_price = request.args.get('min_price', type=int)
+        max_price = request.args.get('max_price', type=int)
+    except (ValueError, TypeError):
+        return jsonify({'error': '잘못된 페이지 파라미터입니다'}), 400
+    
+    fields = request.args.get('fields')
+    if fields:
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in PRODUCT_FIELDS]
+        if unknown:
+            return jsonify({'error': f'알 수 없는 필드입니다: {", ".join(unknown)}'}), 400
+    else:
+        fields = list(PRODUCT_FIELDS)
+    
+    conditions = []
+    params = []
+    for column in ('source', 'brand'):
+        value = request.args.get(column)
+        if value:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    if min_price is not None:
+        conditions.append('current_price >= ?')
+        params.append(min_price)
+    if max_price is not None:
+        conditions.append('current_price <= ?')
+        params.append(max_price)
+    if after:
+        conditions.append('(created_at, id) < (?, ?)')
+        params.extend(after)
+    
+    # 커서 계산에 필요한 created_at, id는 요청하지 않아도 함께 조회
+    columns = list(dict.fromkeys(fields + ['created_at', 'id']))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    
     conn = get_db_connection()
-    products = conn.execute('SELECT * FROM products ORDER BY created_at DESC').fetchall()
+    rows = conn.execute(
+        f'''SELECT {', '.join(columns)} FROM products {where}
+            ORDER BY created_at DESC, id DESC LIMIT ?''',
+        params + [limit + 1]
+    ).fetchall()
     conn.close()
     
-    return jsonify([dict(product) for product in products])
-
-@app.route('/api/products', methods=['POST'])
-def add_product():
-    """상품 추가"""
-    data = request.json
-    url = data.get('url')
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
-    if not url:
-        return jsonify({'error': '상품 URL이 필요합니다'}), 400
+    return jsonify({
+        'products': [{field: row[field] for field in fields} for row in rows],
+        'next_cursor': _encode_cursor(rows[-1]) if has_more else None
+    })
+
+def _add_product_by_url(url, interactive=False):
+    """URL로 상품을 크롤링해 등록. (상품 id, 새로 추가됐는지) 반환
+
+    이미 등록된 URL이면 크롤링하지 않고 기존 id를 돌려준다.
+    크롤링에 실패하면 (None, False). 요청 응답을 기다리는 경우 interactive=True.
+    """
+    conn = get_db_connection()
+    existing = conn.execute('SELECT id FROM products WHERE url = ?', (url,)).fetchone()
+    conn.close()
+    if existing:
+        return existing['id'], False
     
     # 상품 정보 크롤링
-    product_info = crawl_ssg_product(url)
+    product_info = crawl_ssg_product(url, interactive=interactive)
     if not product_info:
-        return jsonify({'error': '상품 정보를 가져올 수 없습니다'}), 400
+        return None, False
     
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
-        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        'INSERT OR IGNORE INTO products (name, url, current_price) VALUES (?, ?, ?)',
         (product_info['name'], url, product_info['price'])
     )
+    if cursor.rowcount == 0:
+        # 다른 프로세스가 먼저 등록한 경우
+        existing = cursor.execute('SELECT id FROM products WHERE url = ?', (url,)).fetchone()
+        conn.close()
+        return existing['id'], False
     product_id = cursor.lastrowid
     
     # 가격 이력 추가
@@ -54,20 +159,168 @@ def add_product():
     
     conn.commit()
     conn.close()
+    publish('product_added', {'product_id': product_id, 'name': product_info['name']})
+    return product_id, True
+
+def _add_product_job(url):
+    """작업 큐에서 실행되는 URL 하나 추가 처리"""
+    url = normalize_product_url(url)
+    (product_id, created), _ = product_add_flight.do(url, lambda: _add_product_by_url(url))
+    if product_id is None:
+        raise ValueError(f'상품 정보를 가져올 수 없습니다: {url}')
+    return {'url': url, 'id': product_id, 'created': created}
+
+def _job_accepted(job_id):
+    return jsonify({
+        'job_id': job_id,
+        'status_url': f'/api/jobs/{job_id}',
+        'message': '상품 추가 작업이 등록되었습니다'
+    }), 202
+
+@app.route('/api/products', methods=['POST'])
+def add_product():
+    """상품 추가 (async=true면 작업 id를 바로 반환)"""
+    data = request.json
+    url = data.get('url')
+    
+    if not url:
+        return jsonify({'error': '상품 URL이 필요합니다'}), 400
+    
+    if data.get('async') or request.args.get('async') in ('1', 'true'):
+        return _job_accepted(job_manager.submit('add_product', [url], _add_product_job))
+    
+    # 같은 상품의 동시 추가 요청은 크롤링 한 번으로 합친다
+    url = normalize_product_url(url)
+    (product_id, created), _ = product_add_flight.do(url, lambda: _add_product_by_url(url, interactive=True))
+    
+    if product_id is None:
+        return jsonify({'error': '상품 정보를 가져올 수 없습니다'}), 400
+    
+    if not created:
+        return jsonify({'id': product_id, 'message': '이미 등록된 상품입니다'})
     
     return jsonify({'id': product_id, 'message': '상품이 추가되었습니다'})
 
+@app.route('/api/products/bulk', methods=['POST'])
+def add_products_bulk():
+    """여러 상품 URL을 한 번에 추가 (백그라운드 작업)"""
+    data = request.json or {}
+    urls = data.get('urls')
+    
+    if not isinstance(urls, list) or not urls:
+        return jsonify({'error': '상품 URL 목록(urls)이 필요합니다'}), 400
+    if len(urls) > MAX_BULK_URLS:
+        return jsonify({'error': f'한 번에 최대 {MAX_BULK_URLS}개까지 추가할 수 있습니다'}), 400
+    
+    # 같은 URL이 여러 번 들어와도 한 번만 처리
+    urls = list(dict.fromkeys(url.strip() for url in urls if isinstance(url, str) and url.strip()))
+    return _job_accepted(job_manager.submit('add_products_bulk', urls, _add_product_job))
+
+@app.route('/api/products/<int:product_id>', methods=['PATCH'])
+def update_product_settings(product_id):
+    """상품 설정 변경 (현재는 refresh_interval: 초 단위 고정 갱신 주기, null이면 적응형)"""
+    data = request.json or {}
+    if 'refresh_interval' not in data:
+        return jsonify({'error': 'refresh_interval이 필요합니다'}), 400
+    
+    refresh_interval = data['refresh_interval']
+    if refresh_interval is not None:
+        if type(refresh_interval) is not int or refresh_interval < MIN_REFRESH_INTERVAL:
+            return jsonify({'error': f'refresh_interval은 {MIN_REFRESH_INTERVAL}초 이상의 정수여야 합니다'}), 400
+    
+    conn = get_db_connection()
+    # 주기를 줄였다면 예정된 다음 확인도 그만큼 당긴다
+    cursor = conn.execute(
+        '''UPDATE products SET refresh_interval = ?,
+               next_check_at = CASE WHEN ? IS NULL THEN next_check_at
+                                    ELSE MIN(next_check_at, datetime('now', '+' || ? || ' seconds')) END
+           WHERE id = ?''',
+        (refresh_interval, refresh_interval, refresh_interval, product_id)
+    )
+    conn.commit()
+    if cursor.rowcount:
+        get_crawl_queue().reschedule(conn, product_id)
+    conn.close()
+    
+    if cursor.rowcount == 0:
+        return jsonify({'error': '상품을 찾을 수 없습니다'}), 404
+    return jsonify({'id': product_id, 'refresh_interval': refresh_interval})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """백그라운드 작업 진행 상태 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    return jsonify(job)
+
+def _parse_time_param(name):
+    """ISO 날짜/시각 파라미터를 logged_at과 비교 가능한 문자열로 변환"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+
 @app.route('/api/products/<int:product_id>/prices', methods=['GET'])
 def get_price_history(product_id):
-    """상품 가격 이력 조회"""
+    """상품 가격 이력 조회
+
+    since/until(ISO 형식)로 기간을 정하고, points 이하로 다운샘플링한다.
+    mode=ohlc(기본)는 구간별 open/high/low/count와 종가(price)를,
+    mode=lttb는 모양을 유지하는 대표 점을 반환한다.
+    """
+    try:
+        since = _parse_time_param('since')
+        until = _parse_time_param('until')
+        points = min(max(int(request.args.get('points', DEFAULT_POINTS)), 2), MAX_POINTS)
+    except ValueError:
+        return jsonify({'error': '잘못된 기간 또는 points 파라미터입니다'}), 400
+    
+    mode = request.args.get('mode', 'ohlc')
+    if mode not in DOWNSAMPLE_MODES:
+        return jsonify({'error': f'mode는 {", ".join(DOWNSAMPLE_MODES)} 중 하나여야 합니다'}), 400
+    
     conn = get_db_connection()
-    prices = conn.execute(
-        'SELECT price, logged_at FROM price_logs WHERE product_id = ? ORDER BY logged_at',
-        (product_id,)
-    ).fetchall()
+    timestamps, prices = load_price_history(conn, product_id, since, until)
+    conn.close()
+    
+    return jsonify(downsample(timestamps, prices, points, mode))
+
+@app.route('/api/products/<int:product_id>/stats', methods=['GET'])
+def get_product_stats(product_id):
+    """상품 가격 통계 (역대 최저/최고, 이동 평균, 30일 중앙값 대비, 변동성, 낙폭)"""
+    conn = get_db_connection()
+    stats = product_price_stats(conn, product_id)
     conn.close()
     
-    return jsonify([dict(price) for price in prices])
+    if stats is None:
+        return jsonify({'error': '가격 이력이 없습니다'}), 404
+    return jsonify(stats)
+
+@app.route('/api/products/stats', methods=['GET'])
+def get_all_product_stats():
+    """추적 중인 모든 상품의 가격 통계 (한 번의 조회와 벡터 연산)"""
+    conn = get_db_connection()
+    stats = all_product_price_stats(conn)
+    conn.close()
+    return jsonify({'products': stats, 'total': len(stats)})
+
+@app.route('/api/deals', methods=['GET'])
+def get_best_deals():
+    """지금 역대 최저가(by=low, 기본) 또는 평균가(by=average)에 가장 가까운 상품 순위"""
+    by = request.args.get('by', 'low')
+    if by not in DEAL_RANKINGS:
+        return jsonify({'error': f'by는 {", ".join(DEAL_RANKINGS)} 중 하나여야 합니다'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_DEALS)), 1), MAX_DEALS)
+        min_points = max(int(request.args.get('min_points', 2)), 1)
+    except ValueError:
+        return jsonify({'error': '잘못된 limit 또는 min_points 파라미터입니다'}), 400
+    
+    conn = get_db_connection()
+    deals = top_deals(conn, limit, by, min_points)
+    conn.close()
+    return jsonify({'by': by, 'deals': deals})
 
 @app.route('/api/alerts', methods=['POST'])
 def create_alert():
@@ -79,28 +332,37 @@ def create_alert():
         'INSERT INTO alerts (product_id, user_email, target_price) VALUES (?, ?, ?)',
         (data['product_id'], data['email'], data['target_price'])
     )
+    product = conn.execute(
+        'SELECT current_price FROM products WHERE id = ?', (data['product_id'],)
+    ).fetchone()
     conn.commit()
     conn.close()
+    publish('alert_created', {'product_id': data['product_id']})
+    
+    # 이미 목표 가격 이하라면 다음 가격 변경을 기다리지 않고 바로 확인.
+    # 인덱스 조회와 발송 큐 등록뿐이라 요청 안에서 처리한다 (상품 추가 작업 풀을 쓰지 않음)
+    queued = 0
+    if product and product['current_price'] is not None:
+        queued = check_price_alerts_for_products({data['product_id']: product['current_price']})
     
-    return jsonify({'message': '알림이 설정되었습니다'})
+    return jsonify({'message': '알림이 설정되었습니다', 'queued': queued})
 
 @app.route('/api/dashboard', methods=['GET'])
 def get_dashboard_data():
     """대시보드 데이터"""
     conn = get_db_connection()
     
-    # 전체 상품 수
-    total_products = conn.execute('SELECT COUNT(*) as count FROM products').fetchone()['count']
+    # 상품/알림 수는 트리거가 유지하는 카운터에서 읽는다 (테이블 크기와 무관)
+    counters = dict(conn.execute('SELECT name, value FROM dashboard_counters').fetchall())
+    total_products = counters.get('total_products', 0)
+    active_alerts = counters.get('active_alerts', 0)
     
-    # 활성 알림 수
-    active_alerts = conn.execute('SELECT COUNT(*) as count FROM alerts WHERE is_active = 1').fetchone()['count']
-    
-    # 최근 가격 변동
+    # 최근 가격 변동 (링 버퍼)
     recent_changes = conn.execute('''
-        SELECT p.name, pl.price, pl.logged_at
-        FROM price_logs pl
-        JOIN products p ON pl.product_id = p.id
-        ORDER BY pl.logged_at DESC
+        SELECT p.name, r.price, r.logged_at
+        FROM recent_price_changes r
+        JOIN products p ON r.product_id = p.id
+        ORDER BY r.log_id DESC
         LIMIT 10
     ''').fetchall()
     
@@ -112,6 +374,27 @@ def get_dashboard_data():
         'recent_changes': [dict(change) for change in recent_changes]
     })
 
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """실시간 이벤트 스트림 (Server-Sent Events)
+
+    price_changed, alert_fired, product_added, alert_created 이벤트를 보낸다.
+    클라이언트가 밀려 큐가 넘치면 resync 이벤트가 가며, 이때는
+    /api/dashboard를 다시 읽으면 된다.
+    """
+    subscription = broker.subscribe()
+    if subscription is None:
+        return jsonify({'error': '실시간 연결이 너무 많습니다. 잠시 후 다시 시도해주세요'}), 503
+    
+    response = Response(
+        stream_with_context(broker.stream(subscription)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache, no-transform', 'X-Accel-Buffering': 'no'}
+    )
+    # 스트림이 시작되기 전에 연결이 끊겨도 구독이 남지 않도록
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
+
 @app.route('/api/search', methods=['GET'])
 def search_products():
     """상품 검색"""
@@ -123,7 +406,7 @@ def search_products():
         return jsonify({'error': '검색어가 필요합니다'}), 400
     
     try:
-        products = search_ssg_products(keyword, page=page, limit=limit)
+        products = cached_search_ssg_products(keyword, page=page, limit=limit)
         return jsonify({
             'keyword': keyword,
             'page': page,
@@ -133,6 +416,61 @@ def search_products():
     except Exception as e:
         return jsonify({'error': f'검색 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@app.route('/api/search/stream', methods=['GET'])
+def stream_search_products():
+    """여러 페이지 상품 검색 - 페이지 파싱이 끝나는 대로 스트리밍
+
+    1..pages 페이지를 동시에 받아 한 줄에 이벤트 하나씩 NDJSON으로 보낸다
+    (format=sse면 SSE). 이벤트는 products(page, products), error(page, error),
+    실제 결과가 없을 때의 fallback(reason, 테스트용 products), 마지막에
+    done(total, fallback, elapsed_ms). total은 실제 상품 수만 센다. 페이지
+    순서가 아닌 도착 순서이고, 같은 itemId는 처음 한 번만 온다.
+    """
+    keyword = request.args.get('keyword', '').strip()
+    output_format = request.args.get('format', 'ndjson')
+    
+    if not keyword:
+        return jsonify({'error': '검색어가 필요합니다'}), 400
+    if output_format not in ('ndjson', 'sse'):
+        return jsonify({'error': 'format은 ndjson 또는 sse여야 합니다'}), 400
+    try:
+        pages = min(max(int(request.args.get('pages', 3)), 1), SEARCH_MAX_PAGES)
+        limit = request.args.get('limit')
+        limit = max(int(limit), 0) if limit is not None else None
+    except ValueError:
+        return jsonify({'error': '잘못된 pages 또는 limit 파라미터입니다'}), 400
+    
+    def encode(event):
+        data = json.dumps(event, ensure_ascii=False)
+        if output_format == 'sse':
+            return f"event: {event['type']}\ndata: {data}\n\n"
+        return data + '\n'
+    
+    def generate():
+        started = time.perf_counter()
+        total = 0
+        fallback = False
+        for event in stream_search_ssg_products(keyword, pages=pages, limit=limit):
+            if event['type'] == 'products':
+                total += len(event['products'])
+            elif event['type'] == 'fallback':
+                fallback = True
+            yield encode(event)
+        yield encode({
+            'type': 'done',
+            'keyword': keyword,
+            'pages': pages,
+            'total': total,
+            'fallback': fallback,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream' if output_format == 'sse' else 'application/x-ndjson',
+        headers={'Cache-Control': 'no-cache, no-transform', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/compare', methods=['GET'])
 def compare_product_prices():
     """상품 가격 비교"""
@@ -176,13 +514,16 @@ def add_product_from_search():
         if field not in data:
             return jsonify({'error': f'{field}가 필요합니다'}), 400
     
+    url = normalize_product_url(data['url'])
+    
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
         # 중복 URL 체크
-        existing = cursor.execute('SELECT id FROM products WHERE url = ?', (data['url'],)).fetchone()
+        existing = cursor.execute('SELECT id FROM products WHERE url = ?', (url,)).fetchone()
         if existing:
+            conn.close()
             return jsonify({'error': '이미 등록된 상품입니다'}), 400
         
         # 상품 추가 (추가 정보 포함)
@@ -190,7 +531,7 @@ def add_product_from_search():
             'INSERT INTO products (name, url, current_price, image_url, brand, source) VALUES (?, ?, ?, ?, ?, ?)',
             (
                 data['name'], 
-                data['url'], 
+                url, 
                 data['price'],
                 data.get('image_url'),
                 data.get('brand', '브랜드 정보 없음'),
@@ -207,6 +548,7 @@ def add_product_from_search():
         
         conn.commit()
         conn.close()
+        publish('product_added', {'product_id': product_id, 'name': data['name']})
         
         return jsonify({
             'id': product_id,
@@ -214,7 +556,7 @@ def add_product_from_search():
             'product': {
                 'id': product_id,
                 'name': data['name'],
-                'url': data['url'],
+                'url': url,
                 'current_price': data['price'],
                 'image_url': data.get('image_url'),
                 'brand': data.get('brand'),
@@ -222,8 +564,52 @@ def add_product_from_search():
             }
         })
         
+    except sqlite3.IntegrityError:
+        # 동시에 같은 URL이 먼저 등록된 경우 (UNIQUE 인덱스)
+        return jsonify({'error': '이미 등록된 상품입니다'}), 400
     except Exception as e:
         return jsonify({'error': f'상품 추가 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@app.route('/api/crawler/stats', methods=['GET'])
+def get_crawler_stats():
+    """크롤러 HTTP 커넥션 풀 통계"""
+    return jsonify(get_client().stats())
+
+@app.route('/api/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """검색 결과/가격 통계 캐시 통계 (적중/미스/제거)"""
+    return jsonify({'search': search_cache.stats(), 'price_stats': stats_cache.stats()})
+
+@app.route('/api/events/stats', methods=['GET'])
+def get_event_stats():
+    """실시간 이벤트 브로커 통계 (구독자 수, 버려진 이벤트)"""
+    return jsonify(broker.stats())
+
+@app.route('/api/scheduler/stats', methods=['GET'])
+def get_scheduler_stats():
+    """예약 작업별 실행 시간과 예약 대비 지연(lag)"""
+    return jsonify(job_scheduler.stats())
+
+@app.route('/api/crawl-queue/stats', methods=['GET'])
+def get_crawl_queue_stats():
+    """가격 확인 작업 큐 통계 (밀린 상품 수, 워커별 선점 수)"""
+    conn = get_db_connection()
+    stats = get_crawl_queue().stats(conn)
+    conn.close()
+    return jsonify(stats)
+
+@app.route('/api/price-history/stats', methods=['GET'])
+def get_price_history_stats():
+    """가격 이력 계층별 점 개수 (최근 원본 행 / 압축 블록)"""
+    conn = get_db_connection()
+    stats = storage_stats(conn)
+    conn.close()
+    return jsonify(stats)
+
+@app.route('/api/notifications/stats', methods=['GET'])
+def get_notification_stats():
+    """알림 메일 발송 큐 통계 (발송/재시도/실패/세션 수)"""
+    return jsonify(mail_dispatcher.stats())
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
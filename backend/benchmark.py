@@ -0,0 +1,1228 @@
+#!/usr/bin/env python3
+"""
+SSG 가격 추적 시스템 - 성능 측정 스크립트
+실제 SSG 대신 로컬 스텁 서버와 임시 DB를 사용합니다.
+
+사용법: python benchmark.py refresh --products 500 --latency 0.05
+       python benchmark.py parse --corpus ./saved_pages
+       python benchmark.py price
+       python benchmark.py dashboard --duration 5
+       python benchmark.py dashboard-load --threads 8
+       python benchmark.py schema --rows 10000000
+       python benchmark.py alerts --alerts 1000000 --products 100000
+       python benchmark.py mail --messages 200 --connect-latency 0.2
+       python benchmark.py adaptive --days 14
+       python benchmark.py throttle --capacity 20
+       python benchmark.py workers --products 2000 --processes 1 2 4
+       python benchmark.py history-tiers --points 50000000
+       python benchmark.py writes --products 1000
+       python benchmark.py stats --products 20000 --logs 50
+       python benchmark.py deals --products 100000
+       python benchmark.py search --pages 5 --latency 0.3
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import smtplib
+from pathlib import Path
+
+# app을 import하는 측정에서 실제 SSG를 크롤링하는 예약 작업이 돌지 않도록
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+# 로컬 스텁 서버 처리량 측정은 호스트 속도 제한 없이 (throttle 명령은 따로 설정)
+os.environ.setdefault('HOST_RATE_LIMIT', '0')
+
+import database
+from http_client import get_client
+from tests.helpers import (
+    render_product_page, seed_products, StubSSGServer, StubSearchServer, StubSMTPServer, ThrottlingStubServer,
+)
+
+def use_temp_database():
+    """임시 디렉토리에 새 DB를 만들고 경로를 바꾼다"""
+    temp_dir = tempfile.mkdtemp(prefix='ssg-bench-')
+    database.DATABASE_PATH = os.path.join(temp_dir, 'bench.db')
+    database.init_db()
+    return database.DATABASE_PATH
+
+def build_synthetic_page(item_id, filler_blocks=400):
+    """실제 상품 페이지 크기(수백 KB)에 가깝게 부풀린 페이지"""
+    filler = ''.join(
+        f'<li class="cdtl_opt_item"><a href="/item/itemView.ssg?itemId={item_id}{i}">'
+        f'<span class="txt">추천 상품 {i}</span><em class="ssg_price">{i * 100:,}</em></a></li>'
+        for i in range(filler_blocks)
+    )
+    page = render_product_page(item_id, (item_id % 490 + 10) * 1000)
+    return page.replace('<body>', f'<body><ul class="cdtl_rec">{filler}</ul>').encode('utf-8')
+
+def build_snippet_pages(filler_blocks=400):
+    """tests/test_product_parse.py의 SSG 가격 영역 조각을 실제 페이지 크기로 부풀린 페이지"""
+    from tests.test_product_parse import PRODUCT_PAGE_SNIPPETS
+
+    filler = ''.join(
+        f'<li class="cdtl_opt_item"><a href="/item/itemView.ssg?itemId={i}">'
+        f'<span class="txt">추천 상품 {i}</span><em class="ssg_price">{i * 100:,}</em></a></li>'
+        for i in range(filler_blocks)
+    )
+    return [
+        f'<html><head><title>SSG.COM</title></head><body>{body}<ul class="cdtl_rec">{filler}</ul></body></html>'.encode('utf-8')
+        for _, body, _, _ in PRODUCT_PAGE_SNIPPETS
+    ]
+
+def load_page_corpus(corpus_dir, count):
+    """저장된 상품 페이지(*.html)를 읽고, 없으면 합성 페이지와 SSG 가격 영역 조각 페이지를 쓴다"""
+    if corpus_dir:
+        paths = sorted(Path(corpus_dir).glob('*.html'))
+        if paths:
+            return [path.read_bytes() for path in paths]
+        print(f"⚠️ {corpus_dir}에 *.html 파일이 없어 합성 페이지를 사용합니다")
+    return [build_synthetic_page(i) for i in range(count)] + build_snippet_pages()
+
+def _measure_parser(parse, pages, repeat):
+    """전체 처리 시간과 페이지 1개 파싱의 최대 메모리 사용량"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [parse(page) for page in pages]
+    elapsed = time.perf_counter() - started
+
+    peak = 0
+    for page in pages[:20]:
+        tracemalloc.start()
+        parse(page)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return results, elapsed / (repeat * len(pages)), peak
+
+def bench_parse(args):
+    """상품 페이지 파싱: 빠른 경로 vs BeautifulSoup 경로"""
+    from crawler import _parse_product_fast, _parse_product_soup, parse_product_page
+
+    pages = load_page_corpus(args.corpus, args.pages)
+    avg_size = sum(len(page) for page in pages) / len(pages)
+    print(f"페이지 {len(pages)}개, 평균 {avg_size / 1024:.0f}KB")
+
+    fast_hits = sum(1 for page in pages if _parse_product_fast(page))
+    soup_results, soup_time, soup_peak = _measure_parser(_parse_product_soup, pages, args.repeat)
+    fast_results, fast_time, fast_peak = _measure_parser(
+        lambda page: parse_product_page(page, fast=True), pages, args.repeat
+    )
+    # soup 경로는 JSON-LD를 읽지 않으므로 soup이 가격을 찾은 페이지만 비교
+    mismatches = sum(
+        1 for fast, soup in zip(fast_results, soup_results)
+        if soup['price'] and (fast['name'], fast['price']) != (soup['name'], soup['price'])
+    )
+
+    print(f"  soup  {soup_time * 1000:8.2f}ms/페이지  최대 메모리 {soup_peak / 1024:8.0f}KB")
+    print(f"  fast  {fast_time * 1000:8.2f}ms/페이지  최대 메모리 {fast_peak / 1024:8.0f}KB")
+    print(f"  빠른 경로 적중 {fast_hits}/{len(pages)}, 결과 불일치 {mismatches}개, "
+          f"속도 {soup_time / fast_time:.1f}배")
+    return mismatches == 0
+
+def bench_price(args):
+    """가격 텍스트 추출: 큰 페이지 텍스트 처리 속도 (회귀 확인은 tests/test_price_extraction.py)"""
+    from crawler import extract_price_from_text
+    from tests.test_price_extraction import legacy_extract_price_from_text
+
+    # 가격 라벨이 거의 없는 큰 페이지 텍스트 (최악의 경우: 마지막 패턴까지 감)
+    page_text = build_synthetic_page(1, filler_blocks=args.blocks).decode('utf-8')
+    page_text = re.sub(r'<[^>]+>', ' ', page_text).replace('원', '')
+
+    timings = {}
+    for label, func in (('이전', legacy_extract_price_from_text), ('현재', extract_price_from_text)):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            func(page_text)
+        timings[label] = (time.perf_counter() - started) / args.repeat
+        print(f"  {label:<6} {timings[label] * 1000:8.2f}ms ({len(page_text) / 1024:.0f}KB 텍스트)")
+    print(f"  속도 {timings['이전'] / timings['현재']:.1f}배")
+    return True
+
+def seed_price_history(products, logs_per_product):
+    """상품과 가격 이력을 대량으로 채운다"""
+    conn = database.get_db_connection()
+    conn.executemany(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        ((f"벤치마크 상품 {i}", f"https://www.ssg.com/item/itemView.ssg?itemId={i}", 10000)
+         for i in range(products))
+    )
+    conn.executemany(
+        'INSERT INTO price_logs (product_id, price, logged_at) VALUES (?, ?, datetime(\'now\', ?))',
+        ((i % products + 1, 10000 + i % 500, f'-{logs_per_product * products - i} minutes')
+         for i in range(products * logs_per_product))
+    )
+    conn.commit()
+    conn.close()
+
+def _simulate_refresh_writes(products, duration, stop):
+    """스케줄러 갱신 패스처럼 긴 트랜잭션 하나로 가격을 쓴다"""
+    conn = database.get_db_connection()
+    per_product = duration / products
+    for product_id in range(1, products + 1):
+        if stop.is_set():
+            break
+        conn.execute('UPDATE products SET current_price = current_price + 10 WHERE id = ?', (product_id,))
+        conn.execute(
+            'INSERT INTO price_logs (product_id, price) VALUES (?, ?)',
+            (product_id, 10000 + product_id)
+        )
+        time.sleep(per_product)  # 크롤링 대기 시간
+    conn.commit()
+    conn.close()
+
+def _measure_dashboard(client, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.get('/api/dashboard')
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors += 1
+    latencies.sort()
+    return latencies, errors
+
+def bench_dashboard(args):
+    """갱신 패스가 쓰는 동안 /api/dashboard 읽기 지연 (연결 설정별)"""
+    from scheduler import _percentile
+
+    # 이전 기본값(롤백 저널, 2MB 캐시) vs 현재 설정
+    configs = {
+        'legacy': {'DB_JOURNAL_MODE': 'DELETE', 'DB_SYNCHRONOUS': 'FULL', 'DB_CACHE_SIZE_KB': 2000, 'DB_MMAP_SIZE': 0},
+        'tuned': {key: getattr(database, key) for key in ('DB_JOURNAL_MODE', 'DB_SYNCHRONOUS', 'DB_CACHE_SIZE_KB', 'DB_MMAP_SIZE')},
+    }
+    for name, config in configs.items():
+        database.close_all_connections()
+        for key, value in config.items():
+            setattr(database, key, value)
+        use_temp_database()
+        seed_price_history(args.products, args.logs)
+
+        import app as app_module
+        client = app_module.app.test_client()
+
+        stop = threading.Event()
+        writer = threading.Thread(
+            target=_simulate_refresh_writes, args=(args.products, args.duration, stop)
+        )
+        writer.start()
+        latencies, errors = _measure_dashboard(client, args.duration)
+        stop.set()
+        writer.join()
+
+        print(
+            f"  {name:<7} 요청 {len(latencies):>6}회  "
+            f"p50 {_percentile(latencies, 50) * 1000:7.2f}ms  "
+            f"p99 {_percentile(latencies, 99) * 1000:7.2f}ms  "
+            f"max {latencies[-1] * 1000:8.2f}ms  실패 {errors}"
+        )
+    return True
+
+LEGACY_DASHBOARD_QUERIES = (
+    'SELECT COUNT(*) as count FROM products',
+    'SELECT COUNT(*) as count FROM alerts WHERE is_active = 1',
+    '''SELECT p.name, pl.price, pl.logged_at
+       FROM price_logs pl JOIN products p ON pl.product_id = p.id
+       ORDER BY pl.logged_at DESC LIMIT 10''',
+)
+
+def _legacy_dashboard():
+    """집계 카운터 도입 전 /api/dashboard 쿼리"""
+    from flask import jsonify
+
+    conn = database.get_db_connection()
+    total_products, active_alerts, recent_changes = (
+        conn.execute(sql).fetchall() for sql in LEGACY_DASHBOARD_QUERIES
+    )
+    conn.close()
+    return jsonify({
+        'total_products': total_products[0]['count'],
+        'active_alerts': active_alerts[0]['count'],
+        'recent_changes': [dict(change) for change in recent_changes]
+    })
+
+def _load_test(client, path, threads, duration):
+    """threads개 스레드가 duration초 동안 path를 반복 요청. (초당 요청 수, 지연 목록)"""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.get(path)
+            local.append(time.perf_counter() - started)
+        database.release_thread_connection()
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / duration, latencies
+
+def bench_dashboard_load(args):
+    """대시보드 부하 테스트: 매 요청 COUNT/정렬 vs 트리거 집계 카운터"""
+    from scheduler import _percentile
+
+    use_temp_database()
+    print(f"상품 {args.products:,}개 x 이력 {args.logs}건, 알림 {args.alerts:,}개 생성 중...")
+    seed_price_history(args.products, args.logs)
+    conn = database.get_db_connection()
+    conn.executemany(
+        'INSERT INTO alerts (product_id, user_email, target_price, is_active) VALUES (?, ?, ?, ?)',
+        ((i % args.products + 1, f'user{i}@example.com', 9000, i % 3 != 0) for i in range(args.alerts))
+    )
+    conn.commit()
+    conn.close()
+
+    import app as app_module
+    app_module.app.add_url_rule('/bench/legacy-dashboard', 'legacy_dashboard', _legacy_dashboard)
+    client = app_module.app.test_client()
+
+    legacy = client.get('/bench/legacy-dashboard').get_json()
+    current = client.get('/api/dashboard').get_json()
+    if legacy != current:
+        print("❌ 집계 카운터 결과가 기존 쿼리와 다릅니다")
+        print(f"  이전 {legacy}\n  현재 {current}")
+        return False
+
+    results = {}
+    for label, path in (('이전', '/bench/legacy-dashboard'), ('현재', '/api/dashboard')):
+        rps, latencies = _load_test(client, path, args.threads, args.duration)
+        results[label] = rps
+        print(
+            f"  {label} {rps:>9,.1f}req/s  p50 {_percentile(latencies, 50) * 1000:8.2f}ms  "
+            f"p99 {_percentile(latencies, 99) * 1000:8.2f}ms  (스레드 {args.threads})"
+        )
+    print(f"  처리량 {results['현재'] / results['이전']:.1f}배")
+    return True
+
+SCHEMA_BENCH_QUERIES = {
+    '가격 이력 (상품 1개)': (
+        'SELECT price, logged_at FROM price_logs WHERE product_id = ? ORDER BY logged_at',
+        lambda products: (random.randint(1, products),)
+    ),
+    '대시보드 최근 변동': (
+        '''SELECT p.name, pl.price, pl.logged_at
+           FROM price_logs pl JOIN products p ON pl.product_id = p.id
+           ORDER BY pl.logged_at DESC LIMIT 10''',
+        lambda products: ()
+    ),
+    '상품별 최근 가격 1건': (
+        'SELECT price FROM price_logs WHERE product_id = ? ORDER BY logged_at DESC LIMIT 1',
+        lambda products: (random.randint(1, products),)
+    ),
+}
+
+def _time_schema_queries(conn, products, repeat):
+    timings = {}
+    for label, (sql, make_params) in SCHEMA_BENCH_QUERIES.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(sql, make_params(products)).fetchall()
+        timings[label] = (time.perf_counter() - started) / repeat
+    return timings
+
+def bench_schema(args):
+    """인덱스 없는 예전 스키마 vs 최신 스키마: 대용량 price_logs 조회 시간"""
+    temp_dir = tempfile.mkdtemp(prefix='ssg-bench-')
+    database.DATABASE_PATH = os.path.join(temp_dir, 'bench.db')
+    conn = database.get_db_connection()
+
+    # 5번(가격 이력/알림 조회 인덱스) 직전 버전까지만 적용
+    database.migrate(conn, target_version=4)
+
+    print(f"price_logs {args.rows:,}행 생성 중 (상품 {args.products:,}개)...")
+    started = time.perf_counter()
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO products (name, url, current_price)
+           SELECT '벤치마크 상품 ' || n, 'https://www.ssg.com/item/itemView.ssg?itemId=' || n, 10000 FROM seq''',
+        (args.products,)
+    )
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO price_logs (product_id, price, logged_at)
+           SELECT abs(random()) % ? + 1, 10000 + abs(random()) % 5000,
+                  datetime('now', '-' || (? - n) || ' seconds')
+           FROM seq''',
+        (args.rows, args.products, args.rows)
+    )
+    conn.commit()
+    print(f"  생성 {time.perf_counter() - started:.1f}초")
+
+    before = _time_schema_queries(conn, args.products, args.repeat)
+    database.migrate(conn)
+    after = _time_schema_queries(conn, args.products, args.repeat)
+
+    for label in SCHEMA_BENCH_QUERIES:
+        print(
+            f"  {label:<16} 이전 {before[label] * 1000:10.2f}ms  "
+            f"현재 {after[label] * 1000:8.3f}ms  ({before[label] / after[label]:,.0f}배)"
+        )
+    conn.close()
+    return True
+
+def _legacy_triggered_alert_ids(conn):
+    """예전 check_price_alerts: 모든 활성 알림을 읽어 파이썬에서 비교"""
+    alerts = conn.execute('''
+        SELECT a.*, p.name, p.current_price, p.url
+        FROM alerts a
+        JOIN products p ON a.product_id = p.id
+        WHERE a.is_active = 1
+    ''').fetchall()
+    return {alert['id'] for alert in alerts if alert['current_price'] <= alert['target_price']}
+
+def bench_alerts(args):
+    """가격 변경 시 알림 확인: 전체 알림 스캔 vs 상품별 인덱스 범위 탐색"""
+    from notification import find_triggered_alerts
+
+    use_temp_database()
+    conn = database.get_db_connection()
+    print(f"상품 {args.products:,}개, 알림 {args.alerts:,}개 생성 중...")
+    started = time.perf_counter()
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO products (name, url, current_price)
+           SELECT '벤치마크 상품 ' || n, 'https://www.ssg.com/item/itemView.ssg?itemId=' || n, 10000 FROM seq''',
+        (args.products,)
+    )
+    # 목표 가격은 모두 현재 가격(10000원)보다 낮게 → 처음에는 발송 대상 없음
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO alerts (product_id, user_email, target_price)
+           SELECT abs(random()) % ? + 1, 'user' || n || '@example.com', 1000 + abs(random()) % 8000
+           FROM seq''',
+        (args.alerts, args.products)
+    )
+    conn.commit()
+    conn.execute('ANALYZE')
+    print(f"  생성 {time.perf_counter() - started:.1f}초")
+
+    # 갱신 패스 한 번에서 args.changed개 상품 가격이 내려갔다고 가정
+    rng = random.Random(42)
+    product_prices = {
+        product_id: rng.randint(1000, 9999)
+        for product_id in rng.sample(range(1, args.products + 1), args.changed)
+    }
+    conn.executemany(
+        'UPDATE products SET current_price = ? WHERE id = ?',
+        [(price, product_id) for product_id, price in product_prices.items()]
+    )
+    conn.commit()
+
+    started = time.perf_counter()
+    legacy_ids = _legacy_triggered_alert_ids(conn)
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    triggered_ids = {alert['id'] for alert in find_triggered_alerts(conn, product_prices)}
+    current_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    find_triggered_alerts(conn, {})
+    idle_time = time.perf_counter() - started
+    conn.close()
+
+    if legacy_ids != triggered_ids:
+        print(f"❌ 발송 대상이 다릅니다 (이전 {len(legacy_ids)}개, 현재 {len(triggered_ids)}개)")
+        return False
+
+    print(f"  가격 변경 {args.changed:,}개 → 발송 대상 알림 {len(triggered_ids):,}개 (결과 일치)")
+    print(f"  이전 (전체 스캔)      {legacy_time * 1000:10.1f}ms  (가격 변경이 없어도 동일)")
+    print(f"  현재 (상품별 인덱스)  {current_time * 1000:10.1f}ms  ({legacy_time / current_time:,.0f}배)")
+    print(f"  현재 (가격 변경 없음) {idle_time * 1000:10.3f}ms")
+    return True
+
+def _legacy_send_all(stub, messages):
+    """예전 send_email: 메일마다 연결 → (TLS/로그인) → 발송 → 종료, 재시도 없음"""
+    from mailer import build_message, EMAIL_ADDRESS
+
+    sent = 0
+    for to_email, subject, body in messages:
+        try:
+            server = stub.connect()
+            server.sendmail(EMAIL_ADDRESS, to_email, build_message(to_email, subject, body))
+            server.quit()
+            sent += 1
+        except smtplib.SMTPException:
+            pass
+    return sent
+
+def bench_mail(args):
+    """알림 메일 발송: 메일마다 새 SMTP 연결 vs 세션 재사용 발송 큐"""
+    from mailer import MailDispatcher
+
+    messages = [
+        (f'user{i % args.recipients}@example.com', f'[SSG 가격 알림] 벤치마크 상품 {i}', '<p>목표 가격 도달</p>')
+        for i in range(args.messages)
+    ]
+    print(
+        f"메일 {args.messages}통 (수신자 {args.recipients}명), 연결 비용 {args.connect_latency * 1000:.0f}ms, "
+        f"일시 오류율 {args.fail_rate:.0%}"
+    )
+
+    with StubSMTPServer(args.connect_latency, args.fail_rate) as stub:
+        started = time.perf_counter()
+        sent = _legacy_send_all(stub, messages)
+        legacy_time = time.perf_counter() - started
+        print(f"  이전 {legacy_time:7.2f}초  발송 {sent}통  SMTP 연결 {stub.connections}회")
+
+    delivered_batches = []
+    with StubSMTPServer(args.connect_latency, args.fail_rate) as stub:
+        dispatcher = MailDispatcher(
+            on_delivered=lambda items: delivered_batches.append(len(items)),
+            workers=args.workers,
+            backoff=0.05,
+            recipient_interval=args.recipient_interval,
+            session_factory=stub.connect,
+        )
+        started = time.perf_counter()
+        for i, (to_email, subject, body) in enumerate(messages):
+            dispatcher.enqueue(to_email, subject, body, key=i)
+        drained = dispatcher.join(timeout=600)
+        current_time = time.perf_counter() - started
+        dispatcher.shutdown()
+        stats = dispatcher.stats()
+
+    print(
+        f"  현재 {current_time:7.2f}초  발송 {stats['sent']}통  SMTP 연결 {stats['sessions_opened']}회  "
+        f"재시도 {stats['retries']}회  실패 {stats['failed']}  수신자 제한 대기 {stats['rate_limited']}회"
+    )
+    print(f"  알림 비활성화 커밋 {len(delivered_batches)}회 (이전 방식은 {sent}회)")
+    print(f"  속도 {legacy_time / current_time:.1f}배")
+    if not drained or stats['sent'] + stats['failed'] != args.messages:
+        print("❌ 일부 메일이 처리되지 않았습니다")
+        return False
+    return True
+
+LEGACY_REFRESH_INTERVAL = 1800  # 예전 price_monitoring_scheduler 주기
+
+ADAPTIVE_PRODUCT_CLASSES = (
+    # (이름, 비율, 평균 가격 변경 간격(초), 변경 폭)
+    ('자주 변동', 0.05, 2 * 3600, 0.15),
+    ('가끔 변동', 0.15, 2 * 86400, 0.05),
+    ('거의 고정', 0.80, 90 * 86400, 0.02),
+)
+
+def _simulate_product_checks(rng, mean_gap, swing, days, interval_for):
+    """상품 하나의 실제 가격 변경과 확인 시각을 시뮬레이션. (확인 수, 변경별 발견 지연 목록)"""
+    from scheduler import VOLATILITY_WINDOW_DAYS
+
+    window = VOLATILITY_WINDOW_DAYS * 86400
+    end = days * 86400
+    # 시뮬레이션 시작 전 window 기간의 이력은 이미 DB에 있다고 가정
+    changes = []
+    t = -window + rng.expovariate(1 / mean_gap)
+    while t < end:
+        changes.append(t)
+        t += rng.expovariate(1 / mean_gap)
+
+    price = 10000.0
+    logged = [(-window, price)]  # (기록 시각, 가격)
+    for change in changes:
+        if change >= 0:
+            break
+        price *= 1 + rng.uniform(-swing, swing)
+        logged.append((change, price))
+
+    checks = 0
+    delays = []
+    pending = [change for change in changes if change >= 0]
+    now = rng.uniform(0, interval_for(logged, 0))
+    while now < end:
+        checks += 1
+        detected = [change for change in pending if change <= now]
+        if detected:
+            delays.extend(now - change for change in detected)
+            pending = pending[len(detected):]
+            price *= 1 + rng.uniform(-swing, swing)
+            logged.append((now, price))
+        now += interval_for(logged, now)
+    return checks, delays
+
+def bench_adaptive(args):
+    """고정 주기 vs 변동성 기반 적응형 주기: 크롤링 수와 가격 변경 발견 지연"""
+    from scheduler import compute_refresh_interval, VOLATILITY_WINDOW_DAYS
+
+    window = VOLATILITY_WINDOW_DAYS * 86400
+
+    def fixed_interval(logged, now):
+        return LEGACY_REFRESH_INTERVAL
+
+    def adaptive_interval(logged, now):
+        recent = [price for logged_at, price in logged if logged_at > now - window]
+        volatility = 0.0
+        if len(recent) > 1:
+            mean = sum(recent) / len(recent)
+            volatility = (sum((price - mean) ** 2 for price in recent) / len(recent)) ** 0.5 / mean
+        return compute_refresh_interval(len(recent), window, now - logged[-1][0], volatility)
+
+    print(f"상품 {args.products}개, {args.days}일 시뮬레이션 (고정 주기 {LEGACY_REFRESH_INTERVAL}초)")
+    totals = {'고정': [0, []], '적응형': [0, []]}
+    for name, share, mean_gap, swing in ADAPTIVE_PRODUCT_CLASSES:
+        count = max(1, int(args.products * share))
+        row = []
+        for label, interval_for in (('고정', fixed_interval), ('적응형', adaptive_interval)):
+            rng = random.Random(args.seed)  # 두 방식에 같은 실제 가격 변경을 적용
+            checks, delays = 0, []
+            for _ in range(count):
+                product_checks, product_delays = _simulate_product_checks(
+                    rng, mean_gap, swing, args.days, interval_for
+                )
+                checks += product_checks
+                delays.extend(product_delays)
+            totals[label][0] += checks
+            totals[label][1].extend(delays)
+            mean_delay = sum(delays) / len(delays) / 60 if delays else 0.0
+            row.append(f"{label} 크롤링 {checks:>8,}회 발견 지연 평균 {mean_delay:7.1f}분")
+        print(f"  {name:<6} {count:>5}개  " + '  |  '.join(row))
+
+    for label, (checks, delays) in totals.items():
+        mean_delay = sum(delays) / len(delays) / 60 if delays else 0.0
+        print(f"  전체 {label:<4} 크롤링 {checks:>9,}회  발견 지연 평균 {mean_delay:7.1f}분 (변경 {len(delays):,}건)")
+    print(f"  크롤링 {totals['고정'][0] / totals['적응형'][0]:.1f}배 감소")
+    return True
+
+def bench_throttle(args):
+    """속도 제한이 있는 서버에 대해: 제한 없음 vs 고정 토큰 버킷 vs 적응형"""
+    from concurrent.futures import ThreadPoolExecutor
+    from http_client import CrawlerClient, HostRateLimiter
+
+    modes = {
+        '제한 없음': HostRateLimiter(rate=0),
+        f'고정 {args.rate:g}/s': HostRateLimiter(rate=args.rate, burst=args.rate, adaptive=False),
+        f'적응형 ≤{args.rate:g}/s': HostRateLimiter(rate=args.rate, burst=args.rate, adaptive=True),
+    }
+    print(
+        f"서버 허용량 {args.capacity}/s, 요청 {args.requests}개, 동시 {args.workers}개 "
+        f"(재시도 최대 {args.retries}회, Retry-After {args.retry_after or '없음'})"
+    )
+    for label, limiter in modes.items():
+        with ThrottlingStubServer(args.capacity, retry_after=args.retry_after) as stub:
+            client = CrawlerClient(max_retries=args.retries, backoff=0.2, rate_limiter=limiter)
+            url = f"{stub.base_url}/item"
+
+            def fetch(_):
+                response = client.get(url, timeout=10)
+                ok = response.status_code == 200
+                response.close()
+                return ok
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                succeeded = sum(executor.map(fetch, range(args.requests)))
+            elapsed = time.perf_counter() - started
+            client.close()
+
+        host_stats = next(iter(limiter.stats().values()), {})
+        rate = f"최종 속도 {host_stats['rate']}/s" if host_stats else ''
+        print(
+            f"  {label:<12} 성공 {succeeded:>4}/{args.requests}  {elapsed:6.1f}초  "
+            f"처리량 {succeeded / elapsed:6.1f}/s  서버 429 {stub.throttled:>5}회  {rate}"
+        )
+    return True
+
+def bench_workers(args):
+    """crawl_worker.py 프로세스 수에 따른 가격 확인 처리량 (중복 크롤링 없음 확인)"""
+    import subprocess
+
+    db_path = use_temp_database()
+    worker_path = Path(__file__).resolve().parent / 'crawl_worker.py'
+    env = dict(os.environ, DATABASE_PATH=db_path, CRAWL_QUEUE='sqlite', HOST_RATE_LIMIT='0')
+
+    with StubSSGServer(latency=args.latency) as stub:
+        seed_products([stub.product_url(i) for i in range(args.products)])
+        print(
+            f"상품 {args.products}개, 응답 지연 {args.latency * 1000:.0f}ms, "
+            f"워커당 스레드 {args.threads}개, 배치 {args.batch}개"
+        )
+        ok = True
+        for processes in args.processes:
+            conn = database.get_db_connection()
+            conn.execute("UPDATE products SET next_check_at = '1970-01-01 00:00:00', last_checked_at = NULL, lease_owner = NULL")
+            conn.commit()
+            conn.close()
+            requests_before = stub.request_count
+
+            started = time.perf_counter()
+            workers = [
+                subprocess.Popen(
+                    [sys.executable, str(worker_path), '--drain', '--batch', str(args.batch),
+                     '--threads', str(args.threads), '--worker-id', f'bench-{index}'],
+                    cwd=worker_path.parent, env=env,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                for index in range(processes)
+            ]
+            failed_workers = sum(worker.wait() != 0 for worker in workers)
+            elapsed = time.perf_counter() - started
+
+            conn = database.get_db_connection()
+            unchecked = conn.execute('SELECT COUNT(*) FROM products WHERE last_checked_at IS NULL').fetchone()[0]
+            conn.close()
+            crawled = stub.request_count - requests_before
+            print(
+                f"  프로세스 {processes:>2}개  {elapsed:6.2f}초  {args.products / elapsed:8.1f}개/초  "
+                f"요청 {crawled}회  미확인 {unchecked}개"
+            )
+            if failed_workers or unchecked or crawled != args.products:
+                print("❌ 누락되거나 두 번 크롤링된 상품이 있습니다")
+                ok = False
+    return ok
+
+def _database_size(conn):
+    """체크포인트와 VACUUM 후 DB 파일 크기 (bytes)"""
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conn.execute('VACUUM')
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return os.path.getsize(database.DATABASE_PATH)
+
+def _time_history_scans(conn, product_ids, since=None):
+    from price_history import load_price_history
+
+    started = time.perf_counter()
+    histories = [load_price_history(conn, product_id, since) for product_id in product_ids]
+    elapsed = time.perf_counter() - started
+    return histories, elapsed, sum(len(prices) for _, prices in histories)
+
+def bench_history_tiers(args):
+    """가격 이력 압축 전후: 디스크 크기, 전체/최근 기간 조회 속도, 결과 일치 확인"""
+    import numpy as np
+    from price_history import compact_price_logs, storage_stats
+
+    use_temp_database()
+    conn = database.get_db_connection()
+    print(f"price_logs {args.points:,}개 점 생성 중 (상품 {args.products:,}개, {args.days}일)...")
+    started = time.perf_counter()
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO products (name, url, current_price)
+           SELECT '벤치마크 상품 ' || n, 'https://www.ssg.com/item/itemView.ssg?itemId=' || n, 10000 FROM seq''',
+        (args.products,)
+    )
+    # 점들을 args.days일에 고르게 흩어 놓고, 가격은 10,000원 근처에서 100원 단위로 움직인다
+    conn.execute(
+        '''WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+           INSERT INTO price_logs (product_id, price, logged_at)
+           SELECT n % ? + 1, 10000 + (abs(random()) % 50) * 100,
+                  datetime('now', '-' || ((? - n) * ?) || ' seconds')
+           FROM seq''',
+        (args.points, args.products, args.points, args.days * 86400 / args.points)
+    )
+    conn.commit()
+    print(f"  생성 {time.perf_counter() - started:.1f}초")
+
+    rng = random.Random(args.seed)
+    sample = rng.sample(range(1, args.products + 1), min(args.sample, args.products))
+    recent = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() - 30 * 86400))
+
+    size_before = _database_size(conn)
+    full_before, full_sec_before, full_points = _time_history_scans(conn, sample)
+    _, recent_sec_before, recent_points = _time_history_scans(conn, sample, recent)
+
+    started = time.perf_counter()
+    compact_price_logs(conn, args.raw_days)
+    compact_sec = time.perf_counter() - started
+    tiers = storage_stats(conn)
+
+    size_after = _database_size(conn)
+    full_after, full_sec_after, _ = _time_history_scans(conn, sample)
+    _, recent_sec_after, _ = _time_history_scans(conn, sample, recent)
+
+    print(
+        f"  압축 {compact_sec:.1f}초: 원본 {tiers['raw_points']:,}개 점 유지, "
+        f"{tiers['compacted_points']:,}개 점 → 블록 {tiers['blocks']:,}개 ({tiers['compacted_bytes']:,} bytes)"
+    )
+    print(
+        f"  DB 크기 {size_before / 1e6:9.1f}MB → {size_after / 1e6:9.1f}MB  "
+        f"({size_before / size_after:.1f}배 감소, 점당 {size_before / args.points:.1f}B → {size_after / args.points:.1f}B)"
+    )
+    print(
+        f"  전체 이력 조회 (상품 {len(sample)}개, {full_points:,}개 점)  "
+        f"{full_sec_before * 1000:8.1f}ms → {full_sec_after * 1000:8.1f}ms  "
+        f"({full_points / full_sec_before / 1e6:.2f} → {full_points / full_sec_after / 1e6:.2f}M 점/초)"
+    )
+    print(
+        f"  최근 30일 조회 ({recent_points:,}개 점)            "
+        f"{recent_sec_before * 1000:8.1f}ms → {recent_sec_after * 1000:8.1f}ms"
+    )
+    conn.close()
+
+    for (ts_before, prices_before), (ts_after, prices_after) in zip(full_before, full_after):
+        if not (np.array_equal(ts_before, ts_after) and np.array_equal(prices_before, prices_after)):
+            print("❌ 압축 전후 가격 이력이 다릅니다")
+            return False
+    return True
+
+def _probe_writes(stop, results):
+    """다른 요청의 쓰기(알림 등록)처럼 20ms마다 한 행을 커밋하며 대기 시간 기록"""
+    conn = database.get_db_connection()
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            conn.execute(
+                "INSERT INTO alerts (product_id, user_email, target_price, is_active) VALUES (1, 'probe@example.com', 0, 0)"
+            )
+            conn.commit()
+            results['latencies'].append(time.perf_counter() - started)
+        except Exception:
+            conn.rollback()
+            results['errors'] += 1
+        stop.wait(0.02)
+    conn.close()
+
+def _run_with_write_probe(func):
+    stop = threading.Event()
+    results = {'latencies': [], 'errors': 0}
+    probe = threading.Thread(target=_probe_writes, args=(stop, results))
+    probe.start()
+    started = time.perf_counter()
+    try:
+        value = func()
+    finally:
+        stop.set()
+        probe.join()
+    latencies = sorted(results['latencies']) or [0.0]
+    return value, time.perf_counter() - started, latencies, results['errors']
+
+def bench_writes(args):
+    """갱신 패스 중 다른 쓰기의 대기 시간: 긴 트랜잭션 하나 vs 마이크로 배치 커밋"""
+    from scheduler import update_product_prices, _percentile
+
+    use_temp_database()
+    with StubSSGServer(latency=args.latency) as stub:
+        seed_products([stub.product_url(i) for i in range(args.products)])
+        print(f"상품 {args.products}개, 응답 지연 {args.latency * 1000:.0f}ms, 스레드 {args.workers}개")
+
+        stats, elapsed, latencies, errors = _run_with_write_probe(
+            lambda: update_product_prices(max_workers=args.workers, per_host_limit=args.workers)
+        )
+        _, _, legacy_latencies, legacy_errors = _run_with_write_probe(
+            lambda: _simulate_refresh_writes(args.products, elapsed, threading.Event())
+        )
+
+    for label, probe, probe_errors in (('한 트랜잭션 (예전)', legacy_latencies, legacy_errors),
+                                       ('마이크로 배치', latencies, errors)):
+        print(
+            f"  {label:<12} 다른 쓰기 {len(probe):>4}회  p50 {_percentile(probe, 50) * 1000:8.1f}ms  "
+            f"p99 {_percentile(probe, 99) * 1000:8.1f}ms  최대 {probe[-1] * 1000:8.1f}ms  잠금 실패 {probe_errors}회"
+        )
+    print(
+        f"  배치 {stats['write_batches']}개 (평균 {stats['write_ms_avg']}ms, 최대 {stats['write_ms_max']}ms), "
+        f"패스 {elapsed:.1f}초, 변경 {stats['updated']}개, 실패 {stats['failed']}개"
+    )
+    return stats['failed'] == 0 and errors == 0
+
+def _reference_price_stats(timestamps, prices, now):
+    """파이썬 반복문으로 계산한 기준값 (벡터 연산 결과 검증용)"""
+    from price_stats import MOVING_AVERAGE_DAYS, MEDIAN_WINDOW_DAYS
+
+    segments = []  # (가격, 시작, 끝)
+    for i, (logged_at, price) in enumerate(zip(timestamps, prices)):
+        end = timestamps[i + 1] if i + 1 < len(timestamps) else max(now, logged_at)
+        segments.append((price, logged_at, end))
+
+    def weighted(days):
+        window_start = now - days * 86400
+        return [(price, max(0, end - max(start, window_start))) for price, start, end in segments]
+
+    averages = {}
+    for days in MOVING_AVERAGE_DAYS:
+        pairs = weighted(days)
+        total = sum(weight for _, weight in pairs)
+        averages[f'{days}d'] = round(sum(price * weight for price, weight in pairs) / total) if total else prices[-1]
+
+    pairs = sorted(weighted(MEDIAN_WINDOW_DAYS))
+    total = sum(weight for _, weight in pairs)
+    median = prices[-1]
+    if total:
+        cumulative = 0
+        for price, weight in pairs:
+            cumulative += weight
+            if cumulative >= total / 2:
+                median = price
+                break
+
+    running_high = 0
+    max_drawdown = 0.0
+    for price in prices:
+        running_high = max(running_high, price)
+        max_drawdown = min(max_drawdown, (price - running_high) / running_high * 100)
+
+    return {
+        'all_time_low': min(prices),
+        'all_time_high': max(prices),
+        'moving_average': averages,
+        f'median_{MEDIAN_WINDOW_DAYS}d': median,
+        'max_drawdown': round(max_drawdown, 2),
+    }
+
+def bench_stats(args):
+    """상품 가격 통계: 전체 상품 벡터 연산 vs 상품별 파이썬 반복문, 캐시 적중"""
+    import numpy as np
+    from price_history import load_price_history
+    from price_stats import all_product_price_stats, product_price_stats, stats_cache
+
+    use_temp_database()
+    conn = database.get_db_connection()
+    rng = np.random.default_rng(args.seed)
+    now = int(time.time())
+    conn.executemany(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        ((f"벤치마크 상품 {i}", f"https://www.ssg.com/item/itemView.ssg?itemId={i}", 10000)
+         for i in range(args.products))
+    )
+    # 상품마다 args.days일 동안 무작위 시각에 100원 단위로 오르내리는 가격
+    total = args.products * args.logs
+    product_ids = np.repeat(np.arange(1, args.products + 1), args.logs)
+    offsets = np.sort(rng.integers(0, args.days * 86400, size=(args.products, args.logs)), axis=1).ravel()
+    steps = rng.integers(-5, 6, size=(args.products, args.logs)) * 100
+    prices = np.maximum(20000 + np.cumsum(steps, axis=1), 1000).ravel()
+    conn.executemany(
+        "INSERT INTO price_logs (product_id, price, logged_at) VALUES (?, ?, datetime(?, 'unixepoch'))",
+        zip(product_ids.tolist(), prices.tolist(), (now - args.days * 86400 + offsets).tolist())
+    )
+    conn.commit()
+    print(f"상품 {args.products:,}개 x 이력 {args.logs}개 = {total:,}개 점 ({args.days}일)")
+
+    started = time.perf_counter()
+    results = all_product_price_stats(conn)
+    bulk_cold = time.perf_counter() - started
+    started = time.perf_counter()
+    all_product_price_stats(conn)
+    bulk_warm = time.perf_counter() - started
+
+    sample = rng.choice(np.arange(1, args.products + 1), size=min(args.sample, args.products), replace=False)
+    started = time.perf_counter()
+    single = [product_price_stats(conn, int(product_id)) for product_id in sample]
+    single_cold = (time.perf_counter() - started) / len(sample)
+
+    started = time.perf_counter()
+    for product_id in range(1, args.products + 1):
+        timestamps, history = load_price_history(conn, product_id)
+        _reference_price_stats(timestamps.tolist(), history.tolist(), now)
+    loop_sec = time.perf_counter() - started
+    conn.close()
+
+    print(f"  전체 상품 벡터 연산    {bulk_cold * 1000:9.1f}ms  (캐시 적중 {bulk_warm * 1000:.3f}ms)")
+    print(f"  상품별 반복문 (전체)   {loop_sec * 1000:9.1f}ms  ({loop_sec / bulk_cold:.1f}배)")
+    print(f"  상품 하나 통계         {single_cold * 1000:9.2f}ms  (캐시 항목 {stats_cache.stats()['size']}개)")
+
+    by_id = {stats['product_id']: stats for stats in results}
+    conn = database.get_db_connection()
+    for stats in single:
+        timestamps, history = load_price_history(conn, stats['product_id'])
+        expected = _reference_price_stats(timestamps.tolist(), history.tolist(), now)
+        actual = {key: by_id[stats['product_id']][key] for key in expected}
+        # 이동 평균은 계산 시각 차이로 1원까지 달라질 수 있다
+        for days, value in expected['moving_average'].items():
+            if abs(actual['moving_average'][days] - value) <= 1:
+                actual['moving_average'][days] = value
+        # 상품 하나 조회와 전체 조회는 계산 시각만 다르다
+        same = all(stats[key] == by_id[stats['product_id']][key]
+                   for key in ('points', 'current_price', 'all_time_low', 'all_time_high', 'max_drawdown'))
+        if actual != expected or not same:
+            print(f"❌ 상품 {stats['product_id']} 통계가 기준값과 다릅니다: {actual} != {expected}")
+            conn.close()
+            return False
+    conn.close()
+    return True
+
+def bench_deals(args):
+    """최저가 순위: 가격 요약 테이블 인덱스 top-K vs price_logs 전체 집계"""
+    import numpy as np
+    from price_stats import top_deals, DEAL_RANKINGS
+
+    use_temp_database()
+    conn = database.get_db_connection()
+    rng = np.random.default_rng(args.seed)
+    conn.executemany(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        ((f"벤치마크 상품 {i}", f"https://www.ssg.com/item/itemView.ssg?itemId={i}", 10000)
+         for i in range(args.products))
+    )
+    product_ids = np.repeat(np.arange(1, args.products + 1), args.logs)
+    steps = rng.integers(-5, 6, size=(args.products, args.logs)) * 100
+    prices = np.maximum(20000 + np.cumsum(steps, axis=1), 1000).ravel()
+    rows = list(zip(product_ids.tolist(), prices.tolist()))
+
+    # 요약 트리거가 INSERT마다 드는 비용 (트리거를 잠시 빼고 같은 양을 넣어 비교)
+    trigger_sql = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_price_logs_summary'"
+    ).fetchone()['sql']
+    conn.execute('DROP TRIGGER trg_price_logs_summary')
+    started = time.perf_counter()
+    conn.executemany('INSERT INTO price_logs (product_id, price) VALUES (?, ?)', rows)
+    conn.commit()
+    plain_sec = time.perf_counter() - started
+    conn.execute('DELETE FROM price_logs')
+    conn.execute(trigger_sql)
+    started = time.perf_counter()
+    conn.executemany('INSERT INTO price_logs (product_id, price) VALUES (?, ?)', rows)
+    conn.commit()
+    trigger_sec = time.perf_counter() - started
+    conn.execute('ANALYZE')
+    print(f"상품 {args.products:,}개 x 이력 {args.logs}개 = {len(rows):,}개 점")
+    print(f"  기록 {plain_sec:.2f}s -> 요약 트리거 포함 {trigger_sec:.2f}s (+{(trigger_sec / plain_sec - 1) * 100:.0f}%)")
+
+    ok = True
+    for by, order in DEAL_RANKINGS.items():
+        top_deals(conn, args.limit, by)
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            deals = top_deals(conn, args.limit, by)
+        summary_ms = (time.perf_counter() - started) / args.repeat * 1000
+
+        # 요약 테이블 없이 price_logs를 전부 집계해 같은 순위를 구하는 기준 쿼리
+        started = time.perf_counter()
+        expected = [row['product_id'] for row in conn.execute(f'''
+            WITH s AS (
+                SELECT l.product_id, MIN(l.price) AS min_price, SUM(l.price) AS price_sum, COUNT(*) AS points,
+                       (SELECT price FROM price_logs latest WHERE latest.product_id = l.product_id
+                        ORDER BY latest.id DESC LIMIT 1) AS current_price
+                FROM price_logs l GROUP BY l.product_id
+            )
+            SELECT s.product_id FROM (
+                SELECT product_id, current_price * 1.0 / min_price AS low_ratio,
+                       current_price * points * 1.0 / price_sum AS avg_ratio
+                FROM s WHERE points >= 2
+            ) s
+            ORDER BY {order}
+            LIMIT ?
+        ''', (args.limit,))]
+        scan_ms = (time.perf_counter() - started) * 1000
+
+        plan = ' / '.join(row['detail'] for row in conn.execute(f'''
+            EXPLAIN QUERY PLAN SELECT s.product_id FROM product_price_summary s
+            JOIN products p ON p.id = s.product_id WHERE s.points >= 2 ORDER BY {order} LIMIT 20
+        '''))
+        print(f"  by={by:<8} 요약 top-{args.limit} {summary_ms:8.2f}ms   전체 집계 {scan_ms:9.1f}ms  ({scan_ms / summary_ms:,.0f}배)")
+        print(f"             실행 계획: {plan}")
+        if [deal['product_id'] for deal in deals] != expected:
+            print(f"❌ by={by} 순위가 전체 집계 결과와 다릅니다")
+            ok = False
+        if 'TEMP B-TREE' in plan:
+            print(f"❌ by={by} 순위가 인덱스 대신 정렬을 사용합니다")
+            ok = False
+    conn.close()
+    return ok
+
+def bench_search(args):
+    """여러 페이지 검색: 페이지를 차례로 받기 vs 동시에 받아 스트리밍"""
+    import json
+    import crawler
+    import app as app_module
+
+    use_temp_database()
+    client = app_module.app.test_client()
+    with StubSearchServer(per_page=args.per_page, overlap=args.overlap, latency=args.latency) as stub:
+        crawler.SSG_SEARCH_URL = stub.search_url
+        expected = {str(item_id) for page in range(1, args.pages + 1) for item_id in stub.item_ids(page)}
+        print(f"{args.pages}페이지 x {args.per_page}개 (페이지 간 중복 {args.overlap}개), 페이지 응답 지연 {args.latency * 1000:.0f}ms")
+
+        # 기존 방식: /api/search를 페이지마다 차례로 호출
+        crawler.search_cache.clear()
+        started = time.perf_counter()
+        first_sec = None
+        sequential = set()
+        for page in range(1, args.pages + 1):
+            data = client.get(f'/api/search?keyword=벤치마크&page={page}&limit={args.per_page}').get_json()
+            first_sec = first_sec or time.perf_counter() - started
+            sequential.update(product['url'] for product in data['products'])
+        sequential_sec = time.perf_counter() - started
+
+        crawler.search_cache.clear()
+        started = time.perf_counter()
+        first_ms = None
+        events = []
+        response = client.get(f'/api/search/stream?keyword=벤치마크&pages={args.pages}', buffered=False)
+        for line in response.response:
+            if first_ms is None:
+                first_ms = (time.perf_counter() - started) * 1000
+            for text in line.decode('utf-8').splitlines():
+                events.append(json.loads(text))
+        stream_sec = time.perf_counter() - started
+        response.close()
+
+    streamed = [product for event in events if event['type'] == 'products' for product in event['products']]
+    streamed_ids = [product['url'].rsplit('=', 1)[-1] for product in streamed]
+    print(f"  페이지마다 /api/search     첫 결과 {first_sec * 1000:7.0f}ms  전체 {sequential_sec * 1000:7.0f}ms  "
+          f"서로 다른 상품 {len(sequential)}개")
+    print(f"  /api/search/stream         첫 결과 {first_ms:7.0f}ms  전체 {stream_sec * 1000:7.0f}ms  "
+          f"상품 {len(streamed)}개, 이벤트 {len(events)}개")
+
+    if events[-1]['type'] != 'done' or events[-1]['total'] != len(streamed):
+        print("❌ 스트림이 done 이벤트로 끝나지 않았습니다")
+        return False
+    if len(streamed_ids) != len(set(streamed_ids)) or set(streamed_ids) != expected:
+        print(f"❌ 스트리밍 결과가 itemId 기준 중복 제거 결과와 다릅니다 ({len(set(streamed_ids))} != {len(expected)})")
+        return False
+    return True
+
+def bench_refresh(args):
+    """가격 갱신 패스 처리량/지연 측정"""
+    from scheduler import update_product_prices
+
+    use_temp_database()
+    with StubSSGServer(latency=args.latency, etag=args.etag) as stub:
+        seed_products([stub.product_url(i) for i in range(args.products)])
+
+        print(f"상품 {args.products}개, 응답 지연 {args.latency * 1000:.0f}ms")
+        for workers in args.workers:
+            stats = update_product_prices(max_workers=workers, per_host_limit=args.per_host)
+            print(
+                f"  workers={workers:<3} {stats['throughput_per_sec']:>8}개/초  "
+                f"p50 {stats['latency_p50_ms']}ms  p95 {stats['latency_p95_ms']}ms  "
+                f"p99 {stats['latency_p99_ms']}ms  실패 {stats['failed']}"
+            )
+            print(
+                f"             304 {stats['not_modified']}개  다운로드 {stats['bytes_downloaded']:,}B  "
+                f"절약 {stats['bytes_saved']:,}B / 파싱 {stats['parse_ms_saved']}ms"
+            )
+        client_stats = get_client().stats()
+        print(
+            f"  HTTP 요청 {client_stats['requests']}회, 새 연결 {client_stats['new_connections']}개, "
+            f"재사용 {client_stats['reused_connections']}회, 재시도 {client_stats['retries']}회"
+        )
+        if stub.request_count < args.products * len(args.workers):
+            print("❌ 일부 상품이 요청되지 않았습니다")
+            return False
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='SSG 가격 추적 시스템 성능 측정')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    refresh = subparsers.add_parser('refresh', help='병렬 가격 갱신 엔진 측정')
+    refresh.add_argument('--products', type=int, default=300)
+    refresh.add_argument('--latency', type=float, default=0.05, help='스텁 서버 응답 지연 (초)')
+    refresh.add_argument('--workers', type=int, nargs='+', default=[1, 8, 32])
+    refresh.add_argument('--per-host', type=int, default=32)
+    refresh.add_argument('--etag', action='store_true', help='스텁 서버가 ETag/304를 지원')
+    refresh.set_defaults(func=bench_refresh)
+
+    parse = subparsers.add_parser('parse', help='상품 페이지 파싱 경로 비교')
+    parse.add_argument('--corpus', help='저장된 상품 페이지(*.html) 디렉토리')
+    parse.add_argument('--pages', type=int, default=50, help='합성 페이지 수 (corpus 없을 때)')
+    parse.add_argument('--repeat', type=int, default=3)
+    parse.set_defaults(func=bench_parse)
+
+    price = subparsers.add_parser('price', help='가격 텍스트 추출 속도 측정')
+    price.add_argument('--blocks', type=int, default=2000, help='합성 페이지 크기 (항목 수)')
+    price.add_argument('--repeat', type=int, default=20)
+    price.set_defaults(func=bench_price)
+
+    dashboard = subparsers.add_parser('dashboard', help='갱신 중 대시보드 읽기 지연 측정')
+    dashboard.add_argument('--products', type=int, default=20000)
+    dashboard.add_argument('--logs', type=int, default=5, help='상품당 가격 이력 수')
+    dashboard.add_argument('--duration', type=float, default=5.0, help='갱신 패스 길이 (초)')
+    dashboard.set_defaults(func=bench_dashboard)
+
+    dashboard_load = subparsers.add_parser('dashboard-load', help='대시보드 집계 카운터 부하 테스트 (초당 요청 수)')
+    dashboard_load.add_argument('--products', type=int, default=100000)
+    dashboard_load.add_argument('--logs', type=int, default=10, help='상품당 가격 이력 수')
+    dashboard_load.add_argument('--alerts', type=int, default=100000)
+    dashboard_load.add_argument('--threads', type=int, default=8)
+    dashboard_load.add_argument('--duration', type=float, default=5.0)
+    dashboard_load.set_defaults(func=bench_dashboard_load)
+
+    schema = subparsers.add_parser('schema', help='대용량 price_logs에서 인덱스 스키마 효과 측정')
+    schema.add_argument('--rows', type=int, default=1000000, help='price_logs 행 수 (예: 10000000)')
+    schema.add_argument('--products', type=int, default=10000)
+    schema.add_argument('--repeat', type=int, default=5)
+    schema.set_defaults(func=bench_schema)
+
+    alerts = subparsers.add_parser('alerts', help='가격 변경 시 알림 확인 비용 측정')
+    alerts.add_argument('--alerts', type=int, default=1000000)
+    alerts.add_argument('--products', type=int, default=100000)
+    alerts.add_argument('--changed', type=int, default=1000, help='한 갱신 패스에서 가격이 바뀐 상품 수')
+    alerts.set_defaults(func=bench_alerts)
+
+    mail = subparsers.add_parser('mail', help='알림 메일 발송 큐 측정 (로컬 SMTP 스텁)')
+    mail.add_argument('--messages', type=int, default=200)
+    mail.add_argument('--recipients', type=int, default=500, help='서로 다른 수신자 수')
+    mail.add_argument('--connect-latency', type=float, default=0.2, help='연결+TLS+로그인 비용 (초)')
+    mail.add_argument('--fail-rate', type=float, default=0.02, help='일시적 오류(451) 비율')
+    mail.add_argument('--workers', type=int, default=2)
+    mail.add_argument('--recipient-interval', type=float, default=0.0, help='수신자별 최소 발송 간격 (초)')
+    mail.set_defaults(func=bench_mail)
+
+    adaptive = subparsers.add_parser('adaptive', help='적응형 갱신 주기 시뮬레이션 (크롤링 수, 변경 발견 지연)')
+    adaptive.add_argument('--products', type=int, default=1000)
+    adaptive.add_argument('--days', type=int, default=14)
+    adaptive.add_argument('--seed', type=int, default=7)
+    adaptive.set_defaults(func=bench_adaptive)
+
+    throttle = subparsers.add_parser('throttle', help='호스트별 속도 제한/적응형 백오프 시뮬레이션')
+    throttle.add_argument('--capacity', type=float, default=20, help='서버가 허용하는 초당 요청 수')
+    throttle.add_argument('--rate', type=float, default=50, help='클라이언트 토큰 버킷 속도 (초당)')
+    throttle.add_argument('--requests', type=int, default=400)
+    throttle.add_argument('--workers', type=int, default=16)
+    throttle.add_argument('--retries', type=int, default=3)
+    throttle.add_argument('--retry-after', type=int, help='429 응답에 Retry-After 헤더 포함 (초)')
+    throttle.set_defaults(func=bench_throttle)
+
+    workers = subparsers.add_parser('workers', help='가격 확인 워커 프로세스 수평 확장 측정')
+    workers.add_argument('--products', type=int, default=2000)
+    workers.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4])
+    workers.add_argument('--threads', type=int, default=8, help='워커당 크롤링 스레드 수')
+    workers.add_argument('--batch', type=int, default=100)
+    workers.add_argument('--latency', type=float, default=0.1, help='스텁 서버 응답 지연 (초)')
+    workers.set_defaults(func=bench_workers)
+
+    history_tiers = subparsers.add_parser('history-tiers', help='가격 이력 압축 블록: 디스크 절감과 조회 속도')
+    history_tiers.add_argument('--points', type=int, default=5000000, help='price_logs 점 개수 (예: 50000000)')
+    history_tiers.add_argument('--products', type=int, default=10000)
+    history_tiers.add_argument('--days', type=int, default=365, help='점을 흩어 놓을 기간')
+    history_tiers.add_argument('--raw-days', type=int, default=90, help='원본으로 남길 최근 기간 (PRICE_LOG_RAW_DAYS)')
+    history_tiers.add_argument('--sample', type=int, default=200, help='조회 속도를 잴 상품 수')
+    history_tiers.add_argument('--seed', type=int, default=7)
+    history_tiers.set_defaults(func=bench_history_tiers)
+
+    writes = subparsers.add_parser('writes', help='갱신 패스 중 다른 쓰기의 잠금 대기 측정')
+    writes.add_argument('--products', type=int, default=1000)
+    writes.add_argument('--workers', type=int, default=16)
+    writes.add_argument('--latency', type=float, default=0.05, help='스텁 서버 응답 지연 (초)')
+    writes.set_defaults(func=bench_writes)
+
+    stats = subparsers.add_parser('stats', help='가격 통계 벡터 연산과 캐시 측정')
+    stats.add_argument('--products', type=int, default=20000)
+    stats.add_argument('--logs', type=int, default=50, help='상품당 가격 이력 수')
+    stats.add_argument('--days', type=int, default=180)
+    stats.add_argument('--sample', type=int, default=200, help='상품 하나 통계를 잴 상품 수')
+    stats.add_argument('--seed', type=int, default=7)
+    stats.set_defaults(func=bench_stats)
+
+    deals = subparsers.add_parser('deals', help='최저가 순위 top-K 측정')
+    deals.add_argument('--products', type=int, default=100000)
+    deals.add_argument('--logs', type=int, default=20, help='상품당 가격 이력 수')
+    deals.add_argument('--limit', type=int, default=20)
+    deals.add_argument('--repeat', type=int, default=100)
+    deals.add_argument('--seed', type=int, default=7)
+    deals.set_defaults(func=bench_deals)
+
+    search = subparsers.add_parser('search', help='여러 페이지 검색 스트리밍 측정 (로컬 검색 스텁)')
+    search.add_argument('--pages', type=int, default=5)
+    search.add_argument('--per-page', type=int, default=40)
+    search.add_argument('--overlap', type=int, default=5, help='이웃한 페이지에 함께 나오는 상품 수')
+    search.add_argument('--latency', type=float, default=0.3, help='검색 페이지 응답 지연 (초)')
+    search.set_defaults(func=bench_search)
+
+    args = parser.parse_args()
+    ok = args.func(args)
+    sys.exit(0 if ok is not False else 1)
+
+if __name__ == '__main__':
+    main()
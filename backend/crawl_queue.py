@@ -0,0 +1,284 @@
+import os
+import socket
+import threading
+import time
+
+# 가격 확인 작업 큐 설정
+# CRAWL_QUEUE=sqlite(기본)면 products.next_check_at 자체가 큐이고,
+# redis면 확인 예정 시각을 Redis 정렬 집합에 두고 상품 데이터는 SQLite에 그대로 둔다.
+CRAWL_QUEUE = os.environ.get('CRAWL_QUEUE', 'sqlite')
+CRAWL_LEASE_SEC = int(os.environ.get('CRAWL_LEASE_SEC', 600))
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_QUEUE_PREFIX = os.environ.get('REDIS_QUEUE_PREFIX', 'ssg:crawl')
+REDIS_SYNC_INTERVAL = int(os.environ.get('REDIS_SYNC_INTERVAL', 60))
+
+PRODUCT_REFRESH_COLUMNS = '''
+    SELECT p.id, p.name, p.url, p.current_price,
+           c.etag, c.last_modified, c.content_bytes, c.parse_ms
+    FROM products p
+    LEFT JOIN product_http_cache c ON c.product_id = p.id
+'''
+
+def default_worker_id():
+    """리스 소유자로 기록할 이 프로세스의 이름 (호스트:pid)"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def load_refresh_rows(conn, product_ids):
+    """갱신에 필요한 상품 행 (조건부 GET 검증자 포함)"""
+    rows = []
+    for start in range(0, len(product_ids), 500):
+        chunk = product_ids[start:start + 500]
+        rows.extend(conn.execute(
+            f"{PRODUCT_REFRESH_COLUMNS} WHERE p.id IN ({', '.join('?' * len(chunk))})", chunk
+        ).fetchall())
+    return rows
+
+class SQLiteCrawlQueue:
+    """products.next_check_at을 우선순위 큐로 쓰는 가격 확인 작업 큐
+
+    claim()은 확인할 때가 된 상품을 오래 밀린 순으로 골라 lease_owner를
+    기록하고 next_check_at을 리스 만료 시각으로 미룬다. 워커가 complete()
+    하지 못하고 죽으면 리스가 끝나는 순간 다시 확인 대상이 된다.
+    여러 프로세스가 같은 DB 파일로 동시에 claim해도 BEGIN IMMEDIATE로
+    직렬화되므로 같은 상품을 두 워커가 받지 않는다.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, lease_sec=CRAWL_LEASE_SEC):
+        self.lease_sec = lease_sec
+
+    def claim(self, conn, worker_id, limit):
+        """최대 limit개를 선점하고 갱신할 상품 행 반환"""
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ids = [row['id'] for row in conn.execute('''
+                SELECT id FROM products
+                WHERE next_check_at <= CURRENT_TIMESTAMP
+                ORDER BY next_check_at
+                LIMIT ?
+            ''', (limit,))]
+            conn.executemany(
+                '''UPDATE products SET lease_owner = ?, next_check_at = datetime('now', ?)
+                   WHERE id = ?''',
+                [(worker_id, f'+{self.lease_sec} seconds', product_id) for product_id in ids]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return load_refresh_rows(conn, ids)
+
+    def complete(self, conn, worker_id, intervals):
+        """확인을 마친 상품의 다음 확인 시각 기록 (커밋은 호출자가)
+
+        intervals: {상품 id: 다음 확인까지 초}. 리스가 만료돼 다른 워커가
+        다시 가져간 상품은 건드리지 않는다.
+        """
+        conn.executemany(
+            '''UPDATE products SET last_checked_at = CURRENT_TIMESTAMP,
+                                   next_check_at = datetime('now', ?),
+                                   lease_owner = NULL
+               WHERE id = ? AND (lease_owner IS NULL OR lease_owner = ?)''',
+            [(f'+{interval} seconds', product_id, worker_id) for product_id, interval in intervals.items()]
+        )
+
+    def reschedule(self, conn, product_id):
+        """API가 바꾼 products.next_check_at을 큐에 반영 (SQLite는 그 컬럼이 곧 큐)"""
+
+    def release(self, conn, worker_id, product_ids):
+        """확인하지 못한 상품을 바로 다시 확인 대상으로 돌려놓는다 (커밋은 호출자가)"""
+        conn.executemany(
+            '''UPDATE products SET next_check_at = CURRENT_TIMESTAMP, lease_owner = NULL
+               WHERE id = ? AND lease_owner = ?''',
+            [(product_id, worker_id) for product_id in product_ids]
+        )
+
+    def backlog(self, conn):
+        """(확인할 때가 된 상품 수, 가장 오래 밀린 시간(초))
+
+        밀린 시간은 한 번이라도 확인한 상품 기준 (새 상품은 기본값이 1970년)
+        """
+        row = conn.execute('''
+            SELECT COUNT(*) AS due,
+                   CAST(strftime('%s', 'now') AS INTEGER)
+                   - CAST(strftime('%s', MIN(CASE WHEN last_checked_at IS NOT NULL THEN next_check_at END)) AS INTEGER) AS overdue
+            FROM products WHERE next_check_at <= CURRENT_TIMESTAMP
+        ''').fetchone()
+        return row['due'], row['overdue'] or 0
+
+    def stats(self, conn):
+        due, overdue = self.backlog(conn)
+        leases = conn.execute('''
+            SELECT lease_owner, COUNT(*) AS products FROM products
+            WHERE lease_owner IS NOT NULL AND next_check_at > CURRENT_TIMESTAMP
+            GROUP BY lease_owner
+        ''').fetchall()
+        return {
+            'backend': self.name,
+            'lease_sec': self.lease_sec,
+            'due': due,
+            'max_overdue_sec': overdue,
+            'leased': sum(row['products'] for row in leases),
+            'workers': {row['lease_owner']: row['products'] for row in leases},
+        }
+
+# KEYS: 예정 시각 정렬 집합, 리스 해시 / ARGV: 현재, 개수, 리스 만료, 워커 id
+_REDIS_CLAIM = '''
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do
+    redis.call('ZADD', KEYS[1], ARGV[3], id)
+    redis.call('HSET', KEYS[2], id, ARGV[4])
+end
+return ids
+'''
+
+# ARGV: 워커 id, (상품 id, 다음 예정 시각) 반복. 다른 워커가 가져간 상품은 건너뛰고
+# 반영한 상품 id 목록을 반환한다
+_REDIS_COMPLETE = '''
+local accepted = {}
+for i = 2, #ARGV, 2 do
+    local owner = redis.call('HGET', KEYS[2], ARGV[i])
+    if not owner or owner == ARGV[1] then
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+        redis.call('HDEL', KEYS[2], ARGV[i])
+        table.insert(accepted, ARGV[i])
+    end
+end
+return accepted
+'''
+
+# ARGV: 현재, 상품 id, 새 예정 시각. 리스가 살아 있으면 그대로 둔다
+# (리스를 가진 워커가 complete할 때 바뀐 갱신 주기로 다음 시각을 정한다)
+_REDIS_RESCHEDULE = '''
+local score = redis.call('ZSCORE', KEYS[1], ARGV[2])
+if redis.call('HEXISTS', KEYS[2], ARGV[2]) == 1 and score and tonumber(score) > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[2])
+redis.call('HDEL', KEYS[2], ARGV[2])
+return 1
+'''
+
+class RedisCrawlQueue:
+    """확인 예정 시각을 Redis 정렬 집합으로 관리하는 작업 큐
+
+    여러 서버의 워커가 하나의 Redis를 함께 쓸 때 사용한다. 선점/완료는
+    Lua 스크립트로 원자적으로 처리하고, SQLite의 next_check_at도 함께
+    기록해 API에서 보이는 값은 같다. 새로 등록된 상품은 REDIS_SYNC_INTERVAL
+    마다 SQLite에서 읽어 큐에 넣는다 (redis 패키지 필요).
+    """
+
+    name = 'redis'
+
+    def __init__(self, url=REDIS_URL, prefix=REDIS_QUEUE_PREFIX, lease_sec=CRAWL_LEASE_SEC,
+                 sync_interval=REDIS_SYNC_INTERVAL):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('CRAWL_QUEUE=redis를 쓰려면 redis 패키지를 설치하세요 (pip install redis)')
+        self.lease_sec = lease_sec
+        self.sync_interval = sync_interval
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._due_key = f'{prefix}:due'
+        self._lease_key = f'{prefix}:leases'
+        self._claim = self._redis.register_script(_REDIS_CLAIM)
+        self._complete = self._redis.register_script(_REDIS_COMPLETE)
+        self._reschedule = self._redis.register_script(_REDIS_RESCHEDULE)
+        self._synced_at = 0.0
+
+    def sync(self, conn):
+        """SQLite에 있지만 큐에 없는 상품을 추가하고, 지워진 상품은 뺀다"""
+        rows = conn.execute(
+            "SELECT id, CAST(strftime('%s', next_check_at) AS INTEGER) AS due FROM products"
+        ).fetchall()
+        product_ids = {str(row['id']) for row in rows}
+        pipe = self._redis.pipeline()
+        if rows:
+            pipe.zadd(self._due_key, {str(row['id']): row['due'] or 0 for row in rows}, nx=True)
+        stale = [member for member in self._redis.zrange(self._due_key, 0, -1) if member not in product_ids]
+        if stale:
+            pipe.zrem(self._due_key, *stale)
+            pipe.hdel(self._lease_key, *stale)
+        pipe.execute()
+        self._synced_at = time.monotonic()
+
+    def claim(self, conn, worker_id, limit):
+        if time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync(conn)
+        now = time.time()
+        ids = self._claim(
+            keys=[self._due_key, self._lease_key],
+            args=[now, limit, now + self.lease_sec, worker_id]
+        )
+        return load_refresh_rows(conn, [int(product_id) for product_id in ids])
+
+    def complete(self, conn, worker_id, intervals):
+        """Redis에서 리스 소유자를 확인해 반영된 상품만 SQLite에도 기록 (커밋은 호출자가)"""
+        if not intervals:
+            return
+        now = time.time()
+        args = [worker_id]
+        for product_id, interval in intervals.items():
+            args.extend([product_id, now + interval])
+        accepted = self._complete(keys=[self._due_key, self._lease_key], args=args)
+        conn.executemany(
+            '''UPDATE products SET last_checked_at = CURRENT_TIMESTAMP,
+                                   next_check_at = datetime('now', ?)
+               WHERE id = ?''',
+            [(f'+{intervals[int(product_id)]} seconds', int(product_id)) for product_id in accepted]
+        )
+
+    def reschedule(self, conn, product_id):
+        """PATCH로 바뀐 products.next_check_at을 정렬 집합에도 반영"""
+        row = conn.execute(
+            "SELECT CAST(strftime('%s', next_check_at) AS INTEGER) AS due FROM products WHERE id = ?",
+            (product_id,)
+        ).fetchone()
+        if row is not None:
+            self._reschedule(keys=[self._due_key, self._lease_key], args=[time.time(), product_id, row['due'] or 0])
+
+    def release(self, conn, worker_id, product_ids):
+        if product_ids:
+            self._complete(
+                keys=[self._due_key, self._lease_key],
+                args=[worker_id] + [value for product_id in product_ids for value in (product_id, time.time())]
+            )
+
+    def backlog(self, conn):
+        now = time.time()
+        due = self._redis.zcount(self._due_key, '-inf', now)
+        # 한 번도 확인하지 않은 상품(예정 시각 0)은 밀린 시간 계산에서 뺀다
+        oldest = self._redis.zrangebyscore(self._due_key, '(0', now, start=0, num=1, withscores=True)
+        return due, int(now - oldest[0][1]) if oldest else 0
+
+    def stats(self, conn):
+        due, overdue = self.backlog(conn)
+        workers = {}
+        for owner in self._redis.hvals(self._lease_key):
+            workers[owner] = workers.get(owner, 0) + 1
+        return {
+            'backend': self.name,
+            'lease_sec': self.lease_sec,
+            'due': due,
+            'max_overdue_sec': overdue,
+            'leased': sum(workers.values()),
+            'workers': workers,
+        }
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_crawl_queue():
+    """CRAWL_QUEUE 설정에 맞는 프로세스 공용 작업 큐"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                if CRAWL_QUEUE == 'redis':
+                    _queue = RedisCrawlQueue()
+                elif CRAWL_QUEUE == 'sqlite':
+                    _queue = SQLiteCrawlQueue()
+                else:
+                    raise ValueError(f'알 수 없는 CRAWL_QUEUE: {CRAWL_QUEUE}')
+    return _queue
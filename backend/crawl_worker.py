@@ -0,0 +1,74 @@
+"""
+가격 확인 워커 - API 서버와 따로 실행하는 크롤링 프로세스
+
+가격 확인 작업 큐(crawl_queue)에서 확인할 때가 된 상품을 리스로 선점해
+크롤링하고 결과를 DB에 기록한다. 같은 DB(또는 CRAWL_QUEUE=redis면 같은
+Redis)를 쓰는 워커를 코어/서버 수만큼 띄우면 된다. 이때 API 서버는
+REFRESH_IN_PROCESS=0으로 실행해 가격 갱신을 워커에 맡긴다.
+
+사용법:
+    python crawl_worker.py
+    python crawl_worker.py --batch 100 --threads 16
+    python crawl_worker.py --drain   # 밀린 상품을 다 처리하면 종료
+"""
+
+import argparse
+import signal
+import threading
+
+from database import init_db, close_all_connections
+from notification import mail_dispatcher
+from scheduler import update_product_prices, REFRESH_BATCH_SIZE, REFRESH_MAX_WORKERS
+from crawl_queue import get_crawl_queue, default_worker_id
+
+def run_worker(worker_id, batch_size, threads, idle_sleep, stop_event, drain=False):
+    """큐가 빌 때까지 배치를 연달아 처리하고, 비면 idle_sleep초 쉰다 (drain이면 종료)"""
+    passes = 0
+    products = 0
+    while not stop_event.is_set():
+        stats = update_product_prices(
+            max_workers=threads,
+            due_only=True,
+            stop_event=stop_event,
+            batch_size=batch_size,
+            worker_id=worker_id
+        )
+        passes += 1
+        products += stats['products']
+        if stats['products'] < batch_size:
+            if drain:
+                break
+            stop_event.wait(idle_sleep)
+    return passes, products
+
+def main():
+    parser = argparse.ArgumentParser(description='SSG 가격 확인 워커')
+    parser.add_argument('--batch', type=int, default=REFRESH_BATCH_SIZE, help='한 번에 선점할 상품 수')
+    parser.add_argument('--threads', type=int, default=REFRESH_MAX_WORKERS, help='동시 크롤링 스레드 수')
+    parser.add_argument('--idle-sleep', type=float, default=5.0, help='큐가 비었을 때 대기 (초)')
+    parser.add_argument('--worker-id', default=default_worker_id())
+    parser.add_argument('--drain', action='store_true', help='확인할 상품이 없으면 종료')
+    args = parser.parse_args()
+
+    init_db()
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        # 진행 중인 크롤링은 마치고, 시작 전인 상품은 큐에 돌려놓는다
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    print(f"가격 확인 워커 {args.worker_id} 시작 (큐: {get_crawl_queue().name}, 배치 {args.batch}, 스레드 {args.threads})")
+    try:
+        passes, products = run_worker(
+            args.worker_id, args.batch, args.threads, args.idle_sleep, stop_event, drain=args.drain
+        )
+    finally:
+        mail_dispatcher.shutdown()
+        close_all_connections()
+    print(f"가격 확인 워커 {args.worker_id} 종료: {passes}회, 상품 {products}개")
+
+if __name__ == '__main__':
+    main()
@@ -1,145 +1,242 @@
-import requests
 from bs4 import BeautifulSoup
 import re
+import os
+import copy
+import html
 import time
 import json
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import quote, urlsplit, parse_qsl
+from http_client import get_client
+from cache import TTLCache
+from product_urls import normalize_product_url
 
-def get_headers():
-    """공통 헤더 반환"""
-    return {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+# 검색 결과 캐시 설정
+SEARCH_CACHE_TTL = int(os.environ.get('SEARCH_CACHE_TTL', 300))
+SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', 256))
+
+# 여러 페이지 스트리밍 검색: 동시에 받을 페이지 수와 한 번에 요청할 수 있는 최대 페이지
+SSG_SEARCH_URL = os.environ.get('SSG_SEARCH_URL', 'https://www.ssg.com/search.ssg')
+SEARCH_PAGE_WORKERS = int(os.environ.get('SEARCH_PAGE_WORKERS', 4))
+SEARCH_MAX_PAGES = int(os.environ.get('SEARCH_MAX_PAGES', 10))
+
+search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
+def parse_search_page(content, keyword, limit=None):
+    """검색 결과 페이지 HTML에서 상품 목록 추출 (광고 제외, 최대 limit개)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    products = []
+    
+    # 모든 상품 링크 찾기
+    all_links = soup.find_all('a', href=True)
+    product_links = []
+    
+    for link in all_links:
+        href = link.get('href', '')
+        if 'itemView.ssg' in href and 'itemId=' in href:
+            # 광고 링크 제외
+            if 'advertBidId' not in href and 'ADAD' not in link.get_text():
+                product_links.append(link)
+    
+    print(f"유효한 상품 링크 {len(product_links)}개 발견")
+    
+    # 상품 정보 추출
+    processed_urls = set()
+    
+    for link in product_links:
+        if limit is not None and len(products) >= limit:
+            break
+            
+        try:
+            href = link.get('href')
+            if href.startswith('/'):
+                product_url = f"https://www.ssg.com{href}"
+            else:
+                product_url = href
+            
+            # 중복 제거
+            if product_url in processed_urls:
+                continue
+            processed_urls.add(product_url)
+            
+            # 상품명 추출 - 링크 텍스트 또는 주변 요소에서
+            name = link.get_text(strip=True)
+            
+            # 링크 텍스트가 없거나 너무 짧으면 부모 요소에서 찾기
+            if not name or len(name) < 10:
+                parent = link.parent
+                while parent and not name:
+                    parent_text = parent.get_text(strip=True)
+                    if parent_text and len(parent_text) > 10 and len(parent_text) < 200:
+                        # 불필요한 텍스트 제거
+                        clean_text = re.sub(r'(리뷰|별점|갯수|할인율|정상가격|판매가격).*', '', parent_text)
+                        if len(clean_text) > 10:
+                            name = clean_text[:100]
+                            break
+                    parent = parent.parent
+                    if not parent or parent.name == 'body':
+                        break
+            
+            # 여전히 이름이 없으면 기본값
+            if not name or len(name) < 5:
+                name = f"{keyword} 관련 상품"
+            
+            # 가격 추출 - 부모 요소에서 찾기
+            price = 0
+            current = link.parent
+            for _ in range(5):  # 최대 5단계 부모까지 확인
+                if current:
+                    price_text = current.get_text()
+                    price = extract_price_from_text(price_text)
+                    if price > 0:
+                        break
+                    current = current.parent
+                else:
+                    break
+            
+            # 이미지 찾기
+            image_url = None
+            current = link.parent
+            for _ in range(3):  # 최대 3단계 부모까지 확인
+                if current:
+                    img = current.find('img')
+                    if img:
+                        image_url = img.get('src') or img.get('data-src') or img.get('data-original')
+                        if image_url:
+                            if image_url.startswith('//'):
+                                image_url = f"https:{image_url}"
+                            elif image_url.startswith('/'):
+                                image_url = f"https://www.ssg.com{image_url}"
+                            break
+                    current = current.parent
+                else:
+                    break
+            
+            # 상품 정보 추가
+            products.append({
+                'name': name.strip(),
+                'price': price,
+                'url': product_url,
+                'image_url': image_url,
+                'brand': '브랜드 정보 없음',
+                'source': 'SSG'
+            })
+            
+        except Exception as e:
+            print(f"상품 파싱 오류: {e}")
+            continue
+    
+    return products
+
+def fetch_search_page(keyword, page=1):
+    """검색 결과 페이지 HTML (bytes)"""
+    search_url = f"{SSG_SEARCH_URL}?target=all&query={quote(keyword)}&page={page}"
+    response = get_client().get(search_url, timeout=15, interactive=True)
+    response.raise_for_status()
+    return response.content
+
+def _search_page_products(keyword, page, limit):
+    """실제 검색 결과 (요청/파싱 실패는 예외로 전달)"""
+    products = parse_search_page(fetch_search_page(keyword, page), keyword, limit)
+    print(f"최종 추출된 상품: {len(products)}개")
+    return products[:limit]
+
+def _or_dummy_products(keyword, limit, load):
+    """load()가 실패하거나 결과가 없으면 테스트용 더미 데이터"""
+    try:
+        products = load()
+    except Exception as e:
+        print(f"검색 오류: {e}")
+        return create_dummy_products(keyword, limit)
+    
+    # 결과가 없으면 더미 데이터 생성
+    if not products:
+        print("실제 검색 결과가 없어 테스트 데이터를 생성합니다.")
+        return create_dummy_products(keyword, limit)
+    return products
 
 def search_ssg_products(keyword, page=1, limit=20):
     """SSG에서 상품 검색 (간단하고 확실한 버전)"""
+    return _or_dummy_products(keyword, limit, lambda: _search_page_products(keyword, page, limit))
+
+def cached_search_ssg_products(keyword, page=1, limit=20):
+    """검색 결과 캐시를 거치는 search_ssg_products
+
+    같은 (검색어, 페이지, 개수)의 동시 요청은 SSG 요청 한 번으로 합쳐진다.
+    실제 결과만 캐시하므로 SSG 장애 중 만든 더미 데이터가 복구 뒤에 남지 않는다.
+    호출자가 결과를 수정해도 캐시가 오염되지 않도록 복사본을 반환한다.
+    """
+    # 캐시 키와 실제 요청이 같은 검색어를 쓰도록 한 번만 정리
+    keyword = keyword.strip()
+    products = _or_dummy_products(keyword, limit, lambda: search_cache.get_or_load(
+        (keyword, page, limit),
+        lambda: _search_page_products(keyword, page, limit)
+    ))
+    return copy.deepcopy(products)
+
+def _search_item_key(product):
+    """검색 결과 중복 판단 키 (SSG 상품은 itemId, 그 외는 정규화한 URL)"""
+    query = dict(parse_qsl(urlsplit(product['url']).query))
+    return query.get('itemId') or normalize_product_url(product['url'])
+
+def _load_search_page(keyword, page):
+    """검색 결과 한 페이지의 상품 전부 (페이지 단위로 캐시, 더미 데이터로 대체하지 않음)"""
+    keyword = keyword.strip()
+    return search_cache.get_or_load(
+        ('page', keyword, page),
+        lambda: parse_search_page(fetch_search_page(keyword, page), keyword)
+    )
+
+def stream_search_ssg_products(keyword, pages=3, limit=None, max_workers=SEARCH_PAGE_WORKERS):
+    """검색 결과 1..pages 페이지를 동시에 받아 파싱이 끝나는 페이지부터 내보내는 제너레이터
+
+    {'type': 'products', 'page', 'products'} 또는 {'type': 'error', 'page', 'error'}를
+    완료 순서대로 yield한다. 여러 페이지에 같은 itemId가 있으면 처음 나온 것만
+    보내고, limit개를 보내면 남은 페이지 요청은 취소한다. 실제 결과가 하나도
+    없으면 마지막에 {'type': 'fallback', 'reason', 'products'}로 테스트용 더미
+    상품을 구분해 보낸다 (limit=0이면 보내지 않음). 호출자가 중간에
+    제너레이터를 닫아도(클라이언트 연결 끊김) 남은 요청을 기다리지 않는다.
+    """
+    if limit == 0:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, pages)), thread_name_prefix='search-page')
+    seen = set()
+    failed_pages = 0
     try:
-        encoded_keyword = quote(keyword)
-        search_url = f"https://www.ssg.com/search.ssg?target=all&query={encoded_keyword}&page={page}"
-        
-        headers = get_headers()
-        response = requests.get(search_url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        products = []
-        
-        # 모든 상품 링크 찾기
-        all_links = soup.find_all('a', href=True)
-        product_links = []
-        
-        for link in all_links:
-            href = link.get('href', '')
-            if 'itemView.ssg' in href and 'itemId=' in href:
-                # 광고 링크 제외
-                if 'advertBidId' not in href and 'ADAD' not in link.get_text():
-                    product_links.append(link)
-        
-        print(f"유효한 상품 링크 {len(product_links)}개 발견")
-        
-        # 상품 정보 추출
-        processed_urls = set()
-        
-        for link in product_links:
-            if len(products) >= limit:
-                break
-                
-            try:
-                href = link.get('href')
-                if href.startswith('/'):
-                    product_url = f"https://www.ssg.com{href}"
-                else:
-                    product_url = href
-                
-                # 중복 제거
-                if product_url in processed_urls:
+        pending = {executor.submit(_load_search_page, keyword, page): page for page in range(1, pages + 1)}
+        while pending and (limit is None or len(seen) < limit):
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                try:
+                    page_products = future.result()
+                except Exception as e:
+                    print(f"검색 오류 ({page}페이지): {e}")
+                    failed_pages += 1
+                    yield {'type': 'error', 'page': page, 'error': str(e)}
                     continue
-                processed_urls.add(product_url)
-                
-                # 상품명 추출 - 링크 텍스트 또는 주변 요소에서
-                name = link.get_text(strip=True)
-                
-                # 링크 텍스트가 없거나 너무 짧으면 부모 요소에서 찾기
-                if not name or len(name) < 10:
-                    parent = link.parent
-                    while parent and not name:
-                        parent_text = parent.get_text(strip=True)
-                        if parent_text and len(parent_text) > 10 and len(parent_text) < 200:
-                            # 불필요한 텍스트 제거
-                            clean_text = re.sub(r'(리뷰|별점|갯수|할인율|정상가격|판매가격).*', '', parent_text)
-                            if len(clean_text) > 10:
-                                name = clean_text[:100]
-                                break
-                        parent = parent.parent
-                        if not parent or parent.name == 'body':
-                            break
                 
-                # 여전히 이름이 없으면 기본값
-                if not name or len(name) < 5:
-                    name = f"{keyword} 관련 상품"
-                
-                # 가격 추출 - 부모 요소에서 찾기
-                price = 0
-                current = link.parent
-                for _ in range(5):  # 최대 5단계 부모까지 확인
-                    if current:
-                        price_text = current.get_text()
-                        price = extract_price_from_text(price_text)
-                        if price > 0:
-                            break
-                        current = current.parent
-                    else:
+                products = []
+                for product in page_products:
+                    if limit is not None and len(seen) >= limit:
                         break
-                
-                # 이미지 찾기
-                image_url = None
-                current = link.parent
-                for _ in range(3):  # 최대 3단계 부모까지 확인
-                    if current:
-                        img = current.find('img')
-                        if img:
-                            image_url = img.get('src') or img.get('data-src') or img.get('data-original')
-                            if image_url:
-                                if image_url.startswith('//'):
-                                    image_url = f"https:{image_url}"
-                                elif image_url.startswith('/'):
-                                    image_url = f"https://www.ssg.com{image_url}"
-                                break
-                        current = current.parent
-                    else:
-                        break
-                
-                # 상품 정보 추가
-                products.append({
-                    'name': name.strip(),
-                    'price': price,
-                    'url': product_url,
-                    'image_url': image_url,
-                    'brand': '브랜드 정보 없음',
-                    'source': 'SSG'
-                })
-                
-            except Exception as e:
-                print(f"상품 파싱 오류: {e}")
-                continue
-        
-        print(f"최종 추출된 상품: {len(products)}개")
-        
-        # 결과가 없으면 더미 데이터 생성
-        if not products:
+                    key = _search_item_key(product)
+                    if key not in seen:
+                        seen.add(key)
+                        products.append(copy.deepcopy(product))
+                if products:
+                    yield {'type': 'products', 'page': page, 'products': products}
+        
+        # 결과가 없으면 /api/search와 같이 더미 데이터를 만들되, 실제 결과와 구분해 보낸다
+        if not seen:
             print("실제 검색 결과가 없어 테스트 데이터를 생성합니다.")
-            products = create_dummy_products(keyword, limit)
-        
-        return products[:limit]
-        
-    except Exception as e:
-        print(f"검색 오류: {e}")
-        return create_dummy_products(keyword, limit)
+            yield {
+                'type': 'fallback',
+                'reason': 'error' if failed_pages == pages else 'no_results',
+                'products': create_dummy_products(keyword, 5 if limit is None else limit)
+            }
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
 def create_dummy_products(keyword, limit=5):
     """테스트용 더미 상품 데이터 생성"""
@@ -161,76 +258,244 @@ def create_dummy_products(keyword, limit=5):
     
     return dummy_products
 
-def crawl_ssg_product(url):
-    """SSG 상품 정보 크롤링 (기존 함수 개선)"""
+# 빠른 파싱 경로에서 쓰는 정규식 (원본 bytes 대상)
+_JSON_LD_RE = re.compile(
+    rb'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+_NAME_RE = re.compile(
+    rb'<(h[12])[^>]*class=["\'][^"\']*\bcdtl_prd_nm\b[^"\']*["\'][^>]*>(.*?)</\1>',
+    re.IGNORECASE | re.DOTALL
+)
+# 가격 영역(.cdtl_old_price / .cdtl_price)의 class 속성. 가격은 그 요소 안의 첫 .blind에서만 읽는다
+_OLD_PRICE_CLASS_RE = re.compile(rb'class=["\'][^"\']*\bcdtl_old_price\b[^"\']*["\']')
+_PRICE_CLASS_RE = re.compile(rb'class=["\'][^"\']*\bcdtl_price\b[^"\']*["\']')
+_OPEN_TAG_RE = re.compile(rb'<([a-zA-Z][\w-]*)[^>]*>')
+_ANY_TAG_RE = re.compile(rb'<(/?)([a-zA-Z][\w-]*)[^>]*?(/?)>')
+_BLIND_RE = re.compile(rb'class=["\'][^"\']*\bblind\b[^"\']*["\'][^>]*>([^<]*)')
+# 가격 영역이 이 길이 안에서 닫히지 않으면 구조가 예상과 다른 것으로 보고 빠른 경로를 포기
+PRICE_CONTAINER_MAX_BYTES = 8192
+_IMAGE_RE = re.compile(
+    rb'class=["\'][^"\']*\bcdtl_img_wrap\b[^"\']*["\'].{0,1000}?(<img\b[^>]*>)',
+    re.DOTALL
+)
+_IMG_ATTR_RE = re.compile(rb'(?<![\w-])(src|data-src)=["\']([^"\']+)["\']')
+_TAG_RE = re.compile(r'<[^>]+>')
+_PRICE_NUMBER_RE = re.compile(r'\d[\d,]*')
+
+FAST_PARSE = os.environ.get('CRAWL_FAST_PARSE', '1') != '0'
+
+def _parse_price_text(price_text):
+    """'49,900원' 같은 문자열에서 첫 번째 숫자를 정수로 변환"""
+    match = _PRICE_NUMBER_RE.search(price_text)
+    if not match:
+        return 0
+    return int(match.group().replace(',', ''))
+
+def _normalize_image_url(image_url):
+    if image_url and image_url.startswith('//'):
+        return f"https:{image_url}"
+    return image_url
+
+def _element_body(content, attr_start):
+    """attr_start 위치의 속성을 가진 요소의 내용 (같은 이름 태그의 중첩을 세어 짝이 맞는 닫는 태그까지)
+
+    여는 태그를 알아볼 수 없거나 PRICE_CONTAINER_MAX_BYTES 안에서 닫히지 않으면 None
+    """
+    tag_start = content.rfind(b'<', 0, attr_start)
+    open_match = _OPEN_TAG_RE.match(content, tag_start) if tag_start >= 0 else None
+    if not open_match or open_match.end() <= attr_start:
+        return None
+    tag = open_match.group(1).lower()
+    start = open_match.end()
+    depth = 1
+    for match in _ANY_TAG_RE.finditer(content, start, start + PRICE_CONTAINER_MAX_BYTES):
+        if match.group(2).lower() != tag or match.group(3):
+            continue
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return content[start:match.start()]
+    return None
+
+def _find_container_price(content, class_re):
+    """class_re 요소 안의 첫 .blind 텍스트에서 가격 (soup 경로의 '.cdtl_price .blind'와 같은 범위)
+
+    닫는 태그를 찾지 못한 요소는 건너뛰고 다음 요소를 본다. 읽을 수 있는 요소가
+    없거나 .blind에 숫자가 없으면 0
+    """
+    for class_match in class_re.finditer(content):
+        body = _element_body(content, class_match.start())
+        if body is None:
+            continue
+        match = _BLIND_RE.search(body)
+        if match:
+            return _parse_price_text(html.unescape(match.group(1).decode('utf-8', errors='replace')))
+    return 0
+
+def _find_json_ld_product(content):
+    """JSON-LD 블록에서 @type이 Product인 객체 찾기"""
+    for match in _JSON_LD_RE.finditer(content):
+        try:
+            data = json.loads(match.group(1).decode('utf-8', errors='replace'))
+        except ValueError:
+            continue
+        candidates = data if isinstance(data, list) else data.get('@graph', [data])
+        for item in candidates:
+            if isinstance(item, dict) and item.get('@type') == 'Product':
+                return item
+    return None
+
+def _parse_product_fast(content):
+    """BeautifulSoup 트리 없이 원본 bytes에서 상품명/가격/이미지 추출
+
+    cdtl_* 마커를 먼저 보고, 없으면 JSON-LD로 보완한다.
+    상품명이나 가격을 찾지 못하면 None을 반환한다.
+    """
+    name = None
+    match = _NAME_RE.search(content)
+    if match:
+        name = _TAG_RE.sub('', match.group(2).decode('utf-8', errors='replace'))
+        name = html.unescape(name).strip()
+
+    price = _find_container_price(content, _OLD_PRICE_CLASS_RE) or _find_container_price(content, _PRICE_CLASS_RE)
+
+    image_url = None
+    match = _IMAGE_RE.search(content)
+    if match:
+        attrs = dict(_IMG_ATTR_RE.findall(match.group(1)))
+        image_url = attrs.get(b'src') or attrs.get(b'data-src')
+        image_url = html.unescape(image_url.decode('utf-8', errors='replace')) if image_url else None
+
+    if not name or not price:
+        product = _find_json_ld_product(content)
+        if product:
+            offers = product.get('offers') or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            name = name or product.get('name')
+            price = price or _parse_price_text(str(offers.get('price', '')))
+            image = product.get('image')
+            image_url = image_url or (image[0] if isinstance(image, list) and image else image)
+
+    if not name or not price:
+        return None
+
+    return {
+        'name': name,
+        'price': price,
+        'image_url': _normalize_image_url(image_url)
+    }
+
+def _parse_product_soup(content):
+    """BeautifulSoup으로 상품 페이지 전체를 파싱 (느리지만 가장 관대한 경로)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # 상품명 추출 (개선된 패턴)
+    name_selectors = [
+        'h2.cdtl_prd_nm',
+        'h1.cdtl_prd_nm',
+        '.prod_tit',
+        '.item_tit',
+        'title'
+    ]
+    
+    name = None
+    for selector in name_selectors:
+        name_element = soup.select_one(selector)
+        if name_element:
+            name = name_element.get_text(strip=True)
+            if name and name != "SSG.COM":
+                break
+    
+    if not name:
+        name = "상품명 없음"
+    
+    # 가격 추출 (개선된 패턴)
+    price_selectors = [
+        '.cdtl_old_price .blind',
+        '.cdtl_price .blind',
+        '.price_original',
+        '.price_discount',
+        '.ssg_price',
+        '.price'
+    ]
+    
+    price = 0
+    for selector in price_selectors:
+        price_element = soup.select_one(selector)
+        if price_element:
+            price = _parse_price_text(price_element.get_text(strip=True))
+            if price:
+                break
+    
+    # 이미지 URL 추출
+    image_url = None
+    img_selectors = [
+        '.cdtl_img_wrap img',
+        '.prod_img img',
+        '.item_img img'
+    ]
+    
+    for selector in img_selectors:
+        img_element = soup.select_one(selector)
+        if img_element:
+            image_url = img_element.get('src') or img_element.get('data-src')
+            break
+    
+    return {
+        'name': name,
+        'price': price,
+        'image_url': _normalize_image_url(image_url)
+    }
+
+def parse_product_page(content, fast=None):
+    """상품 페이지 bytes에서 name/price/image_url 추출
+
+    빠른 경로가 실패하면 BeautifulSoup 경로로 넘어간다.
+    """
+    if FAST_PARSE if fast is None else fast:
+        product = _parse_product_fast(content)
+        if product:
+            return product
+    return _parse_product_soup(content)
+
+def crawl_ssg_product(url, etag=None, last_modified=None, interactive=False):
+    """SSG 상품 정보 크롤링 (기존 함수 개선)
+
+    etag/last_modified를 넘기면 조건부 GET을 보내고, 304 응답이면 파싱 없이
+    {'url', 'not_modified': True, ...}를 반환한다. 사용자가 기다리는
+    요청이면 interactive=True (호스트 속도 제한에서 갱신 패스보다 먼저 보낸다).
+    """
     try:
-        headers = get_headers()
-        response = requests.get(url, headers=headers, timeout=10)
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        response = get_client().get(url, timeout=10, headers=headers, interactive=interactive)
+        if response.status_code == 304:
+            return {
+                'url': url,
+                'not_modified': True,
+                'etag': etag,
+                'last_modified': last_modified
+            }
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 상품명 추출 (개선된 패턴)
-        name_selectors = [
-            'h2.cdtl_prd_nm',
-            'h1.cdtl_prd_nm',
-            '.prod_tit',
-            '.item_tit',
-            'title'
-        ]
-        
-        name = None
-        for selector in name_selectors:
-            name_element = soup.select_one(selector)
-            if name_element:
-                name = name_element.get_text(strip=True)
-                if name and name != "SSG.COM":
-                    break
-        
-        if not name:
-            name = "상품명 없음"
-        
-        # 가격 추출 (개선된 패턴)
-        price_selectors = [
-            '.cdtl_old_price .blind',
-            '.cdtl_price .blind',
-            '.price_original',
-            '.price_discount',
-            '.ssg_price',
-            '.price'
-        ]
-        
-        price = 0
-        for selector in price_selectors:
-            price_element = soup.select_one(selector)
-            if price_element:
-                price_text = price_element.get_text(strip=True)
-                price_match = re.search(r'(\d{1,3}(?:,\d{3})*)', price_text.replace(',', ''))
-                if price_match:
-                    price = int(price_match.group(1).replace(',', ''))
-                    break
-        
-        # 이미지 URL 추출
-        image_url = None
-        img_selectors = [
-            '.cdtl_img_wrap img',
-            '.prod_img img',
-            '.item_img img'
-        ]
-        
-        for selector in img_selectors:
-            img_element = soup.select_one(selector)
-            if img_element:
-                image_url = img_element.get('src') or img_element.get('data-src')
-                if image_url and image_url.startswith('//'):
-                    image_url = f"https:{image_url}"
-                break
+        parse_started = time.perf_counter()
+        product = parse_product_page(response.content)
         
         return {
-            'name': name,
-            'price': price,
+            'name': product['name'],
+            'price': product['price'],
             'url': url,
-            'image_url': image_url
+            'image_url': product['image_url'],
+            'not_modified': False,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_bytes': len(response.content),
+            'parse_ms': (time.perf_counter() - parse_started) * 1000
         }
         
     except Exception as e:
@@ -240,7 +505,7 @@ def crawl_ssg_product(url):
 def compare_products(keyword, limit=10):
     """상품 검색 및 가격 비교"""
     try:
-        products = search_ssg_products(keyword, limit=limit)
+        products = cached_search_ssg_products(keyword, limit=limit)
         
         if not products:
             return []
@@ -267,36 +532,57 @@ def compare_products(keyword, limit=10):
         print(f"상품 비교 오류: {e}")
         return []
 
+# 가격 추출 정규식 (모듈 로드 시 한 번만 컴파일)
+_LABELED_PRICE_RE = re.compile(r'(판매가격|정상가격|가격)\s*(\d{1,3}(?:,\d{3})*)')
+_WON_PRICE_RE = re.compile(r'(\d{1,3}(?:,\d{3})*)\s*원')
+_NUMBER_RE = re.compile(r'\d{1,3}(?:,\d{3})*')
+MIN_VALID_PRICE = 1000
+MAX_VALID_PRICE = 10000000  # 합리적인 가격 범위
+
+def _lowest_valid_price(numbers):
+    """숫자 문자열 중 유효 범위의 최저가 (없으면 0)"""
+    # 쉼표 없는 숫자는 최대 999라 유효 범위에 들 수 없다
+    prices = [int(number.replace(',', '')) for number in numbers if ',' in number]
+    valid_prices = [p for p in prices if MIN_VALID_PRICE <= p <= MAX_VALID_PRICE]
+    return min(valid_prices) if valid_prices else 0
+
 def extract_price_from_text(text):
-    """텍스트에서 가격 추출"""
+    """텍스트에서 가격 추출
+
+    우선순위: 판매가격 > 정상가격 > 'N원' > 가격 > 아무 숫자.
+    라벨 세 가지는 한 번의 스캔으로 모으고, 뒤 순위 패턴은 앞 순위에서
+    가격을 찾지 못했을 때만 훑는다. 가장 우선순위가 높은 패턴의 최저가를 반환한다.
+    """
     if not text:
         return 0
     
-    # 여러 가격 패턴 시도
-    patterns = [
-        r'판매가격\s*(\d{1,3}(?:,\d{3})*)',
-        r'정상가격\s*(\d{1,3}(?:,\d{3})*)',
-        r'(\d{1,3}(?:,\d{3})*)\s*원',
-        r'가격\s*(\d{1,3}(?:,\d{3})*)',
-        r'(\d{1,3}(?:,\d{3})*)'
-    ]
+    labeled = {'판매가격': [], '정상가격': [], '가격': []}
+    all_labeled = []
+    for label, number in _LABELED_PRICE_RE.findall(text):
+        labeled[label].append(number)
+        all_labeled.append(number)
     
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            # 가장 큰 숫자를 가격으로 간주 (할인가보다 정가가 클 수 있음)
-            prices = [int(match.replace(',', '')) for match in matches]
-            valid_prices = [p for p in prices if 1000 <= p <= 10000000]  # 합리적인 가격 범위
-            if valid_prices:
-                return min(valid_prices)  # 최저가 반환
+    for numbers in (labeled['판매가격'], labeled['정상가격']):
+        price = _lowest_valid_price(numbers)
+        if price:
+            return price
     
-    return 0
+    if '원' in text:
+        price = _lowest_valid_price(_WON_PRICE_RE.findall(text))
+        if price:
+            return price
+    
+    # '판매가격', '정상가격'도 '가격'으로 끝나므로 모든 라벨이 해당된다
+    price = _lowest_valid_price(all_labeled)
+    if price:
+        return price
+    
+    return _lowest_valid_price(_NUMBER_RE.findall(text))
 
 def get_product_price_from_page(url):
     """개별 상품 페이지에서 가격 정보 가져오기"""
     try:
-        headers = get_headers()
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -1,23 +1,304 @@
 import sqlite3
 import os
+import sys
+import contextlib
+import textwrap
+import threading
+import time
+import weakref
 
-DATABASE_PATH = '../database/ssg_tracker.db'
+from product_urls import normalize_product_url
 
-def get_db_connection():
-    """데이터베이스 연결"""
-    conn = sqlite3.connect(DATABASE_PATH)
+# 기본값은 실행 디렉토리와 무관하게 저장소의 database/ssg_tracker.db
+# (API 서버와 crawl_worker.py를 다른 디렉토리에서 띄워도 같은 DB를 연다)
+DATABASE_PATH = os.environ.get(
+    'DATABASE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'database', 'ssg_tracker.db')
+)
+
+# 연결 설정 (WAL: 쓰기 트랜잭션 중에도 읽기가 막히지 않음)
+DB_JOURNAL_MODE = os.environ.get('DB_JOURNAL_MODE', 'WAL')
+DB_SYNCHRONOUS = os.environ.get('DB_SYNCHRONOUS', 'NORMAL')
+DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+DB_CACHE_SIZE_KB = int(os.environ.get('DB_CACHE_SIZE_KB', 20000))
+DB_MMAP_SIZE = int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024))
+
+class ManagedConnection(sqlite3.Connection):
+    """스레드마다 하나씩 두고 재사용하는 연결
+
+    close()는 실제로 연결을 닫지 않는다. 같은 스레드에서 중첩해서 얻은
+    연결이 모두 close()되면, 커밋하지 않은 작업을 기존 close()처럼 버린다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+
+    def close(self):
+        self.checkouts = max(0, self.checkouts - 1)
+        if self.checkouts == 0 and self.in_transaction:
+            self.rollback()
+
+    def close_for_real(self):
+        super().close()
+
+_local = threading.local()
+_connections = weakref.WeakSet()
+_connections_lock = threading.Lock()
+_generation = 0
+
+def _connect(path):
+    # 연결은 만든 스레드에서만 쓰지만, 종료 시 close_all_connections()가
+    # 다른 스레드에서 닫을 수 있도록 check_same_thread를 끈다
+    conn = sqlite3.connect(
+        path,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        factory=ManagedConnection,
+        check_same_thread=False
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute(f'PRAGMA journal_mode = {DB_JOURNAL_MODE}')
+    conn.execute(f'PRAGMA synchronous = {DB_SYNCHRONOUS}')
+    conn.execute(f'PRAGMA busy_timeout = {DB_BUSY_TIMEOUT_MS}')
+    conn.execute(f'PRAGMA cache_size = -{DB_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {DB_MMAP_SIZE}')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    with _connections_lock:
+        _connections.add(conn)
     return conn
 
-def init_db():
-    """데이터베이스 초기화"""
-    # 데이터베이스 디렉토리 생성
-    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+def get_db_connection():
+    """데이터베이스 연결 (현재 스레드의 연결을 재사용)"""
+    conn = getattr(_local, 'connection', None)
+    if conn is None or _local.path != DATABASE_PATH or _local.generation != _generation:
+        conn = _connect(DATABASE_PATH)
+        _local.connection = conn
+        _local.path = DATABASE_PATH
+        _local.generation = _generation
+    conn.checkouts += 1
+    return conn
+
+def release_thread_connection():
+    """요청 처리가 끝난 스레드의 연결 정리
+
+    close()가 빠진 코드 경로 때문에 남은 트랜잭션이 다음 요청에서
+    커밋되지 않도록 되돌리고 사용 횟수를 초기화한다.
+    """
+    conn = getattr(_local, 'connection', None)
+    if conn is None or _local.generation != _generation:
+        return
+    conn.checkouts = 0
+    if conn.in_transaction:
+        conn.rollback()
+
+def close_all_connections():
+    """모든 스레드의 연결을 닫는다 (마지막 연결이 닫힐 때 WAL 체크포인트)
+
+    각 스레드는 다음 get_db_connection() 호출 때 새 연결을 연다.
+    """
+    global _generation
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for conn in connections:
+        conn.close_for_real()
+
+def _add_column_if_missing(conn, table, column, definition):
+    columns = {row['name'] for row in conn.execute(f'PRAGMA table_info({table})')}
+    if column not in columns:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+def _add_product_detail_columns(conn):
+    """예전 DB의 products에 image_url/brand/source 컬럼 추가"""
+    _add_column_if_missing(conn, 'products', 'image_url', 'TEXT')
+    _add_column_if_missing(conn, 'products', 'brand', 'TEXT')
+    _add_column_if_missing(conn, 'products', 'source', "TEXT DEFAULT 'SSG'")
+
+def _add_refresh_schedule_columns(conn):
+    """상품별 갱신 주기(초)와 마지막 확인 시각"""
+    _add_column_if_missing(conn, 'products', 'refresh_interval', 'INTEGER')
+    _add_column_if_missing(conn, 'products', 'last_checked_at', 'TIMESTAMP')
+
+def _add_next_check_column(conn):
+    """다음 가격 확인 예정 시각 (기본값은 과거 → 바로 확인 대상)"""
+    _add_column_if_missing(conn, 'products', 'next_check_at', "TIMESTAMP DEFAULT '1970-01-01 00:00:00'")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_next_check ON products(next_check_at)')
+
+def _add_lease_owner_column(conn):
+    """가격 확인 작업을 선점한 워커 (리스 만료 시각은 next_check_at)"""
+    _add_column_if_missing(conn, 'products', 'lease_owner', 'TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_products_lease_owner ON products(lease_owner) WHERE lease_owner IS NOT NULL')
+
+def _backfill_price_summary(conn, product_ids=None):
+    """원본 행과 압축 블록에서 상품별 가격 요약을 다시 채운다 (product_ids가 있으면 그 상품만)"""
+    log_filter = ''
+    block_filter = ''
+    params = []
+    if product_ids is not None:
+        placeholders = ', '.join('?' * len(product_ids))
+        log_filter = f' AND l.product_id IN ({placeholders})'
+        block_filter = f' WHERE product_id IN ({placeholders})'
+        params = list(product_ids)
+        conn.execute(f'DELETE FROM product_price_summary WHERE product_id IN ({placeholders})', params)
     
-    conn = get_db_connection()
+    conn.execute(f'''
+        INSERT OR REPLACE INTO product_price_summary
+            (product_id, current_price, min_price, max_price, price_sum, points, last_logged_at, low_ratio, avg_ratio)
+        SELECT l.product_id,
+               (SELECT price FROM price_logs latest WHERE latest.product_id = l.product_id AND latest.price > 0
+                ORDER BY latest.logged_at DESC, latest.id DESC LIMIT 1),
+               MIN(l.price), MAX(l.price), SUM(l.price), COUNT(*), MAX(l.logged_at), 1.0, 1.0
+        FROM price_logs l
+        WHERE l.product_id IS NOT NULL AND l.price > 0{log_filter}
+        GROUP BY l.product_id
+    ''', params)
+    
+    blocks = conn.execute(
+        f'SELECT product_id, first_price, prices FROM price_log_blocks{block_filter} ORDER BY product_id, first_at',
+        params
+    ).fetchall()
+    if blocks:
+        from price_history import decode_deltas
+        summaries = {}
+        for block in blocks:
+            prices = decode_deltas(block['first_price'], block['prices'])
+            summary = summaries.setdefault(block['product_id'], [None, None, None, 0, 0])
+            summary[0] = int(prices[-1])
+            summary[1] = int(prices.min()) if summary[1] is None else min(summary[1], int(prices.min()))
+            summary[2] = int(prices.max()) if summary[2] is None else max(summary[2], int(prices.max()))
+            summary[3] += int(prices.sum())
+            summary[4] += len(prices)
+        # 압축 블록은 원본 행보다 오래된 점이므로 현재가는 원본 행이 있으면 그쪽
+        conn.executemany(
+            '''INSERT INTO product_price_summary
+                   (product_id, current_price, min_price, max_price, price_sum, points, low_ratio, avg_ratio)
+               VALUES (?, ?, ?, ?, ?, ?, 1.0, 1.0)
+               ON CONFLICT(product_id) DO UPDATE SET
+                   min_price = MIN(min_price, excluded.min_price),
+                   max_price = MAX(max_price, excluded.max_price),
+                   price_sum = price_sum + excluded.price_sum,
+                   points = points + excluded.points''',
+            [(product_id, *summary) for product_id, summary in summaries.items()]
+        )
+    
+    conn.execute(f'''
+        UPDATE product_price_summary
+        SET low_ratio = current_price * 1.0 / min_price,
+            avg_ratio = current_price * points * 1.0 / price_sum
+        {block_filter}
+    ''', params)
+
+def _create_price_summary(conn):
+    """상품별 가격 요약 (역대 최저/최고/평균과 현재가 대비 비율)
+
+    price_logs INSERT 트리거가 한 행씩 갱신하고, 압축으로 price_logs 행이
+    지워져도 값은 그대로 남는다. 기존 이력은 원본 행과 압축 블록에서 채운다.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS product_price_summary (
+            product_id INTEGER PRIMARY KEY,
+            current_price INTEGER NOT NULL,
+            min_price INTEGER NOT NULL,
+            max_price INTEGER NOT NULL,
+            price_sum INTEGER NOT NULL,
+            points INTEGER NOT NULL,
+            last_logged_at TIMESTAMP,
+            low_ratio REAL NOT NULL,
+            avg_ratio REAL NOT NULL,
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        )
+    ''')
+    _backfill_price_summary(conn)
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_price_logs_summary AFTER INSERT ON price_logs
+        WHEN NEW.product_id IS NOT NULL AND NEW.price > 0 BEGIN
+            INSERT INTO product_price_summary
+                (product_id, current_price, min_price, max_price, price_sum, points, last_logged_at, low_ratio, avg_ratio)
+            VALUES (NEW.product_id, NEW.price, NEW.price, NEW.price, NEW.price, 1, NEW.logged_at, 1.0, 1.0)
+            ON CONFLICT(product_id) DO UPDATE SET
+                current_price = excluded.current_price,
+                min_price = MIN(min_price, excluded.min_price),
+                max_price = MAX(max_price, excluded.max_price),
+                price_sum = price_sum + excluded.price_sum,
+                points = points + 1,
+                last_logged_at = excluded.last_logged_at,
+                low_ratio = excluded.current_price * 1.0 / MIN(min_price, excluded.min_price),
+                avg_ratio = excluded.current_price * (points + 1.0) / (price_sum + excluded.price_sum);
+        END
+    ''')
+    # 최저가에 가까운 순 (같으면 평균보다 많이 싼 순) / 평균 대비 싼 순
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_price_summary_low ON product_price_summary(low_ratio, avg_ratio)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_price_summary_avg ON product_price_summary(avg_ratio)')
+    conn.execute('ANALYZE product_price_summary')
+
+def _merge_duplicate_products(conn):
+    """URL을 normalize_product_url로 정규화해 같은 상품을 가장 먼저 등록된 행으로 합친다
+
+    가격 이력/알림/압축 블록은 남는 행으로 옮기고, 남는 행의 현재가는 합친
+    이력의 마지막 가격으로, URL은 정규화한 값으로 바꾼다. 스키마 버전에 따라
+    아직 없는 테이블은 건너뛴다. 합친 상품 수를 반환한다.
+    """
+    tables = {row['name'] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    keep_ids = {}
+    merges = []
+    renames = []
+    for row in conn.execute('SELECT id, url FROM products ORDER BY id').fetchall():
+        url = normalize_product_url(row['url'])
+        if url not in keep_ids:
+            keep_ids[url] = row['id']
+            if url != row['url']:
+                renames.append((url, row['id']))
+        else:
+            merges.append((keep_ids[url], row['id']))
     
-    # 테이블 생성
-    conn.executescript('''
+    if merges:
+        removed = [(product_id,) for _, product_id in merges]
+        merged_into = sorted({keep_id for keep_id, _ in merges})
+        conn.executemany('UPDATE price_logs SET product_id = ? WHERE product_id = ?', merges)
+        conn.executemany('UPDATE alerts SET product_id = ? WHERE product_id = ?', merges)
+        if 'recent_price_changes' in tables:
+            conn.executemany('UPDATE recent_price_changes SET product_id = ? WHERE product_id = ?', merges)
+        if 'product_http_cache' in tables:
+            conn.executemany('DELETE FROM product_http_cache WHERE product_id = ?', removed)
+        if 'price_log_blocks' in tables:
+            conn.executemany('UPDATE price_log_blocks SET product_id = ? WHERE product_id = ?', merges)
+            from price_history import rewrite_product_blocks
+            for product_id in merged_into:
+                rewrite_product_blocks(conn, product_id)
+        if 'product_price_summary' in tables:
+            conn.executemany('DELETE FROM product_price_summary WHERE product_id = ?', removed)
+            _backfill_price_summary(conn, merged_into)
+        conn.executemany('DELETE FROM products WHERE id = ?', removed)
+        
+        # 남는 행의 현재가가 합친 이력보다 오래됐을 수 있다 (원본 행이 없으면 압축 블록 기준 요약)
+        summary_price = ('(SELECT current_price FROM product_price_summary WHERE product_id = products.id)'
+                         if 'product_price_summary' in tables else 'NULL')
+        conn.execute(f'''
+            UPDATE products SET current_price = COALESCE(
+                (SELECT price FROM price_logs
+                 WHERE product_id = products.id AND price > 0
+                 ORDER BY logged_at DESC, id DESC LIMIT 1),
+                {summary_price},
+                current_price)
+            WHERE id IN ({', '.join('?' * len(merged_into))})
+        ''', merged_into)
+        print(f"중복 URL 상품 {len(merges)}개를 병합했습니다.")
+    
+    # 중복을 지운 뒤라 정규화한 URL끼리 겹치지 않는다
+    conn.executemany('UPDATE products SET url = ? WHERE id = ?', renames)
+    return len(merges)
+
+def _ensure_unique_product_urls(conn):
+    """URL을 정규화해 중복 상품을 합치고 UNIQUE 인덱스 생성"""
+    _merge_duplicate_products(conn)
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_products_url ON products(url)')
+
+# 스키마 마이그레이션: (버전, 설명, SQL 또는 함수)
+# 적용된 마지막 버전은 PRAGMA user_version에 기록되고, 각 단계는
+# 하나의 트랜잭션으로 한 번만 실행된다. 새 변경은 항상 맨 뒤에 추가할 것.
+MIGRATIONS = [
+    (1, '기본 테이블', '''
         CREATE TABLE IF NOT EXISTS products (
             id INTEGER PRIMARY KEY,
             name TEXT NOT NULL,
@@ -45,27 +326,204 @@ def init_db():
             is_active BOOLEAN DEFAULT TRUE,
             FOREIGN KEY (product_id) REFERENCES products(id)
         );
-    ''')
-    
-    # 기존 테이블에 새 컬럼 추가 (이미 존재하는 경우 무시)
-    try:
-        conn.execute('ALTER TABLE products ADD COLUMN image_url TEXT')
-    except:
-        pass
+    '''),
+    (2, 'products 부가 컬럼 (image_url, brand, source)', _add_product_detail_columns),
+    (3, '조건부 GET 검증자 테이블', '''
+        CREATE TABLE IF NOT EXISTS product_http_cache (
+            product_id INTEGER PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_bytes INTEGER,
+            parse_ms REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        );
+    '''),
+    (4, '중복 URL 병합 및 UNIQUE 인덱스', _ensure_unique_product_urls),
+    (5, '가격 이력/알림 조회 인덱스', '''
+        DROP INDEX IF EXISTS idx_price_logs_product_id;
+        CREATE INDEX IF NOT EXISTS idx_price_logs_product_logged ON price_logs(product_id, logged_at);
+        CREATE INDEX IF NOT EXISTS idx_price_logs_logged_at ON price_logs(logged_at);
+        CREATE INDEX IF NOT EXISTS idx_alerts_product_id ON alerts(product_id);
+        CREATE INDEX IF NOT EXISTS idx_alerts_is_active ON alerts(is_active);
+        ANALYZE;
+    '''),
+    (6, '상품 목록 키셋 페이지네이션/필터 인덱스', '''
+        CREATE INDEX IF NOT EXISTS idx_products_created ON products(created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_products_source_created ON products(source, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_products_brand_created ON products(brand, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_products_price ON products(current_price);
+    '''),
+    (7, '대시보드 집계 카운터와 최근 변동 링 버퍼', '''
+        CREATE TABLE IF NOT EXISTS dashboard_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        INSERT OR REPLACE INTO dashboard_counters (name, value) VALUES
+            ('total_products', (SELECT COUNT(*) FROM products)),
+            ('active_alerts', (SELECT COUNT(*) FROM alerts WHERE is_active = 1));
+        
+        CREATE TRIGGER IF NOT EXISTS trg_products_count_insert AFTER INSERT ON products BEGIN
+            UPDATE dashboard_counters SET value = value + 1 WHERE name = 'total_products';
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_products_count_delete AFTER DELETE ON products BEGIN
+            UPDATE dashboard_counters SET value = value - 1 WHERE name = 'total_products';
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_alerts_count_insert AFTER INSERT ON alerts WHEN NEW.is_active = 1 BEGIN
+            UPDATE dashboard_counters SET value = value + 1 WHERE name = 'active_alerts';
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_alerts_count_delete AFTER DELETE ON alerts WHEN OLD.is_active = 1 BEGIN
+            UPDATE dashboard_counters SET value = value - 1 WHERE name = 'active_alerts';
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_alerts_count_update AFTER UPDATE OF is_active ON alerts
+        WHEN (NEW.is_active = 1) != (OLD.is_active = 1) BEGIN
+            UPDATE dashboard_counters SET value = value + (CASE WHEN NEW.is_active = 1 THEN 1 ELSE -1 END)
+            WHERE name = 'active_alerts';
+        END;
+        
+        -- 최근 가격 변동 50건: price_logs.id % 50 슬롯을 덮어쓰는 링 버퍼
+        CREATE TABLE IF NOT EXISTS recent_price_changes (
+            slot INTEGER PRIMARY KEY,
+            log_id INTEGER NOT NULL,
+            product_id INTEGER,
+            price INTEGER,
+            logged_at TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_recent_price_changes_log ON recent_price_changes(log_id);
+        INSERT OR REPLACE INTO recent_price_changes (slot, log_id, product_id, price, logged_at)
+            SELECT id % 50, id, product_id, price, logged_at
+            FROM (SELECT * FROM price_logs ORDER BY id DESC LIMIT 50)
+            ORDER BY id;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_price_logs_recent AFTER INSERT ON price_logs BEGIN
+            INSERT OR REPLACE INTO recent_price_changes (slot, log_id, product_id, price, logged_at)
+            VALUES (NEW.id % 50, NEW.id, NEW.product_id, NEW.price, NEW.logged_at);
+        END;
+    '''),
+    (8, '상품별 활성 알림 목표 가격 인덱스', '''
+        CREATE INDEX IF NOT EXISTS idx_alerts_active_product_target
+            ON alerts(product_id, target_price) WHERE is_active = 1;
+        ANALYZE alerts;
+    '''),
+    (9, '상품별 갱신 주기와 마지막 확인 시각', _add_refresh_schedule_columns),
+    (10, '적응형 갱신: 다음 확인 시각 인덱스', _add_next_check_column),
+    (11, '가격 확인 작업 큐 리스', _add_lease_owner_column),
+    (12, '오래된 가격 이력 압축 블록', '''
+        CREATE TABLE IF NOT EXISTS price_log_blocks (
+            id INTEGER PRIMARY KEY,
+            product_id INTEGER NOT NULL,
+            first_at INTEGER NOT NULL,
+            last_at INTEGER NOT NULL,
+            first_price INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            timestamps BLOB NOT NULL,
+            prices BLOB NOT NULL,
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_price_log_blocks_product ON price_log_blocks(product_id, first_at);
+    '''),
+    (13, '상품별 가격 요약 (최저가 대비 순위)', _create_price_summary),
+    # 4번이 같은 문자열의 URL만 합치던 때 마이그레이션된 DB에는 ckwhere 등만 다른
+    # 중복이 남아 있다. 새 DB에서는 4번이 이미 정규화했으므로 아무것도 하지 않는다.
+    (14, '저장된 상품 URL 정규화 및 중복 병합', _merge_duplicate_products),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def migrate(conn, target_version=None):
+    """user_version 이후의 마이그레이션을 순서대로 적용. 적용 후 버전 반환."""
+    current = conn.execute('PRAGMA user_version').fetchone()[0]
     
-    try:
-        conn.execute('ALTER TABLE products ADD COLUMN brand TEXT')
-    except:
-        pass
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        if target_version is not None and version > target_version:
+            break
+        
+        started = time.perf_counter()
+        try:
+            if callable(migration):
+                conn.execute('BEGIN IMMEDIATE')
+                migration(conn)
+                conn.execute(f'PRAGMA user_version = {version}')
+                conn.commit()
+            else:
+                conn.executescript(
+                    f'BEGIN IMMEDIATE; {migration}; PRAGMA user_version = {version}; COMMIT;'
+                )
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        
+        current = version
+        print(f"스키마 마이그레이션 {version} 적용: {description} ({time.perf_counter() - started:.2f}초)")
     
-    try:
-        conn.execute('ALTER TABLE products ADD COLUMN source TEXT DEFAULT "SSG"')
-    except:
-        pass
+    return current
+
+def init_db():
+    """데이터베이스 초기화 (스키마를 최신 버전으로 마이그레이션)"""
+    # 데이터베이스 디렉토리 생성
+    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
     
-    conn.commit()
+    conn = get_db_connection()
+    migrate(conn)
     conn.close()
     print("데이터베이스가 초기화되었습니다.")
 
+# database/init.sql 끝에 붙는 샘플 데이터 (테스트용)
+SAMPLE_DATA_SQL = """-- 샘플 데이터 (테스트용)
+INSERT INTO products (name, url, current_price) VALUES
+('테스트 상품 1', 'https://www.ssg.com/item/itemView.ssg?itemId=1000000000001', 50000),
+('테스트 상품 2', 'https://www.ssg.com/item/itemView.ssg?itemId=1000000000002', 75000);
+
+-- 샘플 가격 이력
+INSERT INTO price_logs (product_id, price) VALUES
+(1, 55000),
+(1, 52000),
+(1, 50000),
+(2, 80000),
+(2, 77000),
+(2, 75000);
+"""
+
+def schema_sql():
+    """MIGRATIONS를 빈 메모리 DB에 적용한 결과를 database/init.sql 형태로 출력
+
+    init.sql은 이 함수로만 만든다 (python database.py --dump-schema).
+    스키마 객체는 생성 순서대로, dashboard_counters의 초기 행과
+    PRAGMA user_version을 함께 적어 백엔드가 다시 마이그레이션하지 않게 한다.
+    """
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    # 마이그레이션 진행 메시지가 출력된 SQL에 섞이지 않게 한다
+    with contextlib.redirect_stdout(sys.stderr):
+        version = migrate(conn)
+    
+    lines = [
+        '-- SSG 가격 추적 시스템 데이터베이스 초기화',
+        '-- backend/database.py의 MIGRATIONS에서 생성한 파일이므로 직접 고치지 말 것.',
+        '-- 스키마를 바꾼 뒤: cd backend && python database.py --dump-schema > ../database/init.sql',
+        '',
+    ]
+    objects = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+    ).fetchall()
+    for row in objects:
+        # 마이그레이션 문자열의 들여쓰기를 걷어 낸다
+        first, _, rest = row['sql'].partition('\n')
+        lines.append(f"{first}\n{textwrap.dedent(rest)};" if rest else f"{first};")
+        lines.append('')
+    for row in conn.execute('SELECT name, value FROM dashboard_counters ORDER BY name'):
+        lines.append(f"INSERT INTO dashboard_counters (name, value) VALUES ('{row['name']}', {row['value']});")
+    lines.append('')
+    lines.append(f'PRAGMA user_version = {version};')
+    lines.extend(['', ''])
+    conn.close()
+    return '\n'.join(lines) + SAMPLE_DATA_SQL
+
 if __name__ == '__main__':
-    init_db()
\ No newline at end of file
+    if '--dump-schema' in sys.argv[1:]:
+        sys.stdout.write(schema_sql())
+    else:
+        init_db()
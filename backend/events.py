@@ -0,0 +1,125 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 실시간 이벤트(SSE) 설정
+EVENT_QUEUE_SIZE = int(os.environ.get('EVENT_QUEUE_SIZE', 256))
+EVENT_MAX_SUBSCRIBERS = int(os.environ.get('EVENT_MAX_SUBSCRIBERS', 100))
+EVENT_KEEPALIVE_SEC = float(os.environ.get('EVENT_KEEPALIVE_SEC', 15))
+
+class Subscription:
+    """구독자 한 명의 이벤트 큐
+
+    큐는 EVENT_QUEUE_SIZE개로 제한된다. 구독자가 느려 큐가 가득 차면
+    쌓인 이벤트를 버리고 'resync' 이벤트 하나로 바꿔, 클라이언트가
+    /api/dashboard를 다시 읽도록 한다. 발행자는 절대 기다리지 않는다.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._events = deque()
+        self._overflowed = False
+        self._condition = threading.Condition()
+        self.closed = False
+
+    def put(self, event):
+        with self._condition:
+            if self._overflowed:
+                self.dropped += 1
+                return
+            if len(self._events) >= self.maxsize:
+                self.dropped += len(self._events) + 1
+                self._events.clear()
+                self._overflowed = True
+            else:
+                self._events.append(event)
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """다음 이벤트 (timeout 동안 없으면 None)"""
+        with self._condition:
+            if not self._events and not self._overflowed and not self.closed:
+                self._condition.wait(timeout)
+            if self._overflowed:
+                self._overflowed = False
+                return {'id': None, 'type': 'resync', 'data': {'dropped': self.dropped}}
+            if self._events:
+                return self._events.popleft()
+            return None
+
+    def close(self):
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+class EventBroker:
+    """프로세스 안에서 이벤트를 모든 구독자에게 나눠주는 브로커"""
+
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE, max_subscribers=EVENT_MAX_SUBSCRIBERS):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._stats = {'published': 0, 'dropped': 0, 'rejected': 0}
+
+    def subscribe(self):
+        """새 구독 반환. 구독자 수 제한을 넘으면 None."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self._stats['rejected'] += 1
+                return None
+            subscription = Subscription(self.queue_size)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+                self._stats['dropped'] += subscription.dropped
+
+    def publish(self, event_type, data):
+        """이벤트 발행 (구독자 큐에 넣기만 하고 바로 반환)"""
+        event = {'id': next(self._ids), 'type': event_type, 'data': data, 'time': time.time()}
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._stats['published'] += 1
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def stream(self, subscription, keepalive=EVENT_KEEPALIVE_SEC):
+        """SSE 형식 문자열을 내보내는 제너레이터. 연결이 끊기면 구독 해제."""
+        try:
+            yield "retry: 5000\n\n"
+            while not subscription.closed:
+                event = subscription.get(timeout=keepalive)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                lines = [f"event: {event['type']}", f"data: {json.dumps(event['data'], ensure_ascii=False)}"]
+                if event['id'] is not None:
+                    lines.insert(0, f"id: {event['id']}")
+                yield '\n'.join(lines) + '\n\n'
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['subscribers'] = len(self._subscribers)
+            stats['dropped'] += sum(subscription.dropped for subscription in self._subscribers)
+        stats['queue_size'] = self.queue_size
+        stats['max_subscribers'] = self.max_subscribers
+        return stats
+
+# 프로세스 전체에서 공유하는 브로커
+broker = EventBroker()
+
+def publish(event_type, data):
+    broker.publish(event_type, data)
@@ -0,0 +1,360 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# 크롤링 HTTP 설정
+REQUEST_TIMEOUT = float(os.environ.get('REQUEST_TIMEOUT', 10))
+MAX_RETRIES = int(os.environ.get('MAX_RETRIES', 3))
+RETRY_BACKOFF = float(os.environ.get('RETRY_BACKOFF', 0.5))
+HTTP_POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', 10))
+HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 32))
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER = 30
+
+# 호스트별 요청 속도 제한 (토큰 버킷). HOST_RATE_LIMIT=0이면 끔.
+# 적응형이면 429/503이나 지연 급증 시 속도를 절반으로 줄이고(최소 HOST_RATE_MIN),
+# 정상 응답마다 조금씩 HOST_RATE_LIMIT까지 되돌린다 (AIMD).
+HOST_RATE_LIMIT = float(os.environ.get('HOST_RATE_LIMIT', 5))
+HOST_BURST = float(os.environ.get('HOST_BURST', 10))
+HOST_RATE_MIN = float(os.environ.get('HOST_RATE_MIN', 0.5))
+HOST_RATE_ADAPTIVE = os.environ.get('HOST_RATE_ADAPTIVE', '1') == '1'
+# 사용자가 기다리는 요청(검색, 상품 하나 추가)은 같은 버킷에서 우선권을 갖는다.
+# 백그라운드 요청은 버킷의 마지막 HOST_INTERACTIVE_RESERVE개 토큰을 쓰지 않고,
+# interactive 요청이 기다리는 동안에는 토큰을 가져가지 않는다.
+HOST_INTERACTIVE_RESERVE = float(os.environ.get('HOST_INTERACTIVE_RESERVE', 2))
+# interactive 요청이 속도 제한/Retry-After/재시도로 기다리는 시간의 합 상한 (초)
+INTERACTIVE_MAX_WAIT = float(os.environ.get('INTERACTIVE_MAX_WAIT', 5))
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+LATENCY_SPIKE_FACTOR = 3.0   # 평균 지연의 몇 배면 급증으로 볼지
+LATENCY_SPIKE_FLOOR = 1.0    # 이보다 빠른 응답은 급증으로 보지 않음 (초)
+RATE_DECREASE_COOLDOWN = 1.0 # 동시에 들어온 429들로 여러 번 줄이지 않도록 (초)
+RATE_INCREASE_PER_SEC = 0.05 # 정상 응답이 이어질 때 초당 최대 속도의 몇 %씩 되돌릴지
+
+# brotli 패키지가 설치되어 있으면 urllib3가 'br'을 포함시킨다
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+    'Accept-Encoding': ACCEPT_ENCODING.replace(',', ', '),
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+class HostThrottled(requests.RequestException):
+    """interactive 요청이 INTERACTIVE_MAX_WAIT 안에 호스트로 보낼 차례를 얻지 못함"""
+
+class TokenBucket:
+    """호스트 하나의 토큰 버킷 (적응형 속도 조절 포함)
+
+    토큰은 음수가 되지 않으므로 호스트로 나가는 요청은 interactive 여부와
+    관계없이 합쳐서 rate를 넘지 않는다. interactive 요청은 기다리는 백그라운드
+    요청보다 먼저 토큰을 받고, reserve개는 백그라운드가 쓰지 않고 남겨 둔다.
+    """
+
+    def __init__(self, rate, burst, min_rate, adaptive, reserve=0.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min(min_rate, rate)
+        self.adaptive = adaptive
+        self.reserve = max(0.0, min(reserve, burst - 1))
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.latency_ewma = None
+        self.last_decrease = 0.0
+        self.last_increase = time.monotonic()
+        self.interactive_waiting = 0
+        self.lock = threading.Lock()
+        self.ready = threading.Condition(self.lock)
+        self.stats = {'requests': 0, 'interactive': 0, 'waits': 0, 'wait_sec': 0.0, 'timeouts': 0,
+                      'throttled': 0, 'latency_spikes': 0, 'decreases': 0}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, interactive=False, timeout=None):
+        """토큰 하나를 얻을 때까지 기다리고 기다린 시간(초) 반환. timeout을 넘기면 None."""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self.ready:
+            if interactive:
+                self.interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    needed = 1.0 if interactive else 1.0 + self.reserve
+                    blocked = not interactive and self.interactive_waiting > 0
+                    if now >= self.paused_until and self.tokens >= needed and not blocked:
+                        break
+                    wait = max(self.paused_until - now, (needed - self.tokens) / self.rate, 0.0)
+                    if blocked:
+                        # 앞선 interactive 요청이 토큰을 받으면 notify로 깨어난다
+                        wait = max(wait, 1.0 / self.rate)
+                    if deadline is not None:
+                        if now + wait > deadline:
+                            self.stats['timeouts'] += 1
+                            return None
+                    self.ready.wait(wait)
+                self.tokens -= 1
+                waited = time.monotonic() - started
+                self.stats['requests'] += 1
+                if interactive:
+                    self.stats['interactive'] += 1
+                if waited > 0.001:
+                    self.stats['waits'] += 1
+                    self.stats['wait_sec'] += waited
+                return waited
+            finally:
+                if interactive:
+                    self.interactive_waiting -= 1
+                    self.ready.notify_all()
+
+    def record(self, status_code, latency, retry_after=None):
+        """응답 결과로 속도 조절"""
+        with self.lock:
+            now = time.monotonic()
+            throttled = status_code in THROTTLE_STATUS_CODES
+            if throttled:
+                self.stats['throttled'] += 1
+                if retry_after:
+                    # 서버가 알려준 시간 동안은 이 호스트로 보내지 않는다
+                    self.paused_until = max(self.paused_until, now + retry_after)
+
+            spike = False
+            if latency is not None and not throttled:
+                if (self.latency_ewma is not None and latency > LATENCY_SPIKE_FLOOR
+                        and latency > self.latency_ewma * LATENCY_SPIKE_FACTOR):
+                    spike = True
+                    self.stats['latency_spikes'] += 1
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+            if not self.adaptive:
+                return
+            if throttled or spike:
+                if now - self.last_decrease >= RATE_DECREASE_COOLDOWN:
+                    self.rate = max(self.min_rate, self.rate / 2)
+                    self.tokens = min(self.tokens, 0.0)
+                    self.last_decrease = now
+                    self.last_increase = now
+                    self.stats['decreases'] += 1
+            elif status_code < 400:
+                elapsed = min(now - self.last_increase, 1.0)
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_INCREASE_PER_SEC * elapsed)
+                self.last_increase = now
+
+    def snapshot(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['rate'] = round(self.rate, 3)
+            stats['max_rate'] = self.max_rate
+            stats['interactive_reserve'] = self.reserve
+            stats['wait_sec'] = round(stats['wait_sec'], 3)
+            stats['latency_ewma_ms'] = round(self.latency_ewma * 1000, 1) if self.latency_ewma is not None else None
+        return stats
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 하나씩. 검색/상품 크롤링/스케줄러가 모두 공유한다.
+
+    interactive 요청은 같은 버킷에서 우선권만 가지므로, 호스트로 나가는
+    전체 요청은 항상 HOST_RATE_LIMIT 이하다.
+    """
+
+    def __init__(self, rate=HOST_RATE_LIMIT, burst=HOST_BURST, min_rate=HOST_RATE_MIN,
+                 adaptive=HOST_RATE_ADAPTIVE, interactive_reserve=HOST_INTERACTIVE_RESERVE):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.adaptive = adaptive
+        self.interactive_reserve = interactive_reserve
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, self.min_rate, self.adaptive, self.interactive_reserve)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, host, interactive=False, timeout=None):
+        """요청을 보내도 될 때까지 대기. timeout 안에 차례가 오지 않으면 False."""
+        if not self.enabled:
+            return True
+        return self._bucket(host).acquire(interactive, timeout) is not None
+
+    def record(self, host, status_code, latency, retry_after=None):
+        if not self.enabled:
+            return
+        self._bucket(host).record(status_code, latency, retry_after)
+
+    def stats(self):
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.snapshot() for host, bucket in buckets.items()}
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """새 TCP 연결이 만들어질 때마다 콜백을 호출하는 어댑터"""
+
+    def __init__(self, on_new_connection, **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        def counting_pool(pool_cls):
+            def _new_conn(pool):
+                on_new_connection()
+                return pool_cls._new_conn(pool)
+            return type(pool_cls.__name__, (pool_cls,), {'_new_conn': _new_conn})
+
+        # 모듈 전역 dict를 건드리지 않도록 새 dict로 교체
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: counting_pool(pool_cls)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+class CrawlerClient:
+    """커넥션 풀을 공유하는 크롤링용 HTTP 클라이언트
+
+    하나의 requests.Session을 여러 스레드(스케줄러, Flask 요청 처리)가
+    함께 사용한다. 모든 요청은 호스트별 속도 제한(HostRateLimiter)을 거치고,
+    429/5xx 응답과 연결 오류는 지수 백오프로 재시도한다.
+    """
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff=RETRY_BACKOFF, pool_hosts=HTTP_POOL_HOSTS,
+                 pool_maxsize=HTTP_POOL_MAXSIZE, rate_limiter=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0,
+            'new_connections': 0,
+            'retries': 0,
+            'errors': 0,
+        }
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = _CountingHTTPAdapter(
+            self._count_new_connection,
+            pool_connections=pool_hosts,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _count_new_connection(self):
+        self._increment('new_connections')
+
+    @staticmethod
+    def _retry_after(response):
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_RETRY_AFTER)
+        return None
+
+    def _retry_delay(self, attempt, response=None):
+        """재시도 대기 시간 (Retry-After 헤더 우선)"""
+        if response is not None:
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                return retry_after
+        return self.backoff * (2 ** attempt)
+
+    def get(self, url, timeout=None, interactive=False, **kwargs):
+        """GET 요청 (재시도 포함). 마지막 응답을 그대로 반환한다.
+
+        interactive=True면 사용자가 기다리는 요청으로 보고 호스트 버킷에서
+        우선권을 준다. 대신 속도 제한/Retry-After/재시도 대기의 합이
+        INTERACTIVE_MAX_WAIT를 넘으면 더 기다리지 않고 마지막 응답을
+        반환하거나, 아직 응답이 없으면 HostThrottled를 던진다.
+        """
+        timeout = timeout or self.timeout
+        host = urlsplit(url).netloc
+        deadline = time.monotonic() + INTERACTIVE_MAX_WAIT if interactive else None
+
+        def remaining():
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        last_response = None
+        for attempt in range(self.max_retries + 1):
+            if not self.rate_limiter.acquire(host, interactive, timeout=remaining()):
+                if last_response is not None:
+                    return last_response
+                raise HostThrottled(f'{host}: {INTERACTIVE_MAX_WAIT}초 안에 요청을 보내지 못했습니다')
+            self._increment('requests')
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if isinstance(e, requests.Timeout):
+                    # 타임아웃은 과부하 신호로 보고 429/503처럼 속도를 줄인다
+                    self.rate_limiter.record(host, 503, time.monotonic() - started)
+                self._increment('errors')
+                delay = self._retry_delay(attempt)
+                if attempt >= self.max_retries or (deadline is not None and delay > remaining()):
+                    raise
+                self._increment('retries')
+                time.sleep(delay)
+                continue
+
+            self.rate_limiter.record(host, response.status_code, time.monotonic() - started, self._retry_after(response))
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                if deadline is not None and delay > remaining():
+                    return response
+                self._increment('retries')
+                response.close()
+                last_response = response
+                time.sleep(delay)
+                continue
+
+            return response
+
+    def stats(self):
+        """요청/연결 재사용 통계"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['reused_connections'] = max(0, stats['requests'] - stats['errors'] - stats['new_connections'])
+        stats['hosts'] = self.rate_limiter.stats()
+        return stats
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """프로세스 전체에서 공유하는 CrawlerClient 반환"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CrawlerClient()
+    return _client
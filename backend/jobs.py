@@ -0,0 +1,265 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 백그라운드 작업 설정
+JOB_MAX_WORKERS = int(os.environ.get('JOB_MAX_WORKERS', 4))
+JOB_HISTORY_SIZE = int(os.environ.get('JOB_HISTORY_SIZE', 1000))
+
+# 주기 작업 스케줄러 설정
+SCHEDULER_MAX_WORKERS = int(os.environ.get('SCHEDULER_MAX_WORKERS', 4))
+SCHEDULER_JITTER = float(os.environ.get('SCHEDULER_JITTER', 0.1))
+
+class JobManager:
+    """URL 목록을 백그라운드 스레드 풀에서 처리하고 진행 상태를 보관
+
+    작업 하나는 여러 항목(URL)으로 이루어지며, 항목들은 풀 크기만큼만
+    동시에 실행된다. 끝난 작업은 최근 JOB_HISTORY_SIZE개까지만 남긴다.
+    """
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, history_size=JOB_HISTORY_SIZE):
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='product-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, items, func):
+        """items 각각에 func(item)을 실행하는 작업을 등록하고 작업 id 반환
+
+        func는 결과 dict를 반환하거나 예외를 던진다.
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'status': 'pending',
+            'total': len(items),
+            'completed': 0,
+            'failed': 0,
+            'results': [None] * len(items),
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+        }
+        if not items:
+            job['status'] = 'completed'
+            job['finished_at'] = job['created_at']
+
+        with self._lock:
+            self._jobs[job_id] = job
+            self._trim()
+
+        for index, item in enumerate(items):
+            self._executor.submit(self._run_item, job, index, item, func)
+        return job_id
+
+    def _run_item(self, job, index, item, func):
+        with self._lock:
+            if job['status'] == 'pending':
+                job['status'] = 'running'
+                job['started_at'] = time.time()
+
+        try:
+            result = func(item)
+            failed = False
+        except Exception as e:
+            result = {'item': item, 'error': str(e)}
+            failed = True
+
+        with self._lock:
+            job['results'][index] = result
+            job['completed'] += 1
+            if failed:
+                job['failed'] += 1
+            if job['completed'] == job['total']:
+                job['status'] = 'failed' if job['failed'] == job['total'] else 'completed'
+                job['finished_at'] = time.time()
+
+    def _trim(self):
+        """끝난 작업부터 오래된 순으로 정리 (lock 보유 상태에서 호출)"""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items() if job['finished_at']][:excess]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """작업 상태 스냅샷 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot['results'] = [result for result in job['results'] if result is not None]
+        return snapshot
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+class JobScheduler:
+    """주기 작업들을 하나의 스레드에서 예약하고 풀에서 실행
+
+    다음 실행 시각 순 힙(우선순위 큐) 하나로 모든 작업을 관리한다.
+    - 실행 시각은 예약 시각 기준으로 interval만큼 더해 밀리지 않게 하고,
+      jitter 비율만큼 무작위로 흔들어 여러 작업이 한꺼번에 몰리지 않게 한다.
+    - 이전 실행이 아직 끝나지 않았으면 이번 차례는 건너뛴다 (겹침 방지).
+    - 작업 함수는 stop_event를 받아, 종료 요청 시 빨리 끝낼 수 있다.
+    """
+
+    def __init__(self, max_workers=SCHEDULER_MAX_WORKERS, jitter=SCHEDULER_JITTER):
+        self.jitter = jitter
+        self.stop_event = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scheduled-job')
+        self._jobs = {}
+        self._heap = []  # (실행 시각, 순번, 작업 이름)
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def add_job(self, name, func, interval, initial_delay=0.0, delay_first_run=False):
+        """func(stop_event)를 interval초마다 실행하도록 등록
+
+        delay_first_run이면 첫 실행을 한 주기(+jitter) 뒤로 미룬다.
+        프로세스가 뜰 때마다 정비 작업이 한꺼번에 도는 것을 막기 위함이다.
+        """
+        job = {
+            'name': name,
+            'func': func,
+            'interval': interval,
+            'running': False,
+            'runs': 0,
+            'failures': 0,
+            'skipped': 0,
+            'last_started_at': None,
+            'last_duration': None,
+            'total_duration': 0.0,
+            'max_duration': 0.0,
+            'last_lag': None,
+            'max_lag': 0.0,
+            'last_error': None,
+            'next_run': None,
+        }
+        with self._condition:
+            self._jobs[name] = job
+            first_run = time.monotonic() + initial_delay
+            if delay_first_run:
+                first_run = self._next_run_at(job, first_run)
+            self._schedule(job, first_run)
+            self._condition.notify()
+
+    def _schedule(self, job, run_at):
+        job['next_run'] = run_at
+        heapq.heappush(self._heap, (run_at, next(self._seq), job['name']))
+
+    def _next_run_at(self, job, due):
+        spread = job['interval'] * self.jitter
+        next_run = due + job['interval'] + random.uniform(-spread, spread)
+        # 오래 밀렸으면 따라잡으려고 연달아 실행하지 않는다
+        return max(next_run, time.monotonic())
+
+    def start(self):
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name='job-scheduler', daemon=True)
+            self._thread.start()
+        print(f"작업 스케줄러가 시작되었습니다 ({', '.join(self._jobs)})")
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            with self._condition:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, name = self._heap[0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                job = self._jobs.get(name)
+                if job is None or job['next_run'] != due:
+                    continue  # 다시 예약되며 버려진 항목
+                self._schedule(job, self._next_run_at(job, due))
+                if job['running']:
+                    job['skipped'] += 1
+                    print(f"예약 작업 '{name}'이 아직 실행 중이라 이번 차례는 건너뜁니다")
+                    continue
+                job['running'] = True
+                lag = now - due
+            self._executor.submit(self._run, job, lag)
+
+    def _run(self, job, lag):
+        started = time.monotonic()
+        with self._condition:
+            job['last_started_at'] = time.time()
+            job['last_lag'] = lag
+            job['max_lag'] = max(job['max_lag'], lag)
+        error = None
+        try:
+            job['func'](self.stop_event)
+        except Exception as e:
+            error = e
+            print(f"예약 작업 '{job['name']}' 오류: {e}")
+        duration = time.monotonic() - started
+        with self._condition:
+            job['running'] = False
+            job['runs'] += 1
+            job['last_duration'] = duration
+            job['total_duration'] += duration
+            job['max_duration'] = max(job['max_duration'], duration)
+            if error is not None:
+                job['failures'] += 1
+                job['last_error'] = str(error)
+
+    def run_now(self, name):
+        """작업을 바로 실행하도록 다시 예약. 없는 작업이면 False."""
+        with self._condition:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            self._schedule(job, time.monotonic())
+            self._condition.notify()
+        return True
+
+    def stats(self):
+        """작업별 실행 횟수, 실행 시간, 예약 대비 지연(lag)"""
+        now = time.monotonic()
+        with self._condition:
+            jobs = {}
+            for name, job in self._jobs.items():
+                runs = job['runs']
+                jobs[name] = {
+                    'interval': job['interval'],
+                    'running': job['running'],
+                    'runs': runs,
+                    'failures': job['failures'],
+                    'skipped': job['skipped'],
+                    'last_started_at': job['last_started_at'],
+                    'last_duration_sec': _round(job['last_duration']),
+                    'avg_duration_sec': _round(job['total_duration'] / runs) if runs else None,
+                    'max_duration_sec': _round(job['max_duration']),
+                    'last_lag_sec': _round(job['last_lag']),
+                    'max_lag_sec': _round(job['max_lag']),
+                    'next_run_in_sec': _round(job['next_run'] - now),
+                    'last_error': job['last_error'],
+                }
+        return {'running': self._thread is not None and not self.stop_event.is_set(), 'jobs': jobs}
+
+    def shutdown(self, timeout=30):
+        """새 실행을 멈추고, 실행 중인 작업에 종료를 알린 뒤 끝나기를 기다린다"""
+        self.stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+def _round(value):
+    return None if value is None else round(value, 3)
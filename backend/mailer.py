@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import os
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# SMTP 설정 (로컬 테스트: SMTP_SERVER=localhost SMTP_PORT=1025 SMTP_USE_TLS=0 EMAIL_PASSWORD=)
+SMTP_SERVER = os.environ.get('SMTP_SERVER', 'smtp.gmail.com')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', 587))
+SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', '1') == '1'
+SMTP_TIMEOUT = float(os.environ.get('SMTP_TIMEOUT', 30))
+SMTP_IDLE_TIMEOUT = float(os.environ.get('SMTP_IDLE_TIMEOUT', 60))
+EMAIL_ADDRESS = os.environ.get('EMAIL_ADDRESS', 'your-email@gmail.com')  # 실제 이메일로 변경
+EMAIL_PASSWORD = os.environ.get('EMAIL_PASSWORD', 'your-app-password')  # Gmail 앱 비밀번호 (비우면 로그인 생략)
+
+# 발송 큐 설정
+MAIL_WORKERS = int(os.environ.get('MAIL_WORKERS', 2))
+MAIL_BATCH_SIZE = int(os.environ.get('MAIL_BATCH_SIZE', 50))
+MAIL_MAX_RETRIES = int(os.environ.get('MAIL_MAX_RETRIES', 3))
+MAIL_RETRY_BACKOFF = float(os.environ.get('MAIL_RETRY_BACKOFF', 5))
+MAIL_RECIPIENT_INTERVAL = float(os.environ.get('MAIL_RECIPIENT_INTERVAL', 5))
+
+def build_message(to_email, subject, body):
+    msg = MIMEMultipart()
+    msg['From'] = EMAIL_ADDRESS
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'html'))
+    return msg.as_string()
+
+def open_smtp_session():
+    """SMTP 연결 + (STARTTLS) + (로그인)"""
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+    if SMTP_USE_TLS:
+        server.starttls()
+    if EMAIL_PASSWORD:
+        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+    return server
+
+def _close_session(server):
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+class MailDispatcher:
+    """알림 메일 발송 큐
+
+    - 워커마다 인증된 SMTP 세션을 하나씩 유지하며 재사용한다
+      (SMTP_IDLE_TIMEOUT 동안 쓰지 않으면 닫는다).
+    - 준비된 메일을 최대 MAIL_BATCH_SIZE개씩 꺼내 같은 세션으로 보내고,
+      보낸 결과는 on_delivered(items)로 한 번에 넘긴다.
+    - 일시적 오류는 지수 백오프로 MAIL_MAX_RETRIES번까지 다시 시도하고,
+      수신자 거부 같은 영구 오류는 바로 포기한다.
+    - 같은 수신자에게는 MAIL_RECIPIENT_INTERVAL초에 한 통만 보낸다.
+    - 같은 key가 큐에 있는 동안 다시 넣으면 무시한다.
+    """
+
+    def __init__(self, on_delivered=None, workers=MAIL_WORKERS, batch_size=MAIL_BATCH_SIZE,
+                 max_retries=MAIL_MAX_RETRIES, backoff=MAIL_RETRY_BACKOFF,
+                 recipient_interval=MAIL_RECIPIENT_INTERVAL, session_factory=open_smtp_session):
+        self.on_delivered = on_delivered
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.recipient_interval = recipient_interval
+        self.session_factory = session_factory
+
+        self._queue = []  # (보낼 수 있는 시각, 순번, 항목) 힙
+        self._seq = itertools.count()
+        self._pending_keys = set()
+        self._in_flight = 0
+        self._next_allowed = {}  # 수신자 → 다음 발송 가능 시각 (지난 항목은 주기적으로 정리)
+        self._next_prune = 0.0
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopping = False
+        self._stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retries': 0,
+            'rate_limited': 0,
+            'duplicates': 0,
+            'sessions_opened': 0,
+            'batches': 0,
+        }
+
+    def _start(self):
+        """첫 메일이 들어올 때 워커 시작 (condition 보유 상태에서 호출)"""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'mail-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def enqueue(self, to_email, subject, body, key=None, meta=None):
+        """메일을 큐에 넣는다. 같은 key가 이미 대기 중이면 False."""
+        with self._condition:
+            if self._stopping:
+                return False
+            if key is not None:
+                if key in self._pending_keys:
+                    self._stats['duplicates'] += 1
+                    return False
+                self._pending_keys.add(key)
+            item = {
+                'to': to_email,
+                'subject': subject,
+                'body': body,
+                'key': key,
+                'meta': meta,
+                'attempts': 0,
+            }
+            heapq.heappush(self._queue, (time.monotonic(), next(self._seq), item))
+            self._stats['queued'] += 1
+            self._start()
+            self._condition.notify()
+        return True
+
+    def _take_batch(self):
+        """보낼 수 있는 메일을 최대 batch_size개 꺼낸다. 멈추는 중이고 큐가 비면 None."""
+        with self._condition:
+            while True:
+                if self._stopping and not self._queue:
+                    return None
+                now = time.monotonic()
+                self._prune_next_allowed(now)
+                batch = []
+                deferred = []
+                while self._queue and self._queue[0][0] <= now and len(batch) < self.batch_size:
+                    _, seq, item = heapq.heappop(self._queue)
+                    allowed_at = self._next_allowed.get(item['to'], 0)
+                    if allowed_at > now:
+                        # 수신자별 발송 간격 제한: 가능한 시각으로 미룬다
+                        self._stats['rate_limited'] += 1
+                        deferred.append((allowed_at, seq, item))
+                        continue
+                    self._next_allowed[item['to']] = now + self.recipient_interval
+                    batch.append(item)
+                for entry in deferred:
+                    heapq.heappush(self._queue, entry)
+                if batch:
+                    self._in_flight += len(batch)
+                    return batch
+
+                timeout = self._queue[0][0] - now if self._queue else None
+                self._condition.wait(timeout)
+
+    def _prune_next_allowed(self, now):
+        """발송 간격이 이미 지난 수신자를 지운다 (condition 보유 상태에서 호출)
+
+        수신자마다 항목이 하나씩 영원히 쌓이지 않도록, 발송 간격마다 한 번씩 훑는다.
+        """
+        if now < self._next_prune:
+            return
+        self._next_allowed = {to: allowed_at for to, allowed_at in self._next_allowed.items() if allowed_at > now}
+        self._next_prune = now + max(self.recipient_interval, 1.0)
+
+    def _worker(self):
+        session = {'server': None, 'last_used': 0.0}
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                break
+
+            if session['server'] is not None and time.monotonic() - session['last_used'] > SMTP_IDLE_TIMEOUT:
+                self._drop_session(session)
+
+            delivered = []
+            for item in batch:
+                try:
+                    self._send(session, item)
+                    delivered.append(item)
+                except smtplib.SMTPRecipientsRefused as e:
+                    print(f"이메일 수신자 거부: {item['to']} ({e})")
+                    self._finish(item, failed=True)
+                except Exception as e:
+                    # 연결 문제일 수 있으므로 세션을 버리고 다음 메일부터 새로 연결
+                    self._drop_session(session)
+                    self._retry_or_fail(item, e)
+            session['last_used'] = time.monotonic()
+
+            self._deliver(delivered)
+
+            with self._condition:
+                self._in_flight -= len(batch)
+                self._stats['batches'] += 1
+                self._condition.notify_all()
+
+        self._drop_session(session)
+
+    def _send(self, session, item):
+        message = build_message(item['to'], item['subject'], item['body'])
+        if session['server'] is not None:
+            try:
+                session['server'].sendmail(EMAIL_ADDRESS, item['to'], message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                # 서버가 유휴 세션을 끊은 경우: 새로 연결해 바로 다시 보낸다
+                self._drop_session(session)
+
+        session['server'] = self.session_factory()
+        self._increment('sessions_opened')
+        session['server'].sendmail(EMAIL_ADDRESS, item['to'], message)
+
+    def _drop_session(self, session):
+        if session['server'] is not None:
+            _close_session(session['server'])
+            session['server'] = None
+
+    def _deliver(self, delivered):
+        if not delivered:
+            return
+        with self._condition:
+            self._stats['sent'] += len(delivered)
+        if self.on_delivered:
+            try:
+                self.on_delivered(delivered)
+            except Exception as e:
+                print(f"발송 완료 처리 실패: {e}")
+        with self._condition:
+            for item in delivered:
+                self._pending_keys.discard(item['key'])
+        print(f"이메일 {len(delivered)}통 발송 완료")
+
+    def _retry_or_fail(self, item, error):
+        item['attempts'] += 1
+        if item['attempts'] > self.max_retries:
+            print(f"이메일 발송 실패 (재시도 {self.max_retries}회 초과): {item['to']} ({error})")
+            self._finish(item, failed=True)
+            return
+        delay = self.backoff * (2 ** (item['attempts'] - 1))
+        with self._condition:
+            self._stats['retries'] += 1
+            heapq.heappush(self._queue, (time.monotonic() + delay, next(self._seq), item))
+            self._condition.notify()
+
+    def _finish(self, item, failed):
+        with self._condition:
+            if failed:
+                self._stats['failed'] += 1
+            self._pending_keys.discard(item['key'])
+
+    def _increment(self, name):
+        with self._condition:
+            self._stats[name] += 1
+
+    def join(self, timeout=None):
+        """큐가 빌 때까지 대기 (재시도 대기 중인 메일 포함). 다 비었으면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=10):
+        """남은 메일을 보내고 워커와 SMTP 세션 정리"""
+        self.join(timeout)
+        with self._condition:
+            self._stopping = True
+            self._queue.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._queue) + self._in_flight
+        stats['workers'] = self.workers
+        return stats
@@ -1,32 +1,16 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from database import get_db_connection
-import threading
-import time
+from events import publish
+from mailer import MailDispatcher, build_message, open_smtp_session, EMAIL_ADDRESS
+import os
 
-# 이메일 설정 (실제 사용시 환경변수로 관리)
-SMTP_SERVER = 'smtp.gmail.com'
-SMTP_PORT = 587
-EMAIL_ADDRESS = 'your-email@gmail.com'  # 실제 이메일로 변경
-EMAIL_PASSWORD = 'your-app-password'    # Gmail 앱 비밀번호
+# 전체 알림 재확인 주기 (발송 실패한 알림 재시도용 안전망, scheduler.py에서 예약)
+ALERT_SWEEP_INTERVAL = int(os.environ.get('ALERT_SWEEP_INTERVAL', 3600))
 
 def send_email(to_email, subject, body):
-    """이메일 발송"""
+    """이메일 한 통을 바로 발송 (테스트용). 알림은 발송 큐를 거친다."""
     try:
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_ADDRESS
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        msg.attach(MIMEText(body, 'html'))
-        
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-        
-        text = msg.as_string()
-        server.sendmail(EMAIL_ADDRESS, to_email, text)
+        server = open_smtp_session()
+        server.sendmail(EMAIL_ADDRESS, to_email, build_message(to_email, subject, body))
         server.quit()
         
         print(f"이메일 발송 완료: {to_email}")
@@ -36,60 +20,99 @@ def send_email(to_email, subject, body):
         print(f"이메일 발송 실패: {e}")
         return False
 
+def _deactivate_delivered(items):
+    """발송된 알림을 한 트랜잭션으로 비활성화 (중복 발송 방지)"""
+    conn = get_db_connection()
+    conn.executemany(
+        'UPDATE alerts SET is_active = 0 WHERE id = ?',
+        [(item['key'],) for item in items]
+    )
+    conn.commit()
+    conn.close()
+    
+    for item in items:
+        publish('alert_fired', item['meta'])
+
+# 알림 메일 발송 큐 (첫 메일이 들어올 때 워커 시작)
+mail_dispatcher = MailDispatcher(on_delivered=_deactivate_delivered)
+
+def find_triggered_alerts(conn, product_prices):
+    """가격이 바뀐 상품들의 활성 알림 중 목표 가격에 도달한 것만 조회
+
+    product_prices: {상품 id: 새 가격}. idx_alerts_active_product_target
+    (product_id, target_price) 부분 인덱스로 상품마다 범위 탐색만 한다.
+    """
+    triggered = []
+    for product_id, price in product_prices.items():
+        triggered.extend(conn.execute('''
+            SELECT a.*, p.name, p.current_price, p.url
+            FROM alerts a
+            JOIN products p ON a.product_id = p.id
+            WHERE a.product_id = ? AND a.is_active = 1 AND a.target_price >= ?
+        ''', (product_id, price)).fetchall())
+    return triggered
+
+def _fire_alerts(alerts):
+    """목표 가격에 도달한 알림 메일을 발송 큐에 넣는다. 새로 넣은 수 반환.
+
+    발송과 비활성화는 큐 워커가 처리하므로 DB 연결을 붙잡고 있지 않는다.
+    """
+    queued = 0
+    for alert in alerts:
+        subject = f"[SSG 가격 알림] {alert['name']} 목표 가격 도달!"
+        
+        body = f"""
+        <html>
+        <body>
+            <h2>가격 알림</h2>
+            <p><strong>상품명:</strong> {alert['name']}</p>
+            <p><strong>현재 가격:</strong> {alert['current_price']:,}원</p>
+            <p><strong>목표 가격:</strong> {alert['target_price']:,}원</p>
+            <p><strong>상품 링크:</strong> <a href="{alert['url']}">바로가기</a></p>
+            <p>지금 바로 확인해보세요!</p>
+        </body>
+        </html>
+        """
+        
+        meta = {
+            'alert_id': alert['id'],
+            'product_id': alert['product_id'],
+            'name': alert['name'],
+            'price': alert['current_price'],
+            'target_price': alert['target_price'],
+        }
+        # 알림 id를 key로 넣어 큐에 있는 동안 다시 들어오지 않게 한다
+        if mail_dispatcher.enqueue(alert['user_email'], subject, body, key=alert['id'], meta=meta):
+            queued += 1
+    return queued
+
+def check_price_alerts_for_products(product_prices):
+    """가격이 바뀐 상품의 알림만 확인 (스케줄러/알림 등록 시 호출). 큐에 넣은 수 반환."""
+    if not product_prices:
+        return 0
+    conn = get_db_connection()
+    alerts = find_triggered_alerts(conn, product_prices)
+    conn.close()
+    return _fire_alerts(alerts)
+
 def check_price_alerts():
-    """가격 알림 체크"""
+    """전체 활성 알림 확인
+
+    가격 변경 시점에는 check_price_alerts_for_products가 처리하므로,
+    이 함수는 발송에 실패한 알림을 다시 시도하는 안전망으로만 쓴다.
+    """
     conn = get_db_connection()
     
-    # 활성 알림 조회
+    # 목표 가격에 도달한 활성 알림만 조회
     alerts = conn.execute('''
         SELECT a.*, p.name, p.current_price, p.url
         FROM alerts a
         JOIN products p ON a.product_id = p.id
-        WHERE a.is_active = 1
+        WHERE a.is_active = 1 AND p.current_price <= a.target_price
     ''').fetchall()
     
-    for alert in alerts:
-        if alert['current_price'] <= alert['target_price']:
-            # 목표 가격 도달 시 이메일 발송
-            subject = f"[SSG 가격 알림] {alert['name']} 목표 가격 도달!"
-            
-            body = f"""
-            <html>
-            <body>
-                <h2>가격 알림</h2>
-                <p><strong>상품명:</strong> {alert['name']}</p>
-                <p><strong>현재 가격:</strong> {alert['current_price']:,}원</p>
-                <p><strong>목표 가격:</strong> {alert['target_price']:,}원</p>
-                <p><strong>상품 링크:</strong> <a href="{alert['url']}">바로가기</a></p>
-                <p>지금 바로 확인해보세요!</p>
-            </body>
-            </html>
-            """
-            
-            if send_email(alert['user_email'], subject, body):
-                # 알림 비활성화 (중복 발송 방지)
-                conn.execute(
-                    'UPDATE alerts SET is_active = 0 WHERE id = ?',
-                    (alert['id'],)
-                )
-                conn.commit()
-    
     conn.close()
-
-def start_notification_scheduler():
-    """알림 스케줄러 시작"""
-    def scheduler():
-        while True:
-            try:
-                check_price_alerts()
-                time.sleep(300)  # 5분마다 체크
-            except Exception as e:
-                print(f"스케줄러 오류: {e}")
-                time.sleep(60)  # 오류 시 1분 후 재시도
-    
-    thread = threading.Thread(target=scheduler, daemon=True)
-    thread.start()
-    print("알림 스케줄러가 시작되었습니다.")
+    return _fire_alerts(alerts)
 
 if __name__ == '__main__':
     # 테스트 이메일 발송
@@ -0,0 +1,320 @@
+import os
+
+import numpy as np
+
+# 가격 이력 다운샘플링 설정
+DEFAULT_POINTS = 500
+MAX_POINTS = 2000
+DOWNSAMPLE_MODES = ('ohlc', 'lttb')
+
+# 가격 이력 보관 계층: 최근 PRICE_LOG_RAW_DAYS일은 price_logs에 행 단위로,
+# 그보다 오래된 점은 상품별 압축 블록(price_log_blocks)으로 옮긴다.
+# 블록에는 첫 시각/가격과 차분(delta)을 담을 수 있는 가장 작은 정수형 배열을 BLOB으로 저장한다.
+PRICE_LOG_RAW_DAYS = int(os.environ.get('PRICE_LOG_RAW_DAYS', 90))
+PRICE_LOG_COMPACT_INTERVAL = int(os.environ.get('PRICE_LOG_COMPACT_INTERVAL', 86400))
+PRICE_BLOCK_POINTS = 4096
+COMPACT_BATCH_PRODUCTS = 500
+
+def encode_deltas(values):
+    """int64 배열 → 첫 값을 뺀 차분 BLOB (첫 바이트는 원소 크기)"""
+    deltas = np.diff(values)
+    itemsize = 8
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if deltas.size == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+            itemsize = np.dtype(dtype).itemsize
+            break
+    return bytes([itemsize]) + deltas.astype(f'<i{itemsize}').tobytes()
+
+def decode_deltas(first, blob):
+    """encode_deltas의 역: 첫 값과 차분 BLOB → int64 배열"""
+    deltas = np.frombuffer(blob, dtype=f'<i{blob[0]}', offset=1)
+    values = np.empty(len(deltas) + 1, dtype=np.int64)
+    values[0] = 0
+    np.cumsum(deltas, out=values[1:])
+    return values + first
+
+def _to_unix(text):
+    """'YYYY-MM-DD HH:MM:SS' → 유닉스 초"""
+    return int(np.datetime64(text.replace(' ', 'T'), 's').astype(np.int64))
+
+def _tuple_cursor(conn):
+    """행을 튜플로 돌려주는 커서 (sqlite3.Row보다 NumPy 배열로 바꾸기가 훨씬 빠르다)"""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+def load_price_history(conn, product_id, since=None, until=None):
+    """상품 가격 이력을 (유닉스 초 배열, 가격 배열)로 한 번에 읽는다
+
+    오래된 점은 압축 블록에서, 최근 점은 price_logs에서 읽어 이어 붙인다.
+    """
+    block_conditions = ['product_id = ?']
+    block_params = [product_id]
+    if since:
+        block_conditions.append('last_at >= ?')
+        block_params.append(_to_unix(since))
+    if until:
+        block_conditions.append('first_at < ?')
+        block_params.append(_to_unix(until))
+    blocks = conn.execute(
+        f'''SELECT first_at, first_price, timestamps, prices
+            FROM price_log_blocks WHERE {' AND '.join(block_conditions)}
+            ORDER BY first_at''',
+        block_params
+    ).fetchall()
+
+    conditions = ['product_id = ?']
+    params = [product_id]
+    if since:
+        conditions.append('logged_at >= ?')
+        params.append(since)
+    if until:
+        conditions.append('logged_at < ?')
+        params.append(until)
+
+    rows = _tuple_cursor(conn).execute(
+        f'''SELECT CAST(strftime('%s', logged_at) AS INTEGER), price
+            FROM price_logs WHERE {' AND '.join(conditions)}
+            ORDER BY logged_at''',
+        params
+    ).fetchall()
+
+    timestamp_parts = [decode_deltas(block['first_at'], block['timestamps']) for block in blocks]
+    price_parts = [decode_deltas(block['first_price'], block['prices']) for block in blocks]
+    if rows:
+        history = np.array(rows, dtype=np.int64)
+        timestamp_parts.append(history[:, 0])
+        price_parts.append(history[:, 1])
+    if not timestamp_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    timestamps = np.concatenate(timestamp_parts)
+    prices = np.concatenate(price_parts)
+    if blocks:
+        # 기간 경계에 걸친 블록에서 범위 밖의 점을 잘라낸다
+        mask = np.ones(len(timestamps), dtype=bool)
+        if since:
+            mask &= timestamps >= _to_unix(since)
+        if until:
+            mask &= timestamps < _to_unix(until)
+        timestamps, prices = timestamps[mask], prices[mask]
+    return timestamps, prices
+
+def load_all_price_history(conn):
+    """모든 상품의 이력을 (상품 id, 유닉스 초, 가격) 배열로 읽는다 (상품/시각 순)
+
+    압축 블록과 price_logs를 각각 한 번의 쿼리로 읽어 합친다.
+    """
+    product_parts, timestamp_parts, price_parts = [], [], []
+    for block in conn.execute(
+        'SELECT product_id, first_at, first_price, timestamps, prices FROM price_log_blocks'
+    ):
+        timestamps = decode_deltas(block['first_at'], block['timestamps'])
+        product_parts.append(np.full(len(timestamps), block['product_id'], dtype=np.int64))
+        timestamp_parts.append(timestamps)
+        price_parts.append(decode_deltas(block['first_price'], block['prices']))
+
+    rows = _tuple_cursor(conn).execute(
+        '''SELECT product_id, CAST(strftime('%s', logged_at) AS INTEGER), price
+           FROM price_logs WHERE product_id IS NOT NULL AND price IS NOT NULL'''
+    ).fetchall()
+    if rows:
+        history = np.array(rows, dtype=np.int64)
+        product_parts.append(history[:, 0])
+        timestamp_parts.append(history[:, 1])
+        price_parts.append(history[:, 2])
+    if not product_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    product_ids = np.concatenate(product_parts)
+    timestamps = np.concatenate(timestamp_parts)
+    prices = np.concatenate(price_parts)
+    order = np.lexsort((timestamps, product_ids))
+    return product_ids[order], timestamps[order], prices[order]
+
+def _write_blocks(conn, product_id, timestamps, prices):
+    for start in range(0, len(timestamps), PRICE_BLOCK_POINTS):
+        block_timestamps = timestamps[start:start + PRICE_BLOCK_POINTS]
+        block_prices = prices[start:start + PRICE_BLOCK_POINTS]
+        conn.execute(
+            '''INSERT INTO price_log_blocks
+               (product_id, first_at, last_at, first_price, count, timestamps, prices)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            (product_id, int(block_timestamps[0]), int(block_timestamps[-1]), int(block_prices[0]),
+             len(block_timestamps), encode_deltas(block_timestamps), encode_deltas(block_prices))
+        )
+
+def rewrite_product_blocks(conn, product_id):
+    """상품의 압축 블록을 모두 풀어 시각 순으로 다시 쓴다 (커밋은 호출자가)
+
+    중복 상품을 합쳐 두 상품의 블록 기간이 겹칠 때 사용한다.
+    """
+    blocks = conn.execute(
+        'SELECT first_at, first_price, timestamps, prices FROM price_log_blocks WHERE product_id = ? ORDER BY first_at',
+        (product_id,)
+    ).fetchall()
+    if not blocks:
+        return
+    timestamps = np.concatenate([decode_deltas(block['first_at'], block['timestamps']) for block in blocks])
+    prices = np.concatenate([decode_deltas(block['first_price'], block['prices']) for block in blocks])
+    order = np.argsort(timestamps, kind='stable')
+    conn.execute('DELETE FROM price_log_blocks WHERE product_id = ?', (product_id,))
+    _write_blocks(conn, product_id, timestamps[order], prices[order])
+
+def compact_price_logs(conn, raw_days=PRICE_LOG_RAW_DAYS, batch_products=COMPACT_BATCH_PRODUCTS):
+    """raw_days일보다 오래된 price_logs 행을 상품별 압축 블록으로 옮긴다
+
+    상품의 마지막 블록이 PRICE_BLOCK_POINTS개보다 작으면 거기에 이어 붙여
+    매일 돌려도 작은 블록이 쌓이지 않게 한다. 상품 batch_products개씩
+    트랜잭션 하나로 처리한다. 옮긴 점/상품/블록 수를 반환한다.
+    """
+    cutoff = conn.execute("SELECT datetime('now', ?)", (f'-{raw_days} days',)).fetchone()[0]
+    stats = {'products': 0, 'points': 0, 'blocks_written': 0}
+
+    while True:
+        product_ids = [row[0] for row in conn.execute(
+            '''SELECT DISTINCT product_id FROM price_logs
+               WHERE logged_at < ? AND product_id IS NOT NULL AND price IS NOT NULL
+               LIMIT ?''',
+            (cutoff, batch_products)
+        )]
+        if not product_ids:
+            break
+        placeholders = ', '.join('?' * len(product_ids))
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                f'''SELECT product_id, CAST(strftime('%s', logged_at) AS INTEGER), price
+                    FROM price_logs
+                    WHERE product_id IN ({placeholders}) AND logged_at < ? AND price IS NOT NULL
+                    ORDER BY product_id, logged_at''',
+                product_ids + [cutoff]
+            ).fetchall()
+            history = np.array(rows, dtype=np.int64)
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(history[:, 0])) + 1, [len(history)]))
+
+            for start, end in zip(starts[:-1], starts[1:]):
+                product_id = int(history[start, 0])
+                timestamps = history[start:end, 1]
+                prices = history[start:end, 2]
+
+                tail = conn.execute(
+                    '''SELECT id, first_at, first_price, count, timestamps, prices FROM price_log_blocks
+                       WHERE product_id = ? ORDER BY first_at DESC LIMIT 1''',
+                    (product_id,)
+                ).fetchone()
+                if tail is not None and tail['count'] < PRICE_BLOCK_POINTS:
+                    timestamps = np.concatenate((decode_deltas(tail['first_at'], tail['timestamps']), timestamps))
+                    prices = np.concatenate((decode_deltas(tail['first_price'], tail['prices']), prices))
+                    conn.execute('DELETE FROM price_log_blocks WHERE id = ?', (tail['id'],))
+
+                _write_blocks(conn, product_id, timestamps, prices)
+                stats['blocks_written'] += (len(timestamps) + PRICE_BLOCK_POINTS - 1) // PRICE_BLOCK_POINTS
+
+            conn.execute(
+                f'''DELETE FROM price_logs
+                    WHERE product_id IN ({placeholders}) AND logged_at < ? AND price IS NOT NULL''',
+                product_ids + [cutoff]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        stats['products'] += len(product_ids)
+        stats['points'] += len(history)
+
+    if stats['points']:
+        print(
+            f"가격 이력 압축: 상품 {stats['products']}개, {stats['points']:,}개 점을 "
+            f"블록 {stats['blocks_written']}개로 옮겼습니다 ({raw_days}일 이전)"
+        )
+    return stats
+
+def storage_stats(conn):
+    """계층별 점 개수 (price_logs 행 / 압축 블록)"""
+    raw = conn.execute('SELECT COUNT(*) FROM price_logs').fetchone()[0]
+    blocks = conn.execute(
+        'SELECT COUNT(*), COALESCE(SUM(count), 0), COALESCE(SUM(length(timestamps) + length(prices)), 0) FROM price_log_blocks'
+    ).fetchone()
+    return {
+        'raw_points': raw,
+        'blocks': blocks[0],
+        'compacted_points': blocks[1],
+        'compacted_bytes': blocks[2],
+    }
+
+def format_timestamps(timestamps):
+    """유닉스 초 배열 → SQLite CURRENT_TIMESTAMP 형식 문자열 목록"""
+    return [text.replace('T', ' ') for text in timestamps.astype('datetime64[s]').astype(str)]
+
+def _bucket_starts(timestamps, points):
+    """시간 구간을 points개로 나눴을 때 각 구간의 첫 인덱스"""
+    span = int(timestamps[-1] - timestamps[0]) + 1
+    buckets = (timestamps - timestamps[0]) * points // span
+    return np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+
+def downsample_ohlc(timestamps, prices, points):
+    """구간별 시가/고가/저가/종가와 개수. 종가 시각을 logged_at으로 쓴다."""
+    starts = _bucket_starts(timestamps, points)
+    ends = np.append(starts[1:], len(prices))
+
+    return {
+        'logged_at': format_timestamps(timestamps[ends - 1]),
+        'price': prices[ends - 1].tolist(),
+        'open': prices[starts].tolist(),
+        'high': np.maximum.reduceat(prices, starts).tolist(),
+        'low': np.minimum.reduceat(prices, starts).tolist(),
+        'count': (ends - starts).tolist(),
+    }
+
+def downsample_lttb(timestamps, prices, points):
+    """Largest-Triangle-Three-Buckets: 모양을 유지하는 대표 점 points개 선택"""
+    count = len(prices)
+    if points < 3 or count <= points:
+        selected = np.arange(count)
+    else:
+        x = timestamps.astype(np.float64)
+        y = prices.astype(np.float64)
+        edges = np.linspace(1, count - 1, points - 1).astype(np.int64)
+        selected = np.empty(points, dtype=np.int64)
+        selected[0] = 0
+        selected[-1] = count - 1
+
+        previous = 0
+        for i in range(points - 2):
+            start, end = edges[i], edges[i + 1]
+            next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else count
+            next_x = x[next_start:next_end].mean()
+            next_y = y[next_start:next_end].mean()
+
+            # 이전 선택점-후보-다음 구간 평균점으로 만든 삼각형 넓이가 최대인 후보
+            areas = np.abs(
+                (x[previous] - next_x) * (y[start:end] - y[previous])
+                - (x[previous] - x[start:end]) * (next_y - y[previous])
+            )
+            previous = start + int(areas.argmax())
+            selected[i + 1] = previous
+
+    return {
+        'logged_at': format_timestamps(timestamps[selected]),
+        'price': prices[selected].tolist(),
+    }
+
+def downsample(timestamps, prices, points, mode='ohlc'):
+    """이력을 최대 points개 점으로 줄여 행(dict) 목록으로 반환
+
+    점 개수가 points 이하이면 원본을 그대로 돌려준다.
+    """
+    if len(prices) <= points:
+        series = {'logged_at': format_timestamps(timestamps), 'price': prices.tolist()}
+    elif mode == 'lttb':
+        series = downsample_lttb(timestamps, prices, points)
+    else:
+        series = downsample_ohlc(timestamps, prices, points)
+
+    keys = list(series)
+    return [dict(zip(keys, values)) for values in zip(*series.values())]
@@ -0,0 +1,190 @@
+import os
+import time
+
+import numpy as np
+
+from cache import TTLCache, SingleFlight
+from price_history import load_price_history, load_all_price_history, format_timestamps
+
+# 가격 통계 캐시 설정. 값과 함께 상품의 마지막 price_logs id를 저장해 두고
+# 새 가격이 기록되면 (다른 프로세스의 워커가 기록해도) 다음 조회에서 다시 계산한다.
+# TTL은 이동 평균 기간이 시간에 따라 밀리는 것을 반영하기 위한 것.
+PRICE_STATS_CACHE_TTL = int(os.environ.get('PRICE_STATS_CACHE_TTL', 300))
+PRICE_STATS_CACHE_SIZE = int(os.environ.get('PRICE_STATS_CACHE_SIZE', 4096))
+
+# 최저가 순위: product_price_summary의 비율 컬럼 인덱스 순서 그대로 읽는다
+# (인덱스 항목은 rowid인 product_id까지 정렬돼 있어 동률도 정렬 없이 결정된다)
+DEAL_RANKINGS = {
+    'low': 's.low_ratio, s.avg_ratio, s.product_id',  # 역대 최저가에 가까운 순 (같으면 평균보다 많이 싼 순)
+    'average': 's.avg_ratio, s.product_id',           # 평균가보다 많이 싼 순
+}
+DEFAULT_DEALS = 20
+MAX_DEALS = 100
+
+MOVING_AVERAGE_DAYS = (7, 30)
+MEDIAN_WINDOW_DAYS = 30
+
+stats_cache = TTLCache(maxsize=PRICE_STATS_CACHE_SIZE, ttl=PRICE_STATS_CACHE_TTL)
+_stats_flight = SingleFlight()
+
+def _get_versioned(key, version, loader):
+    """캐시된 값의 버전이 version과 같으면 그대로, 다르면 다시 계산해 같은 키에 덮어쓴다
+
+    버전을 키가 아닌 값에 두므로 새 가격이 기록될 때마다 옛 결과가
+    캐시에 쌓이지 않는다. 같은 버전의 동시 계산은 한 번으로 합친다.
+    """
+    cached = stats_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    def load():
+        value = loader()
+        stats_cache.set(key, (version, value))
+        return value
+
+    value, _ = _stats_flight.do((key, version), load)
+    return value
+
+def _window_weights(timestamps, next_timestamps, window_start):
+    """각 가격이 [window_start, 지금) 안에서 유지된 시간(초)"""
+    return np.clip(next_timestamps - np.maximum(timestamps, window_start), 0, None).astype(np.float64)
+
+def compute_price_stats(product_ids, timestamps, prices, now=None):
+    """상품/시각 순으로 정렬된 이력 배열에서 상품별 통계를 한 번에 계산
+
+    가격은 다음 기록까지 유지된 것으로 보고(계단 함수), 이동 평균/중앙값/
+    변동성은 기간 안에서 유지된 시간으로 가중한다. 상품별 반복 없이
+    reduceat/accumulate로 모든 상품을 함께 계산한다. 통계 dict 목록 반환.
+    """
+    if len(prices) == 0:
+        return []
+    now = int(time.time()) if now is None else now
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(product_ids)) + 1))
+    ends = np.append(starts[1:], len(prices))
+    counts = ends - starts
+    groups = np.repeat(np.arange(len(starts)), counts)
+    current = prices[ends - 1]
+
+    next_timestamps = np.append(timestamps[1:], now)
+    next_timestamps[ends - 1] = max(now, int(timestamps.max()))
+
+    # 역대 최저/최고가와 그 가격이었던 가장 최근 시각
+    low = np.minimum.reduceat(prices, starts)
+    high = np.maximum.reduceat(prices, starts)
+    low_index = np.flatnonzero(prices == low[groups])
+    high_index = np.flatnonzero(prices == high[groups])
+    low_at = timestamps[low_index[np.searchsorted(low_index, ends) - 1]]
+    high_at = timestamps[high_index[np.searchsorted(high_index, ends) - 1]]
+
+    # 기간별 시간 가중 이동 평균 (기간 안에 유지된 가격이 없으면 현재가)
+    price_values = prices.astype(np.float64)
+    moving_averages = {}
+    for days in MOVING_AVERAGE_DAYS:
+        weights = _window_weights(timestamps, next_timestamps, now - days * 86400)
+        total = np.add.reduceat(weights, starts)
+        weighted = np.add.reduceat(weights * price_values, starts)
+        moving_averages[days] = np.where(total > 0, weighted / np.where(total > 0, total, 1), current)
+
+    # 최근 MEDIAN_WINDOW_DAYS일 시간 가중 중앙값과 변동계수
+    weights = _window_weights(timestamps, next_timestamps, now - MEDIAN_WINDOW_DAYS * 86400)
+    total = np.add.reduceat(weights, starts)
+    has_window = total > 0
+    safe_total = np.where(has_window, total, 1)
+    mean = np.add.reduceat(weights * price_values, starts) / safe_total
+    variance = np.maximum(np.add.reduceat(weights * price_values ** 2, starts) / safe_total - mean ** 2, 0)
+    volatility = np.where(has_window & (mean > 0), np.sqrt(variance) / np.where(mean > 0, mean, 1), 0.0)
+
+    order = np.lexsort((prices, groups))
+    cumulative = np.cumsum(weights[order])
+    before = np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0.0)
+    median_index = np.minimum(np.searchsorted(cumulative, before + total / 2, side='left'), ends - 1)
+    median = np.where(has_window, prices[order][median_index], current)
+    percent_off_median = (median - current) / np.maximum(median, 1) * 100
+
+    # 낙폭: 그때까지의 최고가 대비 하락률. 상품마다 누적 최댓값이 섞이지 않도록
+    # 상품 순번만큼 큰 값을 더해 한 번의 accumulate로 계산한다.
+    offset = groups * (int(prices.max()) + 1)
+    running_high = np.maximum.accumulate(prices + offset) - offset
+    drawdowns = (prices - running_high) / np.maximum(running_high, 1) * 100
+    max_drawdown = np.minimum.reduceat(drawdowns, starts)
+
+    low_at_text = format_timestamps(low_at)
+    high_at_text = format_timestamps(high_at)
+    first_text = format_timestamps(timestamps[starts])
+    last_text = format_timestamps(timestamps[ends - 1])
+
+    results = []
+    for i in range(len(starts)):
+        results.append({
+            'product_id': int(product_ids[starts[i]]),
+            'points': int(counts[i]),
+            'first_logged_at': first_text[i],
+            'last_logged_at': last_text[i],
+            'current_price': int(current[i]),
+            'all_time_low': int(low[i]),
+            'all_time_low_at': low_at_text[i],
+            'all_time_high': int(high[i]),
+            'all_time_high_at': high_at_text[i],
+            'moving_average': {f'{days}d': int(round(moving_averages[days][i])) for days in MOVING_AVERAGE_DAYS},
+            f'median_{MEDIAN_WINDOW_DAYS}d': int(median[i]),
+            f'percent_off_median_{MEDIAN_WINDOW_DAYS}d': round(float(percent_off_median[i]), 2),
+            f'volatility_{MEDIAN_WINDOW_DAYS}d': round(float(volatility[i]), 4),
+            'drawdown': round(float(drawdowns[ends[i] - 1]), 2),
+            'max_drawdown': round(float(max_drawdown[i]), 2),
+        })
+    return results
+
+def product_price_stats(conn, product_id):
+    """상품 하나의 가격 통계 (이력이 없으면 None)"""
+    version = conn.execute('SELECT MAX(id) FROM price_logs WHERE product_id = ?', (product_id,)).fetchone()[0]
+
+    def load():
+        timestamps, prices = load_price_history(conn, product_id)
+        results = compute_price_stats(np.full(len(prices), product_id, dtype=np.int64), timestamps, prices)
+        return results[0] if results else None
+
+    return _get_versioned(('product', product_id), version, load)
+
+def all_product_price_stats(conn):
+    """추적 중인 모든 상품의 가격 통계 (상품 id 순)"""
+    version = conn.execute('SELECT MAX(id) FROM price_logs').fetchone()[0]
+
+    def load():
+        return compute_price_stats(*load_all_price_history(conn))
+
+    return _get_versioned('all', version, load)
+
+def top_deals(conn, limit=DEFAULT_DEALS, by='low', min_points=2):
+    """현재가가 역대 최저가(또는 평균가)에 가까운 상품 상위 limit개
+
+    가격 요약 테이블의 비율 인덱스 순으로 읽다가 limit개를 채우면 멈추므로
+    상품 수와 관계없이 빠르다. 이력이 min_points개 미만인 상품은 뺀다.
+    """
+    rows = conn.execute(f'''
+        SELECT s.product_id, p.name, p.url, p.image_url, p.brand,
+               s.current_price, s.min_price, s.max_price,
+               s.price_sum * 1.0 / s.points AS average_price,
+               s.points, s.last_logged_at, s.low_ratio, s.avg_ratio
+        FROM product_price_summary s
+        JOIN products p ON p.id = s.product_id
+        WHERE s.points >= ?
+        ORDER BY {DEAL_RANKINGS[by]}
+        LIMIT ?
+    ''', (min_points, limit)).fetchall()
+
+    return [{
+        'product_id': row['product_id'],
+        'name': row['name'],
+        'url': row['url'],
+        'image_url': row['image_url'],
+        'brand': row['brand'],
+        'current_price': row['current_price'],
+        'all_time_low': row['min_price'],
+        'all_time_high': row['max_price'],
+        'average_price': int(round(row['average_price'])),
+        'points': row['points'],
+        'last_logged_at': row['last_logged_at'],
+        'percent_above_low': round((row['low_ratio'] - 1) * 100, 2),
+        'percent_vs_average': round((row['avg_ratio'] - 1) * 100, 2),
+    } for row in rows]
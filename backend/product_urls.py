@@ -0,0 +1,19 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 상품 URL 정규화 (DB 마이그레이션과 크롤러가 함께 쓰므로 표준 라이브러리만 사용)
+
+def normalize_product_url(url):
+    """같은 상품을 가리키는 URL을 하나의 형태로 정규화
+
+    SSG 상품 페이지는 itemId만 남기고 추적용 파라미터(ckwhere 등)를 버린다.
+    그 외 URL은 호스트를 소문자로, 쿼리를 정렬하고 fragment를 제거한다.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    netloc = parts.netloc.lower()
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if netloc.endswith('ssg.com') and parts.path.endswith('itemView.ssg'):
+        query = [(key, value) for key, value in query if key == 'itemId']
+
+    return urlunsplit((scheme, netloc, parts.path, urlencode(sorted(query)), ''))
@@ -1,71 +1,447 @@
+import os
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from queue import Queue, Empty
+from urllib.parse import urlparse
 from database import get_db_connection
 from crawler import crawl_ssg_product
-from notification import check_price_alerts
+from notification import check_price_alerts, check_price_alerts_for_products, ALERT_SWEEP_INTERVAL
+from events import publish
+from jobs import JobScheduler
+from crawl_queue import get_crawl_queue, default_worker_id, PRODUCT_REFRESH_COLUMNS
+from price_history import compact_price_logs, PRICE_LOG_RAW_DAYS, PRICE_LOG_COMPACT_INTERVAL
 
-def update_product_prices():
-    """모든 상품의 가격을 업데이트"""
-    conn = get_db_connection()
-    products = conn.execute('SELECT * FROM products').fetchall()
-    
-    for product in products:
-        try:
-            # 상품 정보 크롤링
-            product_info = crawl_ssg_product(product['url'])
-            if product_info and product_info['price'] > 0:
-                new_price = product_info['price']
-                
-                # 가격이 변경된 경우에만 업데이트
-                if new_price != product['current_price']:
-                    # 상품 현재 가격 업데이트
-                    conn.execute(
-                        'UPDATE products SET current_price = ? WHERE id = ?',
-                        (new_price, product['id'])
-                    )
-                    
-                    # 가격 이력 추가
-                    conn.execute(
-                        'INSERT INTO price_logs (product_id, price) VALUES (?, ?)',
-                        (product['id'], new_price)
-                    )
-                    
-                    print(f"상품 '{product['name']}' 가격 업데이트: {product['current_price']} → {new_price}")
-                
-        except Exception as e:
-            print(f"상품 '{product['name']}' 가격 업데이트 실패: {e}")
-    
-    conn.commit()
-    conn.close()
-
-def price_monitoring_scheduler():
-    """가격 모니터링 스케줄러"""
-    while True:
+# 가격 갱신 동시성 설정
+REFRESH_MAX_WORKERS = int(os.environ.get('REFRESH_MAX_WORKERS', 16))
+REFRESH_PER_HOST_LIMIT = int(os.environ.get('REFRESH_PER_HOST_LIMIT', 8))
+
+# 가격 갱신 결과 기록: WRITE_BATCH_SIZE개가 모이거나 첫 결과가
+# WRITE_FLUSH_MS 동안 기다리면 짧은 트랜잭션 하나로 커밋한다
+WRITE_BATCH_SIZE = int(os.environ.get('WRITE_BATCH_SIZE', 100))
+WRITE_FLUSH_MS = int(os.environ.get('WRITE_FLUSH_MS', 250))
+
+# 가격 갱신 주기: 스케줄러는 REFRESH_TICK초마다 next_check_at이 지난 상품을
+# 오래 밀린 순으로 최대 REFRESH_BATCH_SIZE개 꺼내 크롤링한다.
+# 다음 확인 시각은 상품별 refresh_interval이 있으면 그 값, 없으면 가격
+# 변동성/최근성으로 ADAPTIVE_MIN_INTERVAL ~ ADAPTIVE_MAX_INTERVAL 사이에서 정한다.
+REFRESH_TICK = int(os.environ.get('REFRESH_TICK', 60))
+REFRESH_BATCH_SIZE = int(os.environ.get('REFRESH_BATCH_SIZE', 500))
+ADAPTIVE_MIN_INTERVAL = int(os.environ.get('ADAPTIVE_MIN_INTERVAL', 300))
+ADAPTIVE_MAX_INTERVAL = int(os.environ.get('ADAPTIVE_MAX_INTERVAL', 86400))
+VOLATILITY_WINDOW_DAYS = 30
+CHECKS_PER_CHANGE = 4        # 평균 변동 간격 동안 확인할 횟수
+HIGH_VOLATILITY = 0.05       # 가격 변동계수가 이보다 크면 더 자주 확인
+MIN_REFRESH_INTERVAL = 60
+# 0이면 API 프로세스는 가격 갱신을 하지 않는다 (crawl_worker.py 프로세스들이 맡음)
+REFRESH_IN_PROCESS = os.environ.get('REFRESH_IN_PROCESS', '1') == '1'
+
+class HostConcurrencyLimiter:
+    """호스트별 동시 요청 수 제한"""
+
+    def __init__(self, per_host_limit):
+        self.per_host_limit = per_host_limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_semaphore(self, host):
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._semaphores[host] = semaphore
+            return semaphore
+
+    @contextmanager
+    def acquire(self, url):
+        semaphore = self._get_semaphore(urlparse(url).netloc)
+        with semaphore:
+            yield
+
+def _percentile(sorted_values, percent):
+    """정렬된 값 목록에서 백분위수 계산 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(percent / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+def _fetch_product(product, limiter):
+    """작업 스레드에서 상품 하나를 크롤링하고 소요 시간을 함께 반환"""
+    with limiter.acquire(product['url']):
+        started = time.perf_counter()
+        product_info = crawl_ssg_product(
+            product['url'],
+            etag=product['etag'],
+            last_modified=product['last_modified']
+        )
+        elapsed = time.perf_counter() - started
+    return product, product_info, elapsed
+
+def compute_refresh_interval(changes, window_sec, since_last_change_sec, volatility):
+    """가격 변동 이력으로 다음 확인까지의 간격(초) 계산
+
+    changes: 최근 window_sec 동안 기록된 가격 변경 수 (등록 시 첫 기록 포함)
+    since_last_change_sec: 마지막 변경 후 지난 시간 (변경이 없으면 None)
+    volatility: 그 기간 가격의 변동계수 (표준편차 / 평균)
+
+    평균 변동 간격의 1/CHECKS_PER_CHANGE마다 확인하되, 최근에 바뀌었거나
+    변동 폭이 큰 상품은 절반으로 줄인다. 바뀌지 않는 상품일수록 간격이 늘어난다.
+    """
+    if changes <= 0 or window_sec <= 0:
+        return ADAPTIVE_MAX_INTERVAL
+
+    mean_gap = window_sec / changes
+    interval = mean_gap / CHECKS_PER_CHANGE
+    if since_last_change_sec is not None and since_last_change_sec < mean_gap:
+        interval /= 2
+    if volatility > HIGH_VOLATILITY:
+        interval /= 2
+    return int(min(max(interval, ADAPTIVE_MIN_INTERVAL), ADAPTIVE_MAX_INTERVAL))
+
+def _next_check_intervals(conn, product_ids):
+    """상품별 다음 확인 간격 {상품 id: 초}. refresh_interval이 지정된 상품은 그 값."""
+    intervals = {}
+    window_sec = VOLATILITY_WINDOW_DAYS * 86400
+    for start in range(0, len(product_ids), 500):
+        chunk = product_ids[start:start + 500]
+        rows = conn.execute(f'''
+            SELECT p.id, p.refresh_interval,
+                   CAST(strftime('%s', 'now') AS INTEGER) AS now,
+                   CAST(strftime('%s', p.created_at) AS INTEGER) AS created,
+                   COUNT(l.id) AS changes,
+                   MAX(CAST(strftime('%s', l.logged_at) AS INTEGER)) AS last_change,
+                   AVG(l.price) AS mean_price,
+                   AVG(l.price * l.price) AS mean_square
+            FROM products p
+            LEFT JOIN price_logs l
+              ON l.product_id = p.id AND l.logged_at >= datetime('now', '-{VOLATILITY_WINDOW_DAYS} days')
+            WHERE p.id IN ({', '.join('?' * len(chunk))})
+            GROUP BY p.id
+        ''', chunk).fetchall()
+
+        for row in rows:
+            if row['refresh_interval']:
+                intervals[row['id']] = row['refresh_interval']
+                continue
+            # 등록된 지 얼마 안 된 상품은 등록 이후 기간으로 변동률을 계산
+            window = min(window_sec, max(row['now'] - (row['created'] or row['now']), REFRESH_TICK))
+            volatility = 0.0
+            if row['mean_price']:
+                variance = max(row['mean_square'] - row['mean_price'] ** 2, 0.0)
+                volatility = variance ** 0.5 / row['mean_price']
+            since_last_change = row['now'] - row['last_change'] if row['last_change'] else None
+            intervals[row['id']] = compute_refresh_interval(row['changes'], window, since_last_change, volatility)
+    return intervals
+
+class PriceWriter:
+    """크롤링 결과를 모아 짧은 트랜잭션으로 나눠 기록하는 쓰기 단계
+
+    결과가 batch_size개 모이거나 첫 결과가 flush_ms만큼 기다리면 한 배치를
+    executemany로 쓰고 바로 커밋한다. 쓰기 잠금은 배치를 쓰는 동안만 잡고,
+    배치 하나가 실패해도 앞서 커밋한 배치는 남는다 (실패한 배치의 상품은
+    리스가 끝나면 다시 확인 대상이 된다). 커밋 후 그 배치의 가격 변경을
+    알리고 알림을 확인한다.
+    """
+
+    def __init__(self, conn, queue, worker_id, batch_size=None, flush_ms=None):
+        self.conn = conn
+        self.queue = queue
+        self.worker_id = worker_id
+        self.batch_size = batch_size or WRITE_BATCH_SIZE
+        self.flush_sec = (flush_ms if flush_ms is not None else WRITE_FLUSH_MS) / 1000
+        self.intervals = {}
+        self.alerts_queued = 0
+        self.failed_products = 0
+        self.batches = 0
+        self.write_failures = 0
+        self.write_ms_total = 0.0
+        self.write_ms_max = 0.0
+        self._reset()
+
+    def _reset(self):
+        self._checked = []
+        self._cache_rows = []
+        self._cache_deletes = []
+        self._changes = []
+        self._first_at = None
+
+    def _mark(self):
+        if self._first_at is None:
+            self._first_at = time.monotonic()
+
+    def add_checked(self, product_id):
+        self._mark()
+        self._checked.append(product_id)
+
+    def add_http_cache(self, product_id, product_info):
+        """다음 조건부 GET에 쓸 ETag/Last-Modified"""
+        self._mark()
+        if not product_info['etag'] and not product_info['last_modified']:
+            self._cache_deletes.append((product_id,))
+        else:
+            self._cache_rows.append((
+                product_id, product_info['etag'], product_info['last_modified'],
+                product_info['content_bytes'], product_info['parse_ms']
+            ))
+
+    def add_price_change(self, change):
+        self._mark()
+        self._changes.append(change)
+
+    def full(self):
+        return len(self._checked) >= self.batch_size
+
+    def next_result(self, results):
+        """results 큐에서 다음 결과를 꺼낸다. 기다리는 동안 flush_ms가 지나면 먼저 기록."""
+        while True:
+            timeout = None
+            if self._first_at is not None:
+                timeout = max(0.0, self._first_at + self.flush_sec - time.monotonic())
+            try:
+                return results.get(timeout=timeout)
+            except Empty:
+                self.flush()
+
+    def flush(self):
+        """모인 결과를 한 트랜잭션으로 기록"""
+        if self._first_at is None:
+            return
+        checked, changes = self._checked, self._changes
+        conn = self.conn
+        started = time.perf_counter()
         try:
-            print("가격 업데이트 시작...")
-            update_product_prices()
-            
-            print("알림 체크 시작...")
-            check_price_alerts()
-            
-            print("다음 업데이트까지 대기 중... (30분)")
-            time.sleep(1800)  # 30분마다 실행
-            
+            conn.executemany(
+                '''INSERT OR REPLACE INTO product_http_cache
+                   (product_id, etag, last_modified, content_bytes, parse_ms, updated_at)
+                   VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''',
+                self._cache_rows
+            )
+            conn.executemany('DELETE FROM product_http_cache WHERE product_id = ?', self._cache_deletes)
+            conn.executemany(
+                'UPDATE products SET current_price = ? WHERE id = ?',
+                [(change['price'], change['product_id']) for change in changes]
+            )
+            conn.executemany(
+                'INSERT INTO price_logs (product_id, price) VALUES (?, ?)',
+                [(change['product_id'], change['price']) for change in changes]
+            )
+            intervals = _next_check_intervals(conn, checked)
+            self.queue.complete(conn, self.worker_id, intervals)
+            conn.commit()
         except Exception as e:
-            print(f"스케줄러 오류: {e}")
-            time.sleep(300)  # 오류 시 5분 후 재시도
+            conn.rollback()
+            self.write_failures += 1
+            self.failed_products += len(checked)
+            print(f"가격 갱신 결과 {len(checked)}개 기록 실패: {e}")
+            self._reset()
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.batches += 1
+        self.write_ms_total += elapsed_ms
+        self.write_ms_max = max(self.write_ms_max, elapsed_ms)
+        self.intervals.update(intervals)
+        self._reset()
+
+        # 커밋된 뒤에 알려야 구독자가 다시 읽을 때 새 값이 보인다
+        logged_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        for change in changes:
+            publish('price_changed', dict(change, logged_at=logged_at))
+
+        # 가격이 바뀐 상품의 알림만 확인해 발송 큐에 넣는다
+        if changes:
+            self.alerts_queued += check_price_alerts_for_products(
+                {change['product_id']: change['price'] for change in changes}
+            )
+
+def update_product_prices(max_workers=None, per_host_limit=None, due_only=False, stop_event=None,
+                          batch_size=None, worker_id=None, queue=None):
+    """상품 가격을 업데이트
+
+    due_only면 가격 확인 작업 큐(crawl_queue)에서 확인할 때가 된 상품을
+    오래 밀린 순으로 최대 batch_size개(기본 REFRESH_BATCH_SIZE) 리스로
+    선점해 갱신하고, 아니면 모든 상품을 갱신한다. 확인한 상품은 변동성에
+    따라 다음 확인 시각을 다시 정한다. 크롤링은 스레드 풀에서 병렬로
+    수행하고, 결과는 큐로 받아 호출 스레드의 PriceWriter가 작은 배치로
+    나눠 커밋한다 (DB 쓰기는 이 스레드에서만).
+    stop_event가 설정되면 아직 시작하지 않은 크롤링은 취소하고 큐에 돌려놓는다.
+    갱신 통계(dict)를 반환한다.
+    """
+    max_workers = max_workers or REFRESH_MAX_WORKERS
+    limiter = HostConcurrencyLimiter(per_host_limit or REFRESH_PER_HOST_LIMIT)
+    queue = queue or get_crawl_queue()
+    worker_id = worker_id or default_worker_id()
+
+    conn = get_db_connection()
+    # 크롤링이나 기록 중 예외가 나도 연결 체크아웃을 돌려놓는다 (커밋 전 작업은 롤백)
+    try:
+        due_backlog = 0
+        max_overdue_sec = 0.0
+        if due_only:
+            due_backlog, max_overdue_sec = queue.backlog(conn)
+            products = queue.claim(conn, worker_id, batch_size or REFRESH_BATCH_SIZE)
+        else:
+            products = conn.execute(PRODUCT_REFRESH_COLUMNS).fetchall()
+
+        pass_started = time.perf_counter()
+        latencies = []
+        updated = 0
+        failed = 0
+        not_modified = 0
+        bytes_downloaded = 0
+        bytes_saved = 0
+        parse_ms = 0.0
+        parse_ms_saved = 0.0
+        cancelled_ids = []
+        cancelled = 0
+        writer = PriceWriter(conn, queue, worker_id)
+        results = Queue()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for product in products:
+                future = executor.submit(_fetch_product, product, limiter)
+                futures[future] = product['id']
+                future.add_done_callback(results.put)
+
+            for _ in range(len(futures)):
+                future = writer.next_result(results)
+                if stop_event is not None and stop_event.is_set() and not cancelled:
+                    # 종료 요청: 대기 중인 크롤링을 취소하고 이미 받은 결과만 저장
+                    cancelled = sum(other.cancel() for other in futures)
+                    if cancelled:
+                        print(f"종료 요청으로 상품 {cancelled}개 갱신을 취소합니다")
+                if future.cancelled():
+                    cancelled_ids.append(futures[future])
+                    continue
+
+                try:
+                    product, product_info, elapsed = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"상품 크롤링 작업 실패: {e}")
+                    continue
+
+                latencies.append(elapsed)
+                # 실패한 상품도 다음 주기까지 미룬다 (매 틱마다 재시도하지 않도록)
+                writer.add_checked(product['id'])
+
+                if product_info and product_info['not_modified']:
+                    # 304: 본문 다운로드와 파싱을 모두 건너뜀
+                    not_modified += 1
+                    bytes_saved += product['content_bytes'] or 0
+                    parse_ms_saved += product['parse_ms'] or 0.0
+                elif not product_info or product_info['price'] <= 0:
+                    failed += 1
+                else:
+                    bytes_downloaded += product_info['content_bytes']
+                    parse_ms += product_info['parse_ms']
+                    writer.add_http_cache(product['id'], product_info)
+
+                    # 가격이 변경된 경우에만 업데이트
+                    new_price = product_info['price']
+                    if new_price != product['current_price']:
+                        updated += 1
+                        writer.add_price_change({
+                            'product_id': product['id'],
+                            'name': product['name'],
+                            'price': new_price,
+                            'previous_price': product['current_price'],
+                        })
+                        print(f"상품 '{product['name']}' 가격 업데이트: {product['current_price']} → {new_price}")
+
+                if writer.full():
+                    writer.flush()
+
+        writer.flush()
+        queue.release(conn, worker_id, cancelled_ids)
+        conn.commit()
+    finally:
+        conn.close()
+    failed += writer.failed_products
+    intervals = writer.intervals
+    alerts_queued = writer.alerts_queued
+
+    elapsed_total = time.perf_counter() - pass_started
+    latencies.sort()
+    stats = {
+        'products': len(products),
+        'cancelled': cancelled,
+        'due_backlog': due_backlog,
+        'max_overdue_sec': max_overdue_sec,
+        'avg_next_interval_sec': round(sum(intervals.values()) / len(intervals)) if intervals else None,
+        'updated': updated,
+        'failed': failed,
+        'not_modified': not_modified,
+        'alerts_queued': alerts_queued,
+        'write_batches': writer.batches,
+        'write_failures': writer.write_failures,
+        'write_ms_avg': round(writer.write_ms_total / writer.batches, 2) if writer.batches else 0.0,
+        'write_ms_max': round(writer.write_ms_max, 2),
+        'bytes_downloaded': bytes_downloaded,
+        'bytes_saved': bytes_saved,
+        'parse_ms': round(parse_ms, 1),
+        'parse_ms_saved': round(parse_ms_saved, 1),
+        'elapsed_sec': round(elapsed_total, 3),
+        'throughput_per_sec': round(len(products) / elapsed_total, 2) if elapsed_total > 0 else 0.0,
+        'latency_p50_ms': round(_percentile(latencies, 50) * 1000, 1),
+        'latency_p95_ms': round(_percentile(latencies, 95) * 1000, 1),
+        'latency_p99_ms': round(_percentile(latencies, 99) * 1000, 1),
+        'latency_max_ms': round(latencies[-1] * 1000, 1) if latencies else 0.0,
+    }
+    print(
+        f"가격 업데이트 완료: {stats['products']}개 중 {stats['updated']}개 변경, "
+        f"{stats['failed']}개 실패, {stats['throughput_per_sec']}개/초, "
+        f"p95 {stats['latency_p95_ms']}ms, p99 {stats['latency_p99_ms']}ms"
+    )
+    if not_modified:
+        print(
+            f"변경 없음(304) {not_modified}개: {bytes_saved:,} bytes, "
+            f"파싱 {stats['parse_ms_saved']}ms 절약"
+        )
+    return stats
+
+def _compact_price_logs(raw_days):
+    conn = get_db_connection()
+    try:
+        return compact_price_logs(conn, raw_days)
+    finally:
+        conn.close()
 
-def start_scheduler():
-    """스케줄러 시작"""
-    thread = threading.Thread(target=price_monitoring_scheduler, daemon=True)
-    thread.start()
-    print("가격 모니터링 스케줄러가 시작되었습니다.")
+def create_job_scheduler():
+    """가격 갱신과 알림 재확인을 예약한 JobScheduler 생성 (시작은 호출자가)"""
+    job_scheduler = JobScheduler()
+    if REFRESH_IN_PROCESS:
+        job_scheduler.add_job(
+            'price_refresh',
+            lambda stop_event: update_product_prices(due_only=True, stop_event=stop_event),
+            REFRESH_TICK
+        )
+    # 정비 작업은 시작 직후 갱신과 겹치지 않도록 첫 실행을 한 주기 미룬다
+    job_scheduler.add_job(
+        'alert_sweep',
+        lambda stop_event: check_price_alerts(),
+        ALERT_SWEEP_INTERVAL,
+        delay_first_run=True
+    )
+    # 변동성 계산이 price_logs만 읽으므로 그 기간은 압축하지 않는다
+    job_scheduler.add_job(
+        'price_log_compaction',
+        lambda stop_event: _compact_price_logs(max(PRICE_LOG_RAW_DAYS, VOLATILITY_WINDOW_DAYS)),
+        PRICE_LOG_COMPACT_INTERVAL,
+        delay_first_run=True
+    )
+    return job_scheduler
 
 if __name__ == '__main__':
-    start_scheduler()
+    job_scheduler = create_job_scheduler()
+    job_scheduler.start()
     # 메인 스레드 유지
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        print("스케줄러가 종료되었습니다.")
\ No newline at end of file
+        job_scheduler.shutdown()
+        print("스케줄러가 종료되었습니다.")
@@ -0,0 +1,28 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# 테스트가 실제 SSG를 크롤링하는 예약 작업을 띄우거나 속도 제한에 걸리지 않도록
+os.environ.setdefault('SCHEDULER_ENABLED', '0')
+os.environ.setdefault('HOST_RATE_LIMIT', '0')
+
+# app 모듈은 import될 때 init_db()를 부르므로, 테스트 수집 전에 DB 경로를
+# 임시 디렉토리로 돌려 database/ssg_tracker.db를 만들지 않게 한다
+_db_dir = tempfile.mkdtemp(prefix='ssg-tracker-tests-')
+atexit.register(shutil.rmtree, _db_dir, ignore_errors=True)
+os.environ['DATABASE_PATH'] = os.path.join(_db_dir, 'app.db')
+
+import pytest
+
+import database
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """임시 디렉토리의 새 DB (최신 스키마)와 현재 스레드의 연결"""
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    database.init_db()
+    conn = database.get_db_connection()
+    yield conn
+    conn.close()
+    database.close_all_connections()
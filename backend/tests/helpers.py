@@ -0,0 +1,338 @@
+"""
+테스트와 성능 측정 스크립트(benchmark.py)가 함께 쓰는 로컬 스텁 서버와 데이터 준비 함수
+실제 SSG/SMTP 대신 이 서버들에 요청을 보낸다.
+"""
+
+import random
+import re
+import smtplib
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import database
+
+PRODUCT_PAGE_TEMPLATE = '''<html><head><title>{name} - SSG.COM</title></head>
+<body>
+<div class="cdtl_img_wrap"><img src="//sitem.ssgcdn.com/{item_id}.jpg"></div>
+<h2 class="cdtl_prd_nm">{name}</h2>
+<div class="cdtl_price"><em class="ssg_price">{price_text}</em><span class="blind">{price_text}</span>원</div>
+</body></html>'''
+
+def render_product_page(item_id, price):
+    """스텁 서버가 돌려줄 상품 페이지 HTML"""
+    return PRODUCT_PAGE_TEMPLATE.format(
+        item_id=item_id,
+        name=f"벤치마크 상품 {item_id}",
+        price_text=f"{price:,}",
+    )
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+class StubSSGServer:
+    """상품 페이지를 흉내 내는 로컬 HTTP 서버
+
+    fail_items의 상품은 404를 돌려준다. max_active는 동시에 처리 중이던
+    요청 수의 최댓값 (호스트별 동시 요청 제한 확인용).
+    """
+
+    def __init__(self, latency=0.0, etag=False, fail_items=()):
+        self.latency = latency
+        self.etag = etag
+        self.fail_items = {str(item_id) for item_id in fail_items}
+        self.request_count = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    self._respond()
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def _respond(self):
+                if stub.latency:
+                    threading.Event().wait(stub.latency)
+                item_id = self.path.rsplit('=', 1)[-1]
+                if item_id in stub.fail_items:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                if stub.etag:
+                    # 가격이 고정된 페이지: ETag가 같으면 304
+                    price = (hash(item_id) % 490 + 10) * 1000
+                    etag = f'"{item_id}-{price}"'
+                    if self.headers.get('If-None-Match') == etag:
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.send_header('Content-Length', '0')
+                        self.end_headers()
+                        return
+                else:
+                    price = random.randint(10, 500) * 1000
+                body = render_product_page(item_id, price).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                if stub.etag:
+                    self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _StubHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def product_url(self, item_id):
+        return f"{self.base_url}/item/itemView.ssg?itemId={item_id}"
+
+class StubSearchServer:
+    """SSG 검색 결과 페이지를 흉내 내는 로컬 HTTP 서버
+
+    page번째 페이지는 per_page개 상품을 돌려주고, 앞 페이지의 마지막
+    overlap개 상품이 다음 페이지 앞에 다시 나온다 (페이지 간 중복 흉내).
+    """
+
+    def __init__(self, per_page=40, overlap=5, latency=0.3):
+        self.per_page = per_page
+        self.overlap = overlap
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.latency:
+                    threading.Event().wait(stub.latency)
+                page = int(re.search(r'page=(\d+)', self.path).group(1))
+                body = stub.render_page(page).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _StubHTTPServer(('127.0.0.1', 0), Handler)
+        self.search_url = f"http://127.0.0.1:{self.server.server_address[1]}/search.ssg"
+
+    def item_ids(self, page):
+        first = (page - 1) * (self.per_page - self.overlap)
+        return range(first, first + self.per_page)
+
+    def render_page(self, page):
+        items = ''.join(
+            f'<li><div class="thmb"><img src="//sitem.ssgcdn.com/{item_id}.jpg"></div>'
+            f'<a href="/item/itemView.ssg?itemId={item_id}">벤치마크 검색 상품 {item_id}</a>'
+            f'<em class="ssg_price">{(item_id % 90 + 10) * 1000:,}</em>원</li>'
+            for item_id in self.item_ids(page)
+        )
+        return f'<html><body><ul>{items}</ul></body></html>'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class ThrottlingStubServer:
+    """초당 capacity개까지만 받아 주는 로컬 HTTP 서버
+
+    서버 쪽 토큰 버킷이 비면 429를 돌려주고(retry_after가 있으면 Retry-After
+    헤더 포함), 동시에 처리 중인 요청이 많을수록 응답이 느려진다
+    (과부하 시 지연 급증 흉내).
+    """
+
+    def __init__(self, capacity, burst=None, latency=0.02, retry_after=None):
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.burst = burst or capacity
+        self.latency = latency
+        self.accepted = 0
+        self.throttled = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    now = time.monotonic()
+                    stub._tokens = min(stub.burst, stub._tokens + (now - stub._updated) * stub.capacity)
+                    stub._updated = now
+                    allowed = stub._tokens >= 1
+                    if allowed:
+                        stub._tokens -= 1
+                        stub.accepted += 1
+                        stub._active += 1
+                        active = stub._active
+                    else:
+                        stub.throttled += 1
+
+                if not allowed:
+                    self.send_response(429)
+                    if stub.retry_after:
+                        self.send_header('Retry-After', str(stub.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                time.sleep(stub.latency * (1 + active / 4))
+                body = b'ok'
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub._active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _StubHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class _StubTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+class StubSMTPServer:
+    """메일을 받기만 하는 로컬 SMTP 서버 (aiosmtpd 디버깅 서버 대용)
+
+    connect_latency로 TLS 핸드셰이크 + 로그인 비용을, fail_rate로
+    일시적 오류(451)를 흉내 낸다. 처음 fail_first통은 항상 451로 거절하고,
+    reject의 수신자는 RCPT 단계에서 550으로 거부한다.
+    """
+
+    def __init__(self, connect_latency=0.0, fail_rate=0.0, fail_first=0, reject=()):
+        self.connect_latency = connect_latency
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.reject = set(reject)
+        self.connections = 0
+        self.messages = 0
+        self.recipients = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(f"{line}\r\n".encode())
+
+            def handle(self):
+                with stub._lock:
+                    stub.connections += 1
+                if stub.connect_latency:
+                    time.sleep(stub.connect_latency)
+                self.reply('220 stub ESMTP')
+                recipients = []
+                for raw in self.rfile:
+                    command = raw.decode(errors='replace').strip()
+                    verb = command[:4].upper()
+                    if verb in ('EHLO', 'HELO'):
+                        self.reply('250 stub')
+                    elif verb == 'MAIL':
+                        recipients = []
+                        self.reply('250 OK')
+                    elif verb == 'RCPT':
+                        recipient = command.split(':', 1)[1].strip(' <>')
+                        if recipient in stub.reject:
+                            self.reply('550 No such user')
+                            continue
+                        recipients.append(recipient)
+                        self.reply('250 OK')
+                    elif verb == 'DATA':
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        for line in self.rfile:
+                            if line in (b'.\r\n', b'.\n'):
+                                break
+                        with stub._lock:
+                            fail = stub.fail_first > 0 or random.random() < stub.fail_rate
+                            stub.fail_first = max(0, stub.fail_first - 1)
+                        if fail:
+                            self.reply('451 Temporary failure')
+                            continue
+                        with stub._lock:
+                            stub.messages += 1
+                            stub.recipients.extend(recipients)
+                        self.reply('250 OK queued')
+                    elif verb in ('RSET', 'NOOP'):
+                        self.reply('250 OK')
+                    elif verb == 'QUIT':
+                        self.reply('221 Bye')
+                        break
+                    else:
+                        self.reply('502 Command not implemented')
+
+        self.server = _StubTCPServer(('127.0.0.1', 0), Handler)
+        self.host, self.port = self.server.server_address
+
+    def connect(self):
+        return smtplib.SMTP(self.host, self.port, timeout=10)
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def seed_products(urls, price=1000):
+    """상품 행을 한 번에 추가"""
+    conn = database.get_db_connection()
+    conn.executemany(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        [(f"벤치마크 상품 {i}", url, price) for i, url in enumerate(urls)]
+    )
+    conn.commit()
+    conn.close()
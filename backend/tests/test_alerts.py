@@ -0,0 +1,19 @@
+import app as app_module
+
+def test_create_alert_checks_inline_without_product_jobs(db, monkeypatch):
+    checked = []
+    monkeypatch.setattr(app_module, 'check_price_alerts_for_products',
+                        lambda product_prices: checked.append(product_prices) or 1)
+    product_id = db.execute(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        ('상품', 'https://www.ssg.com/item/itemView.ssg?itemId=1', 9000)
+    ).lastrowid
+    db.commit()
+    jobs_before = len(app_module.job_manager._jobs)
+
+    response = app_module.app.test_client().post(
+        '/api/alerts', json={'product_id': product_id, 'email': 'user@example.com', 'target_price': 10000}
+    )
+    assert response.get_json()['queued'] == 1
+    assert checked == [{product_id: 9000}]
+    assert len(app_module.job_manager._jobs) == jobs_before
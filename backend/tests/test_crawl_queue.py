@@ -0,0 +1,33 @@
+import app as app_module
+from tests.helpers import seed_products
+from crawl_queue import SQLiteCrawlQueue
+
+def test_complete_skips_products_leased_by_another_worker(db):
+    seed_products([f'http://127.0.0.1:1/item/{i}' for i in range(2)])
+    queue = SQLiteCrawlQueue(lease_sec=0)
+    first = [row['id'] for row in queue.claim(db, 'worker-a', 2)]
+    # 리스가 바로 끝나 worker-b가 다시 가져간 뒤 worker-a가 늦게 완료
+    assert [row['id'] for row in queue.claim(db, 'worker-b', 2)] == first
+    queue.complete(db, 'worker-a', {product_id: 3600 for product_id in first})
+    db.commit()
+    rows = db.execute('SELECT lease_owner, last_checked_at FROM products').fetchall()
+    assert [(row['lease_owner'], row['last_checked_at']) for row in rows] == [('worker-b', None)] * 2
+
+def test_patch_refresh_interval_reschedules_queue(db, monkeypatch):
+    class RecordingQueue(SQLiteCrawlQueue):
+        def __init__(self):
+            super().__init__()
+            self.rescheduled = []
+
+        def reschedule(self, conn, product_id):
+            self.rescheduled.append(product_id)
+
+    queue = RecordingQueue()
+    monkeypatch.setattr(app_module, 'get_crawl_queue', lambda: queue)
+    seed_products(['http://127.0.0.1:1/item/0'])
+    product_id = db.execute('SELECT id FROM products').fetchone()[0]
+    client = app_module.app.test_client()
+
+    assert client.patch(f'/api/products/{product_id}', json={'refresh_interval': 600}).status_code == 200
+    assert client.patch('/api/products/999999', json={'refresh_interval': 600}).status_code == 404
+    assert queue.rescheduled == [product_id]
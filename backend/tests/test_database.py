@@ -0,0 +1,101 @@
+import os
+import sqlite3
+
+import database
+
+INIT_SQL = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'init.sql')
+
+def _legacy_db(tmp_path, monkeypatch, version):
+    """version까지만 마이그레이션한 DB"""
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(tmp_path / 'legacy.db'))
+    conn = database.get_db_connection()
+    database.migrate(conn, version)
+    return conn
+
+def _insert_duplicates(conn):
+    urls = [
+        'https://www.ssg.com/item/itemView.ssg?itemId=1000&ckwhere=a',
+        'https://www.ssg.com/item/itemView.ssg?itemId=1000&ckwhere=a',
+        'https://WWW.SSG.COM/item/itemView.ssg?ckwhere=b&itemId=1000',
+        'https://www.ssg.com/item/itemView.ssg?itemId=2000',
+    ]
+    ids = []
+    for i, url in enumerate(urls):
+        ids.append(conn.execute(
+            'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)', (f'상품 {i}', url, 10000 + i)
+        ).lastrowid)
+        conn.execute(
+            "INSERT INTO price_logs (product_id, price, logged_at) VALUES (?, ?, datetime('now', ?))",
+            (ids[-1], 10000 + i, f'-{10 - i} hours')
+        )
+        conn.execute(
+            'INSERT INTO alerts (product_id, user_email, target_price) VALUES (?, ?, ?)',
+            (ids[-1], f'user{i}@example.com', 9000)
+        )
+    conn.commit()
+    return ids
+
+def test_migration_merges_products_with_equivalent_urls(tmp_path, monkeypatch):
+    conn = _legacy_db(tmp_path, monkeypatch, 3)
+    ids = _insert_duplicates(conn)
+    try:
+        database.migrate(conn)
+        products = conn.execute('SELECT id, url FROM products ORDER BY id').fetchall()
+        assert [(row['id'], row['url']) for row in products] == [
+            (ids[0], 'https://www.ssg.com/item/itemView.ssg?itemId=1000'),
+            (ids[3], 'https://www.ssg.com/item/itemView.ssg?itemId=2000'),
+        ]
+        logs = conn.execute(
+            'SELECT COUNT(*) FROM price_logs WHERE product_id = ?', (ids[0],)
+        ).fetchone()[0]
+        alerts = conn.execute(
+            'SELECT COUNT(*) FROM alerts WHERE product_id = ?', (ids[0],)
+        ).fetchone()[0]
+        assert (logs, alerts) == (3, 3)
+        # 현재가는 합친 이력 중 가장 최근 가격 (남는 행에 있던 값이 아니라)
+        current = conn.execute(
+            'SELECT current_price FROM products WHERE id = ?', (ids[0],)
+        ).fetchone()[0]
+        assert current == 10002
+        counter = conn.execute(
+            "SELECT value FROM dashboard_counters WHERE name = 'total_products'"
+        ).fetchone()[0]
+        assert counter == 2
+    finally:
+        conn.close()
+        database.close_all_connections()
+
+def test_late_merge_moves_blocks_and_rebuilds_summary(tmp_path, monkeypatch):
+    # UNIQUE 인덱스 이후에 들어온 ckwhere 변형은 마이그레이션 14가 합친다
+    conn = _legacy_db(tmp_path, monkeypatch, 13)
+    conn.execute('DROP INDEX idx_products_url')
+    ids = _insert_duplicates(conn)
+    from price_history import compact_price_logs, load_price_history
+    compact_price_logs(conn, raw_days=0)
+    try:
+        database.migrate(conn)
+        timestamps, prices = load_price_history(conn, ids[0])
+        assert list(prices) == [10000, 10001, 10002]
+        assert list(timestamps) == sorted(timestamps)
+        summary = conn.execute(
+            'SELECT min_price, max_price, points FROM product_price_summary WHERE product_id = ?', (ids[0],)
+        ).fetchone()
+        assert tuple(summary) == (10000, 10002, 3)
+        # 원본 행이 모두 압축됐으면 요약의 현재가를 쓴다
+        assert conn.execute('SELECT current_price FROM products WHERE id = ?', (ids[0],)).fetchone()[0] == 10002
+        assert conn.execute('SELECT COUNT(*) FROM product_price_summary').fetchone()[0] == 2
+    finally:
+        conn.close()
+        database.close_all_connections()
+
+def test_init_sql_is_generated_from_migrations():
+    with open(INIT_SQL, encoding='utf-8') as f:
+        assert f.read() == database.schema_sql(), 'python database.py --dump-schema로 init.sql을 다시 만드세요'
+
+def test_init_sql_database_needs_no_migration():
+    conn = sqlite3.connect(':memory:')
+    with open(INIT_SQL, encoding='utf-8') as f:
+        conn.executescript(f.read())
+    assert database.migrate(conn) == database.SCHEMA_VERSION
+    assert conn.execute('SELECT COUNT(*) FROM price_logs').fetchone()[0] == 6
+    conn.close()
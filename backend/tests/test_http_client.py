@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+import http_client
+from tests.helpers import ThrottlingStubServer
+from http_client import CrawlerClient, HostRateLimiter, TokenBucket
+
+def test_token_bucket_halves_rate_on_429_and_recovers(monkeypatch):
+    monkeypatch.setattr(http_client, 'RATE_DECREASE_COOLDOWN', 0.0)
+    bucket = TokenBucket(rate=8, burst=8, min_rate=1, adaptive=True)
+
+    bucket.record(429, 0.01)
+    assert bucket.rate == 4
+    bucket.record(503, 0.01)
+    assert bucket.rate == 2
+    for _ in range(5):
+        bucket.record(429, 0.01)
+    assert bucket.rate == 1  # 하한 아래로는 줄지 않는다
+    assert bucket.snapshot()['decreases'] == 7
+
+    # 정상 응답이 이어지면 조금씩(가산) 되돌아간다
+    bucket.last_increase -= 1.0
+    bucket.record(200, 0.01)
+    assert 1 < bucket.rate <= 1 + 8 * http_client.RATE_INCREASE_PER_SEC + 1e-9
+
+def test_token_bucket_cooldown_merges_concurrent_429s():
+    bucket = TokenBucket(rate=8, burst=8, min_rate=1, adaptive=True)
+    for _ in range(5):
+        bucket.record(429, 0.01)
+    assert bucket.rate == 4
+
+def test_fixed_bucket_does_not_adapt():
+    bucket = TokenBucket(rate=8, burst=8, min_rate=1, adaptive=False)
+    bucket.record(429, 0.01)
+    assert bucket.rate == 8
+
+def test_retry_after_pauses_host():
+    bucket = TokenBucket(rate=100, burst=100, min_rate=1, adaptive=True)
+    bucket.record(429, 0.01, retry_after=2)
+    # 멈춘 시간보다 짧게 기다릴 수 있으면 기다리지 않고 바로 포기
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1.5) is None
+    assert time.monotonic() - started < 0.1
+    assert 1.9 <= bucket.acquire(timeout=3) <= 2.1
+
+def test_client_honours_retry_after_from_server():
+    limiter = HostRateLimiter(rate=100, burst=100)
+    with ThrottlingStubServer(capacity=1, burst=1, latency=0.0, retry_after=1) as stub:
+        client = CrawlerClient(max_retries=2, backoff=0.01, rate_limiter=limiter)
+        url = f"{stub.base_url}/item"
+        assert client.get(url).status_code == 200
+
+        started = time.monotonic()
+        response = client.get(url)
+        elapsed = time.monotonic() - started
+        client.close()
+
+    assert response.status_code == 200
+    assert stub.throttled >= 1
+    # 백오프(0.01초)가 아니라 Retry-After(1초)만큼 기다렸다가 다시 보냈다
+    assert elapsed >= 0.9
+    host_stats = next(iter(limiter.stats().values()))
+    assert host_stats['throttled'] >= 1
+    assert host_stats['rate'] < 100
+
+def test_adaptive_limiter_backs_off_against_throttling_server():
+    limiter = HostRateLimiter(rate=50, burst=5, min_rate=1, adaptive=True)
+    with ThrottlingStubServer(capacity=10, burst=5, latency=0.0) as stub:
+        client = CrawlerClient(max_retries=0, rate_limiter=limiter)
+        url = f"{stub.base_url}/item"
+        statuses = [client.get(url).status_code for _ in range(40)]
+        client.close()
+
+    assert 429 in statuses
+    host_stats = next(iter(limiter.stats().values()))
+    assert host_stats['decreases'] >= 1
+    assert host_stats['rate'] < 50
+
+def test_interactive_requests_skip_waiting_background_requests():
+    limiter = HostRateLimiter(rate=10, burst=3, interactive_reserve=1)
+    bucket = limiter._bucket('www.ssg.com')
+    # 백그라운드는 예약분 1개를 남기고 토큰을 다 쓴다
+    assert bucket.acquire() is not None and bucket.acquire() is not None
+    assert bucket.acquire(timeout=0.05) is None
+
+    started = time.monotonic()
+    assert limiter.acquire('www.ssg.com', interactive=True)
+    assert time.monotonic() - started < 0.05
+    assert set(limiter.stats()) == {'www.ssg.com'}
+
+def test_total_rate_stays_under_host_limit_with_interactive_traffic():
+    limiter = HostRateLimiter(rate=20, burst=1, adaptive=False, interactive_reserve=0)
+    sent = []
+    lock = threading.Lock()
+
+    def worker(interactive):
+        for _ in range(5):
+            limiter.acquire('www.ssg.com', interactive)
+            with lock:
+                sent.append((time.monotonic(), interactive))
+
+    threads = [threading.Thread(target=worker, args=(i % 2 == 0,)) for i in range(6)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 30개 = 버스트 1 + 29개를 초당 20개로 → 1.45초 이상
+    assert len(sent) == 30
+    assert time.monotonic() - started >= 1.3
+
+def test_interactive_request_gives_up_on_long_retry_after(monkeypatch):
+    monkeypatch.setattr(http_client, 'INTERACTIVE_MAX_WAIT', 0.5)
+    limiter = HostRateLimiter(rate=100, burst=100)
+    with ThrottlingStubServer(capacity=1, burst=1, latency=0.0, retry_after=30) as stub:
+        client = CrawlerClient(max_retries=3, backoff=0.01, rate_limiter=limiter)
+        url = f"{stub.base_url}/item"
+        assert client.get(url).status_code == 200
+
+        started = time.monotonic()
+        response = client.get(url, interactive=True)
+        assert response.status_code == 429
+        assert time.monotonic() - started < 0.5
+
+        # 호스트가 Retry-After로 멈춘 동안 새 interactive 요청은 기다리지 않고 실패
+        with pytest.raises(http_client.HostThrottled):
+            client.get(url, interactive=True)
+        client.close()
@@ -0,0 +1,28 @@
+from jobs import JobScheduler
+from scheduler import create_job_scheduler, ALERT_SWEEP_INTERVAL, PRICE_LOG_COMPACT_INTERVAL, REFRESH_IN_PROCESS
+
+def test_delay_first_run_waits_one_interval():
+    job_scheduler = JobScheduler(max_workers=1, jitter=0.1)
+    try:
+        job_scheduler.add_job('now', lambda stop_event: None, 100)
+        job_scheduler.add_job('later', lambda stop_event: None, 100, delay_first_run=True)
+        jobs = job_scheduler.stats()['jobs']
+    finally:
+        job_scheduler.shutdown()
+
+    assert jobs['now']['next_run_in_sec'] <= 0.1
+    # 한 주기 ± jitter 뒤
+    assert 89 <= jobs['later']['next_run_in_sec'] <= 110
+
+def test_maintenance_jobs_do_not_run_on_startup():
+    job_scheduler = create_job_scheduler()
+    try:
+        jobs = job_scheduler.stats()['jobs']
+    finally:
+        job_scheduler.shutdown()
+
+    jitter = job_scheduler.jitter
+    assert jobs['alert_sweep']['next_run_in_sec'] >= ALERT_SWEEP_INTERVAL * (1 - jitter) - 1
+    assert jobs['price_log_compaction']['next_run_in_sec'] >= PRICE_LOG_COMPACT_INTERVAL * (1 - jitter) - 1
+    if REFRESH_IN_PROCESS:
+        assert jobs['price_refresh']['next_run_in_sec'] <= 1
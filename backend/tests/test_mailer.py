@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+
+import notification
+from tests.helpers import StubSMTPServer
+from mailer import MailDispatcher
+
+class Recorder:
+    """on_delivered 호출 기록"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, items):
+        with self.lock:
+            self.calls.append((time.monotonic(), [item['to'] for item in items]))
+
+    @property
+    def delivered(self):
+        return [to for _, recipients in self.calls for to in recipients]
+
+@pytest.fixture
+def smtp():
+    with StubSMTPServer() as stub:
+        yield stub
+
+def make_dispatcher(stub, **kwargs):
+    options = {'workers': 1, 'batch_size': 50, 'max_retries': 3, 'backoff': 0.01, 'recipient_interval': 0}
+    options.update(kwargs)
+    return MailDispatcher(session_factory=stub.connect, **options)
+
+def test_session_is_reused_across_messages(smtp):
+    recorder = Recorder()
+    dispatcher = make_dispatcher(smtp, on_delivered=recorder)
+    for i in range(20):
+        dispatcher.enqueue(f'user{i}@example.com', '알림', '본문', key=i)
+    assert dispatcher.join(timeout=10)
+    dispatcher.shutdown()
+
+    assert smtp.messages == 20
+    assert smtp.connections == 1
+    assert dispatcher.stats()['sessions_opened'] == 1
+    assert sorted(recorder.delivered) == sorted(f'user{i}@example.com' for i in range(20))
+
+def test_transient_errors_are_retried(smtp):
+    smtp.fail_first = 2
+    recorder = Recorder()
+    dispatcher = make_dispatcher(smtp, on_delivered=recorder)
+    dispatcher.enqueue('user@example.com', '알림', '본문', key=1)
+    assert dispatcher.join(timeout=10)
+    dispatcher.shutdown()
+
+    stats = dispatcher.stats()
+    assert (stats['sent'], stats['retries'], stats['failed']) == (1, 2, 0)
+    assert recorder.delivered == ['user@example.com']
+
+def test_gives_up_after_max_retries_and_on_refused_recipient():
+    with StubSMTPServer(fail_first=10, reject=['nobody@example.com']) as smtp:
+        recorder = Recorder()
+        dispatcher = make_dispatcher(smtp, on_delivered=recorder, max_retries=2)
+        dispatcher.enqueue('nobody@example.com', '알림', '본문', key=1)
+        dispatcher.enqueue('user@example.com', '알림', '본문', key=2)
+        assert dispatcher.join(timeout=10)
+        dispatcher.shutdown()
+
+    stats = dispatcher.stats()
+    # 수신자 거부는 바로 포기하고, 451은 2번 다시 시도한 뒤 포기
+    assert (stats['sent'], stats['failed'], stats['retries']) == (0, 2, 2)
+    assert recorder.calls == []
+
+def test_duplicate_keys_are_ignored_while_pending(smtp):
+    dispatcher = make_dispatcher(smtp, recipient_interval=0)
+    assert dispatcher.enqueue('user@example.com', '알림', '본문', key=1)
+    assert not dispatcher.enqueue('user@example.com', '알림', '본문', key=1)
+    assert dispatcher.join(timeout=10)
+    dispatcher.shutdown()
+    assert smtp.messages == 1
+
+def test_per_recipient_interval(smtp):
+    recorder = Recorder()
+    dispatcher = make_dispatcher(smtp, on_delivered=recorder, recipient_interval=0.2)
+    for i in range(3):
+        dispatcher.enqueue('user@example.com', '알림', f'본문 {i}', key=i)
+    dispatcher.enqueue('other@example.com', '알림', '본문', key='other')
+    assert dispatcher.join(timeout=10)
+
+    sent_at = [at for at, recipients in recorder.calls for to in recipients if to == 'user@example.com']
+    assert len(sent_at) == 3
+    assert all(later - earlier >= 0.19 for earlier, later in zip(sent_at, sent_at[1:]))
+    assert dispatcher.stats()['rate_limited'] >= 2
+
+    # 간격이 지난 수신자는 다음 발송 때 정리된다
+    time.sleep(1.1)
+    dispatcher.enqueue('third@example.com', '알림', '본문', key='third')
+    assert dispatcher.join(timeout=10)
+    dispatcher.shutdown()
+    assert set(dispatcher._next_allowed) == {'third@example.com'}
+
+class CountingConnection:
+    """commit 횟수를 세는 연결 래퍼"""
+
+    commits = 0
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def commit(self):
+        CountingConnection.commits += 1
+        self._conn.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def test_delivered_alerts_are_deactivated_in_one_commit(db, smtp, monkeypatch):
+    product_id = db.execute(
+        "INSERT INTO products (name, url, current_price) VALUES ('상품', 'https://www.ssg.com/item/itemView.ssg?itemId=1', 1000)"
+    ).lastrowid
+    alert_ids = [
+        db.execute('INSERT INTO alerts (product_id, user_email, target_price) VALUES (?, ?, 2000)',
+                   (product_id, f'user{i}@example.com')).lastrowid
+        for i in range(10)
+    ]
+    db.commit()
+
+    get_connection = notification.get_db_connection
+    monkeypatch.setattr(notification, 'get_db_connection', lambda: CountingConnection(get_connection()))
+    CountingConnection.commits = 0
+    deliveries = []
+
+    def on_delivered(items):
+        deliveries.append(len(items))
+        notification._deactivate_delivered(items)
+
+    dispatcher = make_dispatcher(smtp, on_delivered=on_delivered)
+    # 워커가 첫 메일을 바로 가져가지 않도록 잠근 채로 모두 넣는다
+    with dispatcher._condition:
+        for alert_id in alert_ids:
+            dispatcher.enqueue(f'alert{alert_id}@example.com', '알림', '본문', key=alert_id, meta={'alert_id': alert_id})
+    assert dispatcher.join(timeout=10)
+    dispatcher.shutdown()
+
+    assert deliveries == [10]
+    assert CountingConnection.commits == 1
+    assert db.execute('SELECT COUNT(*) FROM alerts WHERE is_active = 1').fetchone()[0] == 0
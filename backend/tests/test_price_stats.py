@@ -0,0 +1,41 @@
+from price_stats import all_product_price_stats, product_price_stats, stats_cache, top_deals
+
+def _add_product(conn, item_id, prices):
+    product_id = conn.execute(
+        'INSERT INTO products (name, url, current_price) VALUES (?, ?, ?)',
+        (f'상품 {item_id}', f'https://www.ssg.com/item/itemView.ssg?itemId={item_id}', prices[-1])
+    ).lastrowid
+    conn.executemany('INSERT INTO price_logs (product_id, price) VALUES (?, ?)',
+                     [(product_id, price) for price in prices])
+    conn.commit()
+    return product_id
+
+def test_stats_cache_keeps_one_entry_per_key(db):
+    stats_cache.clear()
+    product_id = _add_product(db, 1, [10000, 9000])
+    _add_product(db, 2, [5000])
+
+    for price in range(8000, 8030):
+        db.execute('INSERT INTO price_logs (product_id, price) VALUES (?, ?)', (product_id, price))
+        db.commit()
+        assert all_product_price_stats(db)[0]['current_price'] == price
+        assert product_price_stats(db, product_id)['current_price'] == price
+
+    # 새 가격마다 다시 계산하지만 옛 결과는 같은 키에 덮어써 쌓이지 않는다
+    assert stats_cache.stats()['size'] == 2
+
+def test_stats_cache_hit_without_new_prices(db):
+    stats_cache.clear()
+    product_id = _add_product(db, 1, [10000, 9000])
+    first = product_price_stats(db, product_id)
+    assert product_price_stats(db, product_id) is first
+
+def test_top_deals_orders_by_distance_from_low(db):
+    at_low = _add_product(db, 1, [12000, 10000])
+    above_low = _add_product(db, 2, [8000, 10000])
+    _add_product(db, 3, [5000])  # 이력 1개는 제외
+
+    deals = top_deals(db, limit=10, by='low')
+    assert [deal['product_id'] for deal in deals] == [at_low, above_low]
+    assert deals[0]['percent_above_low'] == 0
+    assert deals[1]['percent_above_low'] == 25
@@ -0,0 +1,73 @@
+import pytest
+
+from crawler import _parse_product_fast, _parse_product_soup, parse_product_page
+
+# SSG 상품 상세 페이지의 가격 영역 마크업 조각: (설명, HTML, 기대 가격, 빠른 경로로 끝나는지)
+# 빠른 경로가 못 읽는 구조는 soup 경로 결과와 같아야 한다
+PRODUCT_PAGE_SNIPPETS = [
+    ('판매가 blind', '''
+<h2 class="cdtl_prd_nm">[농심] 신라면 120g x 5개입</h2>
+<div class="cdtl_price"><em class="ssg_price">4,480</em><span class="blind">4,480</span>원</div>
+''', 4480, True),
+    ('정상가가 판매가보다 우선', '''
+<h2 class="cdtl_prd_nm">애플 아이폰 15 128GB</h2>
+<div class="cdtl_optprice_wrap">
+  <span class="cdtl_old_price"><del><em class="ssg_price">1,550,000</em><span class="blind">1,550,000원</span></del></span>
+  <span class="cdtl_price notranslate"><em class="ssg_price">1,290,000</em><span class="blind">1,290,000원</span></span>
+</div>
+''', 1550000, True),
+    ('가격 영역 안에 같은 태그가 중첩', '''
+<h2 class="cdtl_prd_nm">스타벅스 캡슐커피 10개입</h2>
+<div class="cdtl_price"><div class="cdtl_price_inner"><div class="cdtl_sale"><em class="ssg_price">7,990</em></div>
+<div class="cdtl_txt"><span class="blind">판매가 7,990원</span></div></div></div>
+''', 7990, True),
+    ('가격 영역에 blind가 없고 바로 뒤 추천 상품에 blind', '''
+<h2 class="cdtl_prd_nm">코멧 물티슈 100매 x 10팩</h2>
+<div class="cdtl_price"><em class="ssg_price">12,900</em><span class="ssg_tx">원</span></div>
+<ul class="cdtl_rec"><li><span class="blind">990</span></li></ul>
+''', 12900, False),
+    ('blind가 라벨만 있는 경우', '''
+<h2 class="cdtl_prd_nm">LG 그램 16 노트북</h2>
+<span class="cdtl_price"><span class="blind">판매가격</span><em class="ssg_price">1,890,000</em><span class="ssg_tx">원</span></span>
+''', 1890000, False),
+    # 빠른 경로는 추측하지 않고 soup 경로에 맡긴다 (soup은 나머지 전체를 가격 영역으로 본다)
+    ('닫히지 않은 가격 영역 (잘린 응답)', '''
+<h2 class="cdtl_prd_nm">다이슨 에어랩</h2>
+<div class="cdtl_price"><em class="ssg_price">699,000</em>
+''' + '<p>상세 설명</p>' * 800 + '<span class="blind">5,000</span>', 5000, False),
+    ('닫히지 않은 가격 영역 뒤의 정상 가격 영역', '''
+<h2 class="cdtl_prd_nm">삼성 갤럭시 버즈3</h2>
+<div class="cdtl_price"><em class="ssg_price">199,000</em>
+''' + '<p>상세 설명</p>' * 800 + '''
+<div class="cdtl_price"><em class="ssg_price">189,000</em><span class="blind">189,000</span>원</div>
+''', 189000, True),
+    ('가격 영역 없이 JSON-LD', '''
+<h2 class="cdtl_prd_nm">오뚜기 진라면 매운맛 5개입</h2>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Product",
+ "name": "오뚜기 진라면 매운맛 5개입", "offers": {"@type": "Offer", "price": "3980", "priceCurrency": "KRW"}}</script>
+''', 3980, True),
+]
+
+def _page(body):
+    return f'<html><head><title>SSG.COM</title></head><body>{body}</body></html>'.encode('utf-8')
+
+@pytest.mark.parametrize('label, body, expected, fast_hit', PRODUCT_PAGE_SNIPPETS,
+                         ids=[snippet[0] for snippet in PRODUCT_PAGE_SNIPPETS])
+def test_product_page_snippets(label, body, expected, fast_hit):
+    page = _page(body)
+    fast = _parse_product_fast(page)
+    assert (fast is not None) == fast_hit
+    if fast_hit:
+        assert fast['price'] == expected
+    assert parse_product_page(page)['price'] == expected
+
+# soup 경로는 JSON-LD를 읽지 않으므로 비교에서 뺀다
+HTML_SNIPPETS = [snippet for snippet in PRODUCT_PAGE_SNIPPETS if 'JSON-LD' not in snippet[0]]
+
+@pytest.mark.parametrize('label, body, expected, fast_hit', HTML_SNIPPETS,
+                         ids=[snippet[0] for snippet in HTML_SNIPPETS])
+def test_fast_path_agrees_with_soup(label, body, expected, fast_hit):
+    page = _page(body)
+    fast = parse_product_page(page, fast=True)
+    soup = _parse_product_soup(page)
+    assert (fast['name'], fast['price']) == (soup['name'], soup['price'])
@@ -0,0 +1,53 @@
+from tests.helpers import StubSSGServer, seed_products
+import pytest
+
+from crawl_queue import SQLiteCrawlQueue
+from scheduler import update_product_prices
+
+def test_refresh_pass_against_stub_server(db):
+    with StubSSGServer(latency=0.05, fail_items=[3, 17, 25, 38]) as stub:
+        seed_products([stub.product_url(i) for i in range(40)], price=1000)
+        stats = update_product_prices(max_workers=16, per_host_limit=4)
+
+    assert stub.request_count == 40
+    assert stats['products'] == 40
+    assert stats['failed'] == 4
+    # 스텁 가격은 10,000원 이상이므로 성공한 상품은 모두 가격이 바뀐다
+    assert stats['updated'] == 36
+    assert stats['throughput_per_sec'] > 0
+    assert 50 <= stats['latency_p50_ms'] <= stats['latency_p99_ms'] <= stats['latency_max_ms']
+
+    # 스레드 16개라도 한 호스트에는 4개까지만 동시에 요청하고, 실제로 그만큼 병렬로 보낸다
+    assert stub.max_active == 4
+
+    rows = db.execute('''
+        SELECT p.url, p.current_price, COUNT(l.id) AS logs
+        FROM products p LEFT JOIN price_logs l ON l.product_id = p.id
+        GROUP BY p.id
+    ''').fetchall()
+    failed_urls = {stub.product_url(i) for i in (3, 17, 25, 38)}
+    for row in rows:
+        if row['url'] in failed_urls:
+            assert (row['current_price'], row['logs']) == (1000, 0)
+        else:
+            assert row['current_price'] >= 10000 and row['logs'] == 1
+
+def test_refresh_not_modified_with_etag(db):
+    with StubSSGServer(etag=True) as stub:
+        seed_products([stub.product_url(i) for i in range(10)])
+        first = update_product_prices(max_workers=4)
+        second = update_product_prices(max_workers=4)
+
+    assert first['updated'] == 10 and first['not_modified'] == 0
+    assert second['not_modified'] == 10 and second['updated'] == 0
+    assert second['bytes_downloaded'] == 0
+
+def test_refresh_pass_returns_connection_on_error(db):
+    class BrokenQueue(SQLiteCrawlQueue):
+        def claim(self, conn, worker_id, limit):
+            raise RuntimeError('큐 장애')
+
+    checkouts = db.checkouts
+    with pytest.raises(RuntimeError):
+        update_product_prices(due_only=True, queue=BrokenQueue())
+    assert db.checkouts == checkouts
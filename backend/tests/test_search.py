@@ -0,0 +1,58 @@
+import pytest
+
+import crawler
+from tests.helpers import StubSearchServer
+
+@pytest.fixture
+def search_stub(monkeypatch):
+    crawler.search_cache.clear()
+    with StubSearchServer(per_page=10, overlap=3, latency=0) as stub:
+        monkeypatch.setattr(crawler, 'SSG_SEARCH_URL', stub.search_url)
+        yield stub
+    crawler.search_cache.clear()
+
+def test_search_fallback_is_not_cached(search_stub, monkeypatch):
+    monkeypatch.setattr(crawler, 'SSG_SEARCH_URL', 'http://127.0.0.1:1/search.ssg')
+    products = crawler.cached_search_ssg_products('라면', limit=3)
+    assert all('itemId=test' in product['url'] for product in products)
+    assert crawler.search_cache.stats()['size'] == 0
+
+    # SSG가 복구되면 바로 실제 결과
+    monkeypatch.setattr(crawler, 'SSG_SEARCH_URL', search_stub.search_url)
+    products = crawler.cached_search_ssg_products('라면', limit=3)
+    assert [product['url'].rsplit('=', 1)[-1] for product in products] == ['0', '1', '2']
+    assert crawler.search_cache.stats()['size'] == 1
+
+def test_cached_search_returns_copies(search_stub):
+    first = crawler.cached_search_ssg_products('라면', limit=3)
+    first[0]['name'] = '수정됨'
+    second = crawler.cached_search_ssg_products('라면', limit=3)
+    assert second[0]['name'] != '수정됨'
+    assert search_stub.request_count == 1
+
+def test_stream_labels_fallback_and_respects_limit(monkeypatch):
+    crawler.search_cache.clear()
+    monkeypatch.setattr(crawler, 'SSG_SEARCH_URL', 'http://127.0.0.1:1/search.ssg')
+
+    events = list(crawler.stream_search_ssg_products('라면', pages=2, limit=3))
+    assert [event['type'] for event in events] == ['error', 'error', 'fallback']
+    assert events[-1]['reason'] == 'error'
+    assert len(events[-1]['products']) == 3
+
+    assert list(crawler.stream_search_ssg_products('라면', pages=2, limit=0)) == []
+
+def test_stream_sends_real_results_without_fallback(search_stub):
+    events = list(crawler.stream_search_ssg_products('라면', pages=3, limit=12))
+    assert {event['type'] for event in events} == {'products'}
+    assert sum(len(event['products']) for event in events) == 12
+
+def test_cache_key_and_request_use_the_same_keyword(search_stub, monkeypatch):
+    requested = []
+    fetch = crawler.fetch_search_page
+    monkeypatch.setattr(crawler, 'fetch_search_page',
+                        lambda keyword, page: requested.append(keyword) or fetch(keyword, page))
+
+    crawler.cached_search_ssg_products(' 라면 ', limit=3)
+    crawler.cached_search_ssg_products('라면', limit=3)
+    list(crawler.stream_search_ssg_products(' 라면', pages=1))
+    assert requested == ['라면', '라면']
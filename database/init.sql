@@ -1,53 +1,174 @@
 -- SSG 가격 추적 시스템 데이터베이스 초기화
+-- backend/database.py의 MIGRATIONS에서 생성한 파일이므로 직접 고치지 말 것.
+-- 스키마를 바꾼 뒤: cd backend && python database.py --dump-schema > ../database/init.sql
 
--- 상품 테이블 (개선된 버전)
-CREATE TABLE IF NOT EXISTS products (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+CREATE TABLE products (
+    id INTEGER PRIMARY KEY,
     name TEXT NOT NULL,
-    url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
     current_price INTEGER,
     image_url TEXT,
     brand TEXT,
     source TEXT DEFAULT 'SSG',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+, refresh_interval INTEGER, last_checked_at TIMESTAMP, next_check_at TIMESTAMP DEFAULT '1970-01-01 00:00:00', lease_owner TEXT);
 
--- 가격 이력 테이블
-CREATE TABLE IF NOT EXISTS price_logs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    product_id INTEGER NOT NULL,
-    price INTEGER NOT NULL,
+CREATE TABLE price_logs (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER,
+    price INTEGER,
     logged_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
+    FOREIGN KEY (product_id) REFERENCES products(id)
 );
 
--- 알림 설정 테이블
-CREATE TABLE IF NOT EXISTS alerts (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    product_id INTEGER NOT NULL,
-    user_email TEXT NOT NULL,
-    target_price INTEGER NOT NULL,
+CREATE TABLE alerts (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER,
+    user_email TEXT,
+    target_price INTEGER,
     is_active BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (product_id) REFERENCES products(id) ON DELETE CASCADE
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+CREATE TABLE product_http_cache (
+    product_id INTEGER PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content_bytes INTEGER,
+    parse_ms REAL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+CREATE UNIQUE INDEX idx_products_url ON products(url);
+
+CREATE INDEX idx_price_logs_product_logged ON price_logs(product_id, logged_at);
+
+CREATE INDEX idx_price_logs_logged_at ON price_logs(logged_at);
+
+CREATE INDEX idx_alerts_product_id ON alerts(product_id);
+
+CREATE INDEX idx_alerts_is_active ON alerts(is_active);
+
+CREATE INDEX idx_products_created ON products(created_at, id);
+
+CREATE INDEX idx_products_source_created ON products(source, created_at, id);
+
+CREATE INDEX idx_products_brand_created ON products(brand, created_at, id);
+
+CREATE INDEX idx_products_price ON products(current_price);
+
+CREATE TABLE dashboard_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TRIGGER trg_products_count_insert AFTER INSERT ON products BEGIN
+    UPDATE dashboard_counters SET value = value + 1 WHERE name = 'total_products';
+END;
+
+CREATE TRIGGER trg_products_count_delete AFTER DELETE ON products BEGIN
+    UPDATE dashboard_counters SET value = value - 1 WHERE name = 'total_products';
+END;
+
+CREATE TRIGGER trg_alerts_count_insert AFTER INSERT ON alerts WHEN NEW.is_active = 1 BEGIN
+    UPDATE dashboard_counters SET value = value + 1 WHERE name = 'active_alerts';
+END;
+
+CREATE TRIGGER trg_alerts_count_delete AFTER DELETE ON alerts WHEN OLD.is_active = 1 BEGIN
+    UPDATE dashboard_counters SET value = value - 1 WHERE name = 'active_alerts';
+END;
+
+CREATE TRIGGER trg_alerts_count_update AFTER UPDATE OF is_active ON alerts
+WHEN (NEW.is_active = 1) != (OLD.is_active = 1) BEGIN
+    UPDATE dashboard_counters SET value = value + (CASE WHEN NEW.is_active = 1 THEN 1 ELSE -1 END)
+    WHERE name = 'active_alerts';
+END;
+
+CREATE TABLE recent_price_changes (
+    slot INTEGER PRIMARY KEY,
+    log_id INTEGER NOT NULL,
+    product_id INTEGER,
+    price INTEGER,
+    logged_at TIMESTAMP
 );
 
--- 인덱스 생성
-CREATE INDEX IF NOT EXISTS idx_price_logs_product_id ON price_logs(product_id);
-CREATE INDEX IF NOT EXISTS idx_price_logs_logged_at ON price_logs(logged_at);
-CREATE INDEX IF NOT EXISTS idx_alerts_product_id ON alerts(product_id);
-CREATE INDEX IF NOT EXISTS idx_alerts_is_active ON alerts(is_active);
+CREATE INDEX idx_recent_price_changes_log ON recent_price_changes(log_id);
+
+CREATE TRIGGER trg_price_logs_recent AFTER INSERT ON price_logs BEGIN
+    INSERT OR REPLACE INTO recent_price_changes (slot, log_id, product_id, price, logged_at)
+    VALUES (NEW.id % 50, NEW.id, NEW.product_id, NEW.price, NEW.logged_at);
+END;
+
+CREATE INDEX idx_alerts_active_product_target
+ON alerts(product_id, target_price) WHERE is_active = 1;
+
+CREATE INDEX idx_products_next_check ON products(next_check_at);
+
+CREATE INDEX idx_products_lease_owner ON products(lease_owner) WHERE lease_owner IS NOT NULL;
+
+CREATE TABLE price_log_blocks (
+    id INTEGER PRIMARY KEY,
+    product_id INTEGER NOT NULL,
+    first_at INTEGER NOT NULL,
+    last_at INTEGER NOT NULL,
+    first_price INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    timestamps BLOB NOT NULL,
+    prices BLOB NOT NULL,
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+CREATE INDEX idx_price_log_blocks_product ON price_log_blocks(product_id, first_at);
+
+CREATE TABLE product_price_summary (
+    product_id INTEGER PRIMARY KEY,
+    current_price INTEGER NOT NULL,
+    min_price INTEGER NOT NULL,
+    max_price INTEGER NOT NULL,
+    price_sum INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    last_logged_at TIMESTAMP,
+    low_ratio REAL NOT NULL,
+    avg_ratio REAL NOT NULL,
+    FOREIGN KEY (product_id) REFERENCES products(id)
+);
+
+CREATE TRIGGER trg_price_logs_summary AFTER INSERT ON price_logs
+WHEN NEW.product_id IS NOT NULL AND NEW.price > 0 BEGIN
+    INSERT INTO product_price_summary
+        (product_id, current_price, min_price, max_price, price_sum, points, last_logged_at, low_ratio, avg_ratio)
+    VALUES (NEW.product_id, NEW.price, NEW.price, NEW.price, NEW.price, 1, NEW.logged_at, 1.0, 1.0)
+    ON CONFLICT(product_id) DO UPDATE SET
+        current_price = excluded.current_price,
+        min_price = MIN(min_price, excluded.min_price),
+        max_price = MAX(max_price, excluded.max_price),
+        price_sum = price_sum + excluded.price_sum,
+        points = points + 1,
+        last_logged_at = excluded.last_logged_at,
+        low_ratio = excluded.current_price * 1.0 / MIN(min_price, excluded.min_price),
+        avg_ratio = excluded.current_price * (points + 1.0) / (price_sum + excluded.price_sum);
+END;
+
+CREATE INDEX idx_price_summary_low ON product_price_summary(low_ratio, avg_ratio);
+
+CREATE INDEX idx_price_summary_avg ON product_price_summary(avg_ratio);
+
+INSERT INTO dashboard_counters (name, value) VALUES ('active_alerts', 0);
+INSERT INTO dashboard_counters (name, value) VALUES ('total_products', 0);
+
+PRAGMA user_version = 14;
 
 -- 샘플 데이터 (테스트용)
-INSERT OR IGNORE INTO products (name, url, current_price) VALUES 
+INSERT INTO products (name, url, current_price) VALUES
 ('테스트 상품 1', 'https://www.ssg.com/item/itemView.ssg?itemId=1000000000001', 50000),
 ('테스트 상품 2', 'https://www.ssg.com/item/itemView.ssg?itemId=1000000000002', 75000);
 
 -- 샘플 가격 이력
-INSERT OR IGNORE INTO price_logs (product_id, price) VALUES 
+INSERT INTO price_logs (product_id, price) VALUES
 (1, 55000),
 (1, 52000),
 (1, 50000),
 (2, 80000),
 (2, 77000),
-(2, 75000);
\ No newline at end of file
+(2, 75000);
@@ -1,17 +1,65 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './Dashboard.css';
 
+const RECENT_CHANGES_LIMIT = 10;
+// 상품/알림 추가 이벤트가 몰릴 때 대시보드를 한 번만 다시 읽도록 묶는 시간
+const REFETCH_DEBOUNCE_MS = 1000;
+
 function Dashboard() {
   const [dashboardData, setDashboardData] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLive, setIsLive] = useState(false);
+  const refetchTimer = useRef(null);
 
   useEffect(() => {
     fetchDashboardData();
-    // 30초마다 대시보드 데이터 새로고침
-    const interval = setInterval(fetchDashboardData, 30000);
-    return () => clearInterval(interval);
+
+    // 폴링 대신 서버가 보내는 이벤트로 갱신
+    const events = new EventSource('/api/events');
+
+    events.onopen = () => {
+      setIsLive(true);
+      // 재연결 사이에 놓친 변경을 반영
+      fetchDashboardData();
+    };
+    events.onerror = () => setIsLive(false);
+
+    events.addEventListener('price_changed', (event) => {
+      const change = JSON.parse(event.data);
+      setDashboardData(prev => prev && {
+        ...prev,
+        recent_changes: [
+          { name: change.name, price: change.price, logged_at: change.logged_at },
+          ...(prev.recent_changes || [])
+        ].slice(0, RECENT_CHANGES_LIMIT)
+      });
+    });
+
+    events.addEventListener('alert_fired', () => {
+      setDashboardData(prev => prev && {
+        ...prev,
+        active_alerts: Math.max(0, prev.active_alerts - 1)
+      });
+    });
+
+    ['product_added', 'alert_created', 'resync'].forEach(type => {
+      events.addEventListener(type, scheduleRefetch);
+    });
+
+    return () => {
+      events.close();
+      clearTimeout(refetchTimer.current);
+    };
   }, []);
 
+  const scheduleRefetch = () => {
+    if (refetchTimer.current) return;
+    refetchTimer.current = setTimeout(() => {
+      refetchTimer.current = null;
+      fetchDashboardData();
+    }, REFETCH_DEBOUNCE_MS);
+  };
+
   const fetchDashboardData = async () => {
     try {
       const response = await fetch('/api/dashboard');
@@ -36,7 +84,12 @@ function Dashboard() {
 
   return (
     <div className="dashboard">
-      <h3>📊 대시보드</h3>
+      <h3>
+        📊 대시보드
+        <span className={`live-indicator ${isLive ? 'live' : ''}`}>
+          {isLive ? '● 실시간' : '○ 연결 중'}
+        </span>
+      </h3>
       
       <div className="stats-grid">
         <div className="stat-card">
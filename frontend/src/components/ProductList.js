@@ -1,9 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import './ProductList.css';
 
+const PAGE_SIZE = 50;
+
 function ProductList({ refreshTrigger }) {
   const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [selectedProduct, setSelectedProduct] = useState(null);
   const [priceHistory, setPriceHistory] = useState([]);
   const [alertForm, setAlertForm] = useState({ email: '', targetPrice: '' });
@@ -14,10 +18,11 @@ function ProductList({ refreshTrigger }) {
 
   const fetchProducts = async () => {
     try {
-      const response = await fetch('/api/products');
+      const response = await fetch(`/api/products?limit=${PAGE_SIZE}`);
       if (response.ok) {
         const data = await response.json();
-        setProducts(data);
+        setProducts(data.products);
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('상품 목록 조회 오류:', error);
@@ -26,9 +31,28 @@ function ProductList({ refreshTrigger }) {
     }
   };
 
+  const fetchMoreProducts = async () => {
+    if (!nextCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const response = await fetch(
+        `/api/products?limit=${PAGE_SIZE}&cursor=${encodeURIComponent(nextCursor)}`
+      );
+      if (response.ok) {
+        const data = await response.json();
+        setProducts(prev => [...prev, ...data.products]);
+        setNextCursor(data.next_cursor);
+      }
+    } catch (error) {
+      console.error('상품 목록 추가 조회 오류:', error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const fetchPriceHistory = async (productId) => {
     try {
-      const response = await fetch(`/api/products/${productId}/prices`);
+      const response = await fetch(`/api/products/${productId}/prices?points=200`);
       if (response.ok) {
         const data = await response.json();
         setPriceHistory(data);
@@ -120,6 +144,11 @@ function ProductList({ refreshTrigger }) {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <button onClick={fetchMoreProducts} disabled={isLoadingMore} className="load-more-btn">
+                {isLoadingMore ? '불러오는 중...' : '더 보기'}
+              </button>
+            )}
           </div>
 
           {selectedProduct && (
@@ -1,31 +1,85 @@
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import './ProductSearch.css';
 
+const SEARCH_PAGES = 3;
+
 function ProductSearch({ onProductAdd }) {
   const [keyword, setKeyword] = useState('');
   const [searchResults, setSearchResults] = useState([]);
+  // 실제 결과가 없을 때 보여 줄 안내 (fallback 이벤트 또는 결과 0개)
+  const [searchNotice, setSearchNotice] = useState(null);
   const [isSearching, setIsSearching] = useState(false);
   const [isComparing, setIsComparing] = useState(false);
   const [compareResults, setCompareResults] = useState(null);
+  const searchAbortRef = useRef(null);
+
+  // 화면을 떠나면 진행 중인 검색 스트림을 끊는다
+  useEffect(() => () => searchAbortRef.current?.abort(), []);
 
   const handleSearch = async () => {
     if (!keyword.trim()) return;
     
+    // 이전 검색이 아직 스트리밍 중이면 취소
+    searchAbortRef.current?.abort();
+    const controller = new AbortController();
+    searchAbortRef.current = controller;
+    
     setIsSearching(true);
+    setSearchResults([]);
+    setSearchNotice(null);
     try {
-      const response = await fetch(`/api/search?keyword=${encodeURIComponent(keyword)}&limit=20`);
-      const data = await response.json();
+      // 여러 페이지를 서버가 동시에 받아 한 줄(NDJSON)씩 보내므로 첫 페이지부터 바로 표시
+      const response = await fetch(
+        `/api/search/stream?keyword=${encodeURIComponent(keyword)}&pages=${SEARCH_PAGES}`,
+        { signal: controller.signal }
+      );
       
-      if (response.ok) {
-        setSearchResults(data.products);
-      } else {
+      if (!response.ok) {
+        const data = await response.json();
         alert(data.error || '검색 중 오류가 발생했습니다.');
+        return;
+      }
+      
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.type === 'products') {
+            setSearchResults((prev) => [...prev, ...event.products]);
+          } else if (event.type === 'fallback') {
+            // 서버가 만든 테스트용 예시 상품: 실제 결과와 구분해 안내와 함께 표시
+            setSearchResults(event.products);
+            setSearchNotice(
+              event.reason === 'error'
+                ? 'SSG 검색에 실패해 테스트용 예시 상품을 보여줍니다.'
+                : '검색 결과가 없어 테스트용 예시 상품을 보여줍니다.'
+            );
+          } else if (event.type === 'error') {
+            console.error(`검색 오류 (${event.page}페이지):`, event.error);
+          } else if (event.type === 'done' && event.total === 0 && !event.fallback) {
+            setSearchNotice('검색 결과가 없습니다.');
+          }
+        }
       }
     } catch (error) {
+      if (error.name === 'AbortError') return;
       console.error('검색 오류:', error);
       alert('검색 중 오류가 발생했습니다.');
     } finally {
-      setIsSearching(false);
+      if (searchAbortRef.current === controller) {
+        setIsSearching(false);
+      }
     }
   };
 
@@ -108,12 +162,17 @@ function ProductSearch({ onProductAdd }) {
         </div>
       )}
 
+      {searchNotice && <p className="search-notice">{searchNotice}</p>}
+
       {searchResults.length > 0 && (
         <div className="search-results">
-          <h4>검색 결과 ({searchResults.length}개)</h4>
+          <h4>
+            검색 결과 ({searchResults.length}개)
+            {isSearching && <span className="search-loading-more"> 더 불러오는 중...</span>}
+          </h4>
           <div className="products-grid">
-            {searchResults.map((product, index) => (
-              <div key={index} className="product-card">
+            {searchResults.map((product) => (
+              <div key={product.url} className="product-card">
                 {product.image_url && (
                   <img src={product.image_url} alt={product.name} />
                 )}